@@ -0,0 +1,160 @@
+"""
+体重トラッカー - CSVインポート処理
+列単位（ベクトル化）のバリデーションとエラー表示用の整形
+"""
+
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+
+
+# 必須カラム
+REQUIRED_COLUMNS = ('date', 'weight')
+
+# 入力値の許容範囲
+WEIGHT_RANGE = (10.0, 300.0)
+BODY_FAT_RANGE = (0.0, 100.0)
+
+# CSVの行番号 = DataFrameの位置 + ヘッダー行 + 1
+CSV_ROW_OFFSET = 2
+
+# 分割読み込み時の1チャンクの行数
+IMPORT_CHUNK_ROWS = 50000
+
+
+def _blank_mask(series: pd.Series) -> pd.Series:
+    """欠損値または空文字列の行を判定"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.isna()
+    return series.isna() | (series.astype(str).str.strip() == '')
+
+
+def _parse_mixed_dates(date_text: pd.Series) -> pd.Series:
+    """
+    形式が混在する日付を要素ごとに推定して解釈
+    
+    タイムゾーン付きの値（例: 2024-01-02T07:30:00+09:00）は、タイムゾーンを除いた記録時の日時として扱う。
+    
+    Args:
+        date_text: 日付文字列のSeries
+        
+    Returns:
+        タイムゾーンなしのdatetime64のSeries（解釈できない値はNaT）
+    """
+    try:
+        parsed = pd.to_datetime(date_text, format='mixed', errors='coerce')
+    except ValueError:
+        # タイムゾーンの異なる値が混在する場合は1件ずつ解釈
+        parsed = pd.Series([_parse_date(text) for text in date_text], index=date_text.index)
+        return pd.to_datetime(parsed)
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    return parsed
+
+
+def _parse_date(text: str) -> pd.Timestamp:
+    timestamp = pd.to_datetime(text, errors='coerce')
+    if timestamp is not pd.NaT and timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp
+
+
+def validate_import_frame(df: pd.DataFrame,
+                          first_row: int = CSV_ROW_OFFSET) -> tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    インポート用DataFrameを列単位でバリデーション
+    
+    Args:
+        df: date, weight, body_fat（任意）列を持つDataFrame
+        first_row: dfの先頭行のCSV行番号（チャンクごとに検証する場合に指定）
+        
+    Returns:
+        (有効行のDataFrame[date, weight, body_fat, row_num], エラー詳細のリスト)
+        有効行のdateはYYYY-MM-DD形式の文字列に正規化される
+    """
+    row_nums = pd.Series(range(first_row, len(df) + first_row), index=df.index)
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        errors = [{'row': int(row), 'message': f"必要なカラムがありません: {missing_columns}"}
+                  for row in row_nums]
+        return pd.DataFrame(columns=['date', 'weight', 'body_fat', 'row_num']), errors
+    
+    messages = pd.Series(None, index=df.index, dtype=object)
+    
+    def flag(mask: pd.Series, message) -> None:
+        """未判定の行のうちmaskに該当する行へエラーメッセージを設定"""
+        target = mask & messages.isna()
+        if target.any():
+            messages[target] = message if isinstance(message, str) else message(target)
+    
+    # 日付: 空値と形式不正を判定し、YYYY-MM-DDへ正規化
+    date_text = df['date'].astype(str).str.strip()
+    date_empty = df['date'].isna() | date_text.str.lower().isin(['', 'nan', 'none', 'nat'])
+    # 区切り文字を「-」に揃えて一括で解釈し、解釈できない値のみ要素ごとに推定
+    normalized = date_text.str.replace('/', '-', regex=False).str.replace('.', '-', regex=False)
+    parsed_dates = pd.to_datetime(normalized, format='%Y-%m-%d', errors='coerce')
+    unparsed = parsed_dates.isna() & ~date_empty
+    if unparsed.any():
+        parsed_dates[unparsed] = _parse_mixed_dates(date_text[unparsed])
+    flag(date_empty, "日付が空です")
+    flag(parsed_dates.isna(), lambda m: "日付の形式が不正です (" + date_text[m] + ")")
+    
+    # 体重: 必須・数値・10～300kg
+    weights = pd.to_numeric(df['weight'], errors='coerce')
+    flag(_blank_mask(df['weight']), "体重が空です")
+    flag(weights.isna(), lambda m: "体重が数値ではありません (" + df['weight'][m].astype(str) + ")")
+    flag((weights < WEIGHT_RANGE[0]) | (weights > WEIGHT_RANGE[1]),
+         lambda m: "体重が範囲外です (" + weights[m].astype(str) + "kg)")
+    
+    # 体脂肪率: 任意・数値・0～100%
+    if 'body_fat' in df.columns:
+        body_fat_empty = _blank_mask(df['body_fat'])
+        body_fats = pd.to_numeric(df['body_fat'].where(~body_fat_empty), errors='coerce')
+        flag(body_fats.isna() & ~body_fat_empty,
+             lambda m: "体脂肪率が数値ではありません (" + df['body_fat'][m].astype(str).str.strip() + ")")
+        flag((body_fats < BODY_FAT_RANGE[0]) | (body_fats > BODY_FAT_RANGE[1]),
+             lambda m: "体脂肪率が範囲外です (" + body_fats[m].astype(str) + "%)")
+    else:
+        body_fats = pd.Series(float('nan'), index=df.index)
+    
+    invalid = messages.notna()
+    errors = [{'row': int(row), 'message': message}
+              for row, message in zip(row_nums[invalid], messages[invalid])]
+    
+    valid_mask = ~invalid
+    valid = pd.DataFrame({
+        'date': parsed_dates[valid_mask].dt.strftime('%Y-%m-%d'),
+        'weight': weights[valid_mask].astype(float),
+        'body_fat': body_fats[valid_mask].astype(float),
+        'row_num': row_nums[valid_mask]
+    }).reset_index(drop=True)
+    return valid, errors
+
+
+def read_csv_chunks(source: Any, chunk_rows: int = IMPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    CSVをchunk_rows行ずつ読み込む
+    
+    Args:
+        source: ファイルパスまたはファイルオブジェクト
+        chunk_rows: 1チャンクの行数
+        
+    Yields:
+        chunk_rows行（最後は残りの行）のDataFrame
+    """
+    with pd.read_csv(source, chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def format_error_messages(errors: List[Dict[str, Any]]) -> List[str]:
+    """
+    エラー詳細を画面表示用のメッセージに整形
+    
+    Args:
+        errors: validate_import_frameが返すエラー詳細のリスト
+        
+    Returns:
+        「行N: 内容」形式のメッセージのリスト
+    """
+    return [f"行{error['row']}: {error['message']}" if error['row'] is not None else error['message']
+            for error in errors]
@@ -1,74 +1,578 @@
 import sqlite3
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Callable
+import csv
+import functools
+import inspect
+import io
+import json
 import os
+import re
+import threading
+import time
+import weakref
+import zlib
+
+from csv_import import CSV_ROW_OFFSET, validate_import_frame
+from query_stats import InstrumentedConnection, QueryStats
+
+
+# 接続ごとに一度だけ適用するPRAGMA設定
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",  # 約16MBのページキャッシュ
+    "PRAGMA mmap_size = 268435456",  # 256MBまでメモリマップ読み込み
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+# データベースファイルごとの書き込みバージョン（同一プロセス内の全インスタンスで共有）
+_data_versions: Dict[str, int] = {}
+_data_versions_lock = threading.Lock()
+
+# measurementsテーブルのカラム
+MEASUREMENT_COLUMNS = ('id', 'date', 'weight', 'body_fat', 'created_at', 'updated_at')
+
+# 移動平均の窓幅（日数）とmeasurement_rollupsテーブルのカラム
+MOVING_AVERAGE_WINDOWS = (7, 30, 90)
+ROLLUP_COLUMNS = tuple(
+    f'{column}_ma{window}' for column in ('weight', 'body_fat') for window in MOVING_AVERAGE_WINDOWS
+)
+
+# 測定日の日番号（1970-01-01からの日数）を求める式。measurements.dayカラムの生成式
+EPOCH_DAY_SQL = "CAST(julianday(date) - 2440587.5 AS INTEGER)"
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# compact=True で取得する場合のカラムごとの型（日付・日時はdatetime64[s]）
+DATETIME_COLUMNS = ('created_at', 'updated_at')
+COMPACT_DTYPES = {
+    'id': 'Int32',
+    'weight': 'float32',
+    'body_fat': 'float32',
+    **{column: 'float32' for column in ROLLUP_COLUMNS}
+}
+
+# インポート時の重複データの処理方法と対応するON CONFLICT句
+DUPLICATE_ACTIONS = {
+    'overwrite': 'UPDATE SET weight = excluded.weight, body_fat = excluded.body_fat, '
+                 'updated_at = CURRENT_TIMESTAMP',
+    'skip': 'NOTHING',
+}
+
+# 集計クエリ・全期間統計キャッシュの項目
+STATISTICS_FIELDS = (
+    'count', 'weight_avg', 'weight_min', 'weight_max', 'weight_oldest', 'weight_latest',
+    'body_fat_count', 'body_fat_avg', 'body_fat_min', 'body_fat_max', 'body_fat_oldest', 'body_fat_latest',
+    'start_date', 'end_date'
+)
+
+
+# 年・月・日の順の日付（区切りは「-」「/」「.」、0埋めなし・時刻付きも可）
+_DATE_PATTERN = re.compile(r'(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?:[ T].*)?')
+
+
+def _to_date_str(value: Any) -> str:
+    """
+    日付をYYYY-MM-DD形式の文字列に変換
+
+    2024/01/05・2024-1-7 のような旧形式の文字列も正規化する。
+
+    Raises:
+        ValueError: 日付として解釈できない場合
+    """
+    if not isinstance(value, str):
+        return value.strftime('%Y-%m-%d')
+    match = _DATE_PATTERN.fullmatch(value.strip())
+    try:
+        if match is None:
+            raise ValueError
+        return date(*(int(part) for part in match.groups())).isoformat()
+    except ValueError:
+        raise ValueError(f"日付の形式が不正です ({value})") from None
+
+
+def _checked_date(value: Any) -> Optional[str]:
+    """日付をYYYY-MM-DD形式に変換（不正な場合はエラーを表示してNone）"""
+    try:
+        return _to_date_str(value)
+    except (ValueError, AttributeError) as e:
+        print(f"日付エラー: {e}")
+        return None
+
+
+def _to_day(value: Any) -> int:
+    """日付（YYYY-MM-DD形式またはdate）を日番号（1970-01-01からの日数）に変換"""
+    return date.fromisoformat(_to_date_str(value)).toordinal() - _EPOCH_ORDINAL
+
+
+def _from_day(day: Optional[int]) -> Optional[str]:
+    """日番号をYYYY-MM-DD形式の文字列に変換"""
+    return None if day is None else date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+
+
+def _select_columns(columns: List[str]) -> str:
+    """SELECT句のカラム一覧（dateは文字列ではなく日番号で取得する）"""
+    return ', '.join('day AS date' if column == 'date' else column for column in columns)
+
+
+def _days_to_datetime(values: pd.Series, unit: str = 'us') -> pd.Series:
+    """日番号をdatetime64に変換（文字列の解析を行わず整数から直接変換、NULLはNaT）"""
+    days = values.to_numpy(dtype='float64', na_value=np.nan)
+    dates = np.full(len(days), np.datetime64('NaT'), dtype=f'datetime64[{unit}]')
+    valid = ~np.isnan(days)
+    dates[valid] = days[valid].astype('int64').astype('datetime64[D]')
+    return pd.Series(dates, index=values.index, name=values.name)
+
+
+def _to_datetime_seconds(values: pd.Series) -> pd.Series:
+    """YYYY-MM-DD（HH:MM:SS）形式の文字列をdatetime64[s]に変換"""
+    try:
+        # ISO形式はNumPyで直接変換する（pandasの書式推定より速い）
+        return pd.Series(np.array(values.to_numpy(), dtype='datetime64[s]'), index=values.index, name=values.name)
+    except ValueError:
+        return pd.to_datetime(values, errors='coerce').astype('datetime64[s]')
+
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """取得結果を省メモリの型（datetime64[s]・float32・nullable int）に変換"""
+    if 'date' in df.columns:
+        df['date'] = _days_to_datetime(df['date'], 's')
+    for column in df.columns:
+        if column in DATETIME_COLUMNS:
+            df[column] = _to_datetime_seconds(df[column])
+        elif column in COMPACT_DTYPES:
+            df[column] = df[column].astype(COMPACT_DTYPES[column])
+    return df
+
+
+def _convert_frame(df: pd.DataFrame, compact: bool) -> pd.DataFrame:
+    """取得結果の日番号を日付に変換（compact=Trueの場合は省メモリの型にも変換）"""
+    if compact:
+        return _compact_frame(df)
+    if 'date' in df.columns:
+        df['date'] = _days_to_datetime(df['date'])
+    return df
+
+
+def _instrumented(method):
+    """
+    メソッドの呼び出し回数・実行時間と、その間に実行されたSQLをquery_statsに記録するデコレーター
+    
+    ジェネレーターの場合は、値を取り出すたびの実行時間を合計する。
+    他の計測対象のメソッドから呼び出された場合は記録せず、SQLは呼び出し元のメソッドに含める
+    （bulk_import → import_measurements のような入れ子で1回の操作が重複して数えられないようにする）。
+    """
+    name = method.__name__
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            generator = method(self, *args, **kwargs)
+            count_call = True
+            while True:
+                if self.query_stats.current_method() is not None:
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                else:
+                    with self.query_stats.track(name, count_call):
+                        count_call = False
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                yield item
+        return generator_wrapper
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.query_stats.current_method() is not None:
+            return method(self, *args, **kwargs)
+        with self.query_stats.track(name):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _trend(latest: float, oldest: float) -> str:
+    """最新値と最古値から傾向を判定"""
+    return 'up' if latest > oldest else 'down' if latest < oldest else 'flat'
+
+
+def _build_statistics(values: Dict[str, Any]) -> Dict[str, Any]:
+    """集計値から統計情報の辞書を作成"""
+    if not values['count']:
+        return {}
+    
+    stats = {
+        'count': values['count'],
+        'start_date': values['start_date'],
+        'end_date': values['end_date'],
+        'weight_avg': values['weight_avg'],
+        'weight_max': values['weight_max'],
+        'weight_min': values['weight_min'],
+        'weight_latest': values['weight_latest'],
+        'weight_oldest': values['weight_oldest'],
+        'weight_change': values['weight_latest'] - values['weight_oldest'],
+        'trend': _trend(values['weight_latest'], values['weight_oldest'])
+    }
+    
+    if values['body_fat_count']:
+        stats.update({
+            'body_fat_count': values['body_fat_count'],
+            'body_fat_avg': values['body_fat_avg'],
+            'body_fat_max': values['body_fat_max'],
+            'body_fat_min': values['body_fat_min'],
+            'body_fat_latest': values['body_fat_latest'],
+            'body_fat_oldest': values['body_fat_oldest'],
+            'body_fat_change': values['body_fat_latest'] - values['body_fat_oldest'],
+            'body_fat_trend': _trend(values['body_fat_latest'], values['body_fat_oldest'])
+        })
+    
+    return stats
 
 
 class WeightDatabase:
     """体重トラッカー用SQLiteデータベース操作クラス"""
     
-    def __init__(self, db_path: str = "data/data.db"):
+    def __init__(self, db_path: str = "data/data.db", max_idle_connections: int = 4,
+                 slow_query_ms: Optional[float] = None):
         """
         データベース初期化
         
         Args:
             db_path: データベースファイルのパス
+            max_idle_connections: 終了したスレッドから回収して保持する接続の上限
+            slow_query_ms: この時間（ミリ秒）以上かかったSQLを実行計画とともに記録・表示
+                           （Noneの場合は記録しない）
         """
         self.db_path = db_path
+        self.max_idle_connections = max_idle_connections
+        # メソッド・SQLごとの実行統計（get_query_statsで取得）
+        self.query_stats = QueryStats(slow_query_ms)
+        # スレッドごとの接続: {スレッドID: (スレッドへの弱参照, 接続)}
+        self._connections: Dict[int, tuple] = {}
+        self._idle_connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        # PRAGMA data_version専用の接続と最後に観測した値（プール内の接続同士の書き込みを
+        # 他プロセスの変更として数えないよう、書き込みに使わない1接続だけで観測する）
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._seen_data_version: Optional[int] = None
+        self._version_lock = threading.Lock()
+        self._version_key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
         self.ensure_data_directory()
         self.initialize_database()
     
+    def __enter__(self) -> "WeightDatabase":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """新しい接続を作成し、PRAGMAを適用"""
+        # 接続はプール内でスレッド間を移動するため、同一スレッド制約はプール側で保証する
+        start = time.perf_counter()
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=InstrumentedConnection)
+        if self.db_path != ':memory:':
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        # 接続の作成はクエリとは別に集計し、以降のSQLを計測する
+        self.query_stats.record_connection((time.perf_counter() - start) * 1000)
+        conn.stats = self.query_stats
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        現在のスレッド専用の接続を取得
+        
+        同じスレッドからの呼び出しでは同じ接続を再利用する。
+        終了したスレッドの接続は回収し、新しいスレッドに割り当てる。
+        
+        Returns:
+            現在のスレッドに割り当てられた接続
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("データベースはクローズされています")
+        
+        thread = threading.current_thread()
+        entry = self._connections.get(thread.ident)
+        if entry is not None and entry[0]() is thread:
+            return entry[1]
+        
+        with self._pool_lock:
+            self._reclaim_dead_connections()
+            if self._idle_connections:
+                conn = self._idle_connections.pop()
+            else:
+                conn = self._open_connection()
+            self._connections[thread.ident] = (weakref.ref(thread), conn)
+            return conn
+    
+    def _reclaim_dead_connections(self) -> None:
+        """終了したスレッドの接続をアイドルプールへ戻す（ロック取得済みで呼び出すこと）"""
+        for ident, (thread_ref, conn) in list(self._connections.items()):
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                del self._connections[ident]
+                if conn.in_transaction:
+                    conn.rollback()
+                if len(self._idle_connections) < self.max_idle_connections:
+                    self._idle_connections.append(conn)
+                else:
+                    conn.close()
+    
+    def close(self) -> None:
+        """プール内の全接続をクローズ"""
+        with self._pool_lock:
+            self._closed = True
+            connections = [conn for _, conn in self._connections.values()]
+            connections.extend(self._idle_connections)
+            self._connections.clear()
+            self._idle_connections.clear()
+        with self._version_lock:
+            if self._version_conn is not None:
+                connections.append(self._version_conn)
+                self._version_conn = None
+        for conn in connections:
+            conn.close()
+    
+    def _bump_data_version(self) -> None:
+        """書き込み（コミット）後にデータバージョンを進める"""
+        with _data_versions_lock:
+            _data_versions[self._version_key] = _data_versions.get(self._version_key, 0) + 1
+        self._sync_seen_data_version()
+    
+    def _sync_seen_data_version(self) -> None:
+        """
+        自身のコミットを観測済みとしてPRAGMA data_versionを読み直す
+        
+        get_data_versionが同じ書き込みを他の接続による変更として数え直さないようにする。
+        コミットの直後に呼び出すこと（読み直すまでの間に他のプロセスがコミットした変更も観測済みとなる）。
+        """
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._seen_data_version = self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def get_query_stats(self) -> Dict[str, Any]:
+        """
+        クエリの実行統計を取得
+        
+        Returns:
+            QueryStats.snapshot()の辞書
+            - methods: メソッドごとの calls, queries, rows, total_ms, avg_ms, max_ms, query_ms
+            - queries: SQLごとの executions, rows, total_ms, avg_ms, max_ms
+            - connections: 作成した接続数（opened）と作成時間の合計（setup_ms）
+            - slow_queries: 遅いクエリ（sql, method, elapsed_ms, plan）の新しい順のリスト
+        """
+        return self.query_stats.snapshot()
+    
+    def reset_query_stats(self) -> None:
+        """クエリの実行統計を破棄"""
+        self.query_stats.reset()
+    
+    @_instrumented
+    def get_data_version(self) -> int:
+        """
+        データバージョンの取得
+        
+        このクラス経由の書き込みのたびに増加する。他の接続・プロセスによる変更は、
+        書き込みに使わない専用の1接続でPRAGMA data_versionの変化を観測して検知する
+        （スレッドごとの接続で観測すると、同じ書き込みを接続の数だけ数えてしまうため）。
+        専用の接続を作成した直後は変更ありとみなす。
+        
+        Returns:
+            データが変わるたびに増加する整数
+        """
+        with self._version_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("データベースはクローズされています")
+            if self._version_conn is None:
+                self._version_conn = self._open_connection()
+            external_version = self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+            changed = self._seen_data_version != external_version
+            self._seen_data_version = external_version
+        with _data_versions_lock:
+            if changed:
+                _data_versions[self._version_key] = _data_versions.get(self._version_key, 0) + 1
+            return _data_versions.get(self._version_key, 0)
+    
     def ensure_data_directory(self):
         """データディレクトリの存在確認・作成"""
         if self.db_path != ':memory:' and os.path.dirname(self.db_path):
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
+    # スキーマのマイグレーション（n番目を適用するとuser_version = n、追加は末尾のみ）
+    MIGRATIONS = (
+        '_migrate_initial_schema',
+        '_migrate_statistics_summary',
+        '_migrate_rollups',
+        '_migrate_epoch_day',
+        '_migrate_normalize_dates',
+    )
+    
     def initialize_database(self) -> None:
-        """データベースの初期化とテーブル作成"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # measurements テーブル作成
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS measurements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL UNIQUE,
-                    weight REAL NOT NULL,
-                    body_fat REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # settings テーブル作成
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value REAL NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # インデックス作成
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_measurements_date 
-                ON measurements(date)
-            ''')
-            
-            # 初期設定データの挿入
-            cursor.execute('''
-                INSERT OR IGNORE INTO settings (key, value) 
-                VALUES ('target_weight', 70.0)
-            ''')
-            cursor.execute('''
-                INSERT OR IGNORE INTO settings (key, value) 
-                VALUES ('height', 170.0)
-            ''')
-            
+        """
+        データベースの初期化とスキーマのマイグレーション
+        
+        PRAGMA user_versionで適用済みのマイグレーションを管理し、
+        スキーマが最新の場合はDDLを実行しない。
+        """
+        conn = self._connect()
+        if self.get_schema_version() >= len(self.MIGRATIONS):
+            return
+        
+        # 他の接続と同時に初期化しないよう書き込みロックを取得してから再確認
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = self.get_schema_version()
+            for target, name in enumerate(self.MIGRATIONS[version:], start=version + 1):
+                getattr(self, name)(conn)
+                conn.execute(f'PRAGMA user_version = {target}')
             conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        self._bump_data_version()
+    
+    def get_schema_version(self) -> int:
+        """
+        適用済みスキーマバージョンの取得
+        
+        Returns:
+            PRAGMA user_versionの値
+        """
+        return self._connect().execute('PRAGMA user_version').fetchone()[0]
     
+    def _migrate_initial_schema(self, conn: sqlite3.Connection) -> None:
+        """マイグレーション1: measurements・settingsテーブルと初期設定"""
+        cursor = conn.cursor()
+        
+        # measurements テーブル作成
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS measurements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL UNIQUE,
+                weight REAL NOT NULL,
+                body_fat REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # settings テーブル作成
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # インデックス作成
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_measurements_date 
+            ON measurements(date)
+        ''')
+        
+        # 初期設定データの挿入
+        cursor.execute('''
+            INSERT OR IGNORE INTO settings (key, value) 
+            VALUES ('target_weight', 70.0)
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO settings (key, value) 
+            VALUES ('height', 170.0)
+        ''')
+    
+    def _migrate_statistics_summary(self, conn: sqlite3.Connection) -> None:
+        """マイグレーション2: 全期間統計のキャッシュテーブル"""
+        cursor = conn.cursor()
+        
+        # measurement_summary テーブル作成（全期間統計のキャッシュ、最大1行）
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS measurement_summary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                {', '.join(STATISTICS_FIELDS)},
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # measurements が変更されたら全期間統計のキャッシュを破棄
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_measurements_{event.lower()}_summary
+                AFTER {event} ON measurements
+                BEGIN
+                    DELETE FROM measurement_summary;
+                END
+            ''')
+    
+    def _migrate_rollups(self, conn: sqlite3.Connection) -> None:
+        """マイグレーション3: 移動平均テーブル（既存データの移動平均はマイグレーション4で計算）"""
+        # measurement_rollups テーブル作成（測定日ごとの期間ベース移動平均）
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS measurement_rollups (
+                date TEXT PRIMARY KEY,
+                {', '.join(f'{col} REAL' for col in ROLLUP_COLUMNS)}
+            )
+        ''')
+    
+    def _migrate_epoch_day(self, conn: sqlite3.Connection) -> None:
+        """マイグレーション4: 日番号カラムとインデックス、既存データの移動平均計算"""
+        # day: 1970-01-01からの日数（dateから生成される仮想カラムのため書き込み側の変更は不要）
+        columns = [row[1] for row in conn.execute('PRAGMA table_xinfo(measurements)')]
+        if 'day' not in columns:
+            conn.execute(f'''
+                ALTER TABLE measurements
+                ADD COLUMN day INTEGER GENERATED ALWAYS AS ({EPOCH_DAY_SQL}) VIRTUAL
+            ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_measurements_day ON measurements(day)')
+        self._refresh_rollups(conn)
+
+    def _migrate_normalize_dates(self, conn: sqlite3.Connection) -> None:
+        """
+        マイグレーション5: 旧形式の日付（2024/01/05, 2024-1-7 など）をYYYY-MM-DD形式に統一
+
+        旧バージョンのインポートでは日付が入力のまま保存されており、日番号がNULLになるため
+        範囲検索・グラフ・編集から除外されていた。正規化後の日付が既存の日付と重複する場合は
+        更新日時の新しい方を残す。変換できない日付はそのまま残して件数を表示する。
+        """
+        rows = conn.execute('''
+            SELECT id, date, updated_at FROM measurements
+            WHERE strftime('%Y-%m-%d', date) IS NOT date
+        ''').fetchall()
+        normalized_count, merged_count, invalid_dates = 0, 0, []
+        for id, raw_date, updated_at in rows:
+            try:
+                normalized = _to_date_str(raw_date)
+            except ValueError:
+                invalid_dates.append(raw_date)
+                continue
+            existing = conn.execute(
+                'SELECT id, updated_at FROM measurements WHERE date = ?', (normalized,)
+            ).fetchone()
+            if existing is not None:
+                merged_count += 1
+                if (existing[1] or '', existing[0]) >= (updated_at or '', id):
+                    conn.execute('DELETE FROM measurements WHERE id = ?', (id,))
+                    continue
+                conn.execute('DELETE FROM measurements WHERE id = ?', (existing[0],))
+            conn.execute('UPDATE measurements SET date = ? WHERE id = ?', (normalized, id))
+            normalized_count += 1
+
+        if normalized_count or merged_count:
+            self._refresh_rollups(conn)
+            print(f"日付の形式を統一しました: {normalized_count}件（重複のため統合: {merged_count}件）")
+        if invalid_dates:
+            print(f"⚠️ 日付を変換できないデータがあります（{len(invalid_dates)}件）: {invalid_dates[:5]}")
+
+    @_instrumented
     def add_measurement(self, date: str, weight: float, body_fat: Optional[float] = None) -> bool:
         """
         体重測定データの追加
@@ -81,58 +585,194 @@ class WeightDatabase:
         Returns:
             成功時True、失敗時False
         """
+        date = _checked_date(date)
+        if date is None:
+            return False
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO measurements (date, weight, body_fat, updated_at)
                     VALUES (?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (date, weight, body_fat))
+                self._refresh_rollups(conn, date, date)
                 conn.commit()
+                self._bump_data_version()
                 return True
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return False
     
-    def get_measurements(self, days: Optional[int] = None) -> pd.DataFrame:
+    @_instrumented
+    def get_measurements(self, days: Optional[int] = None, columns: Optional[List[str]] = None,
+                         compact: bool = False) -> pd.DataFrame:
         """
         体重測定データの取得
         
         Args:
             days: 取得日数（Noneの場合は全期間）
+            columns: 取得するカラム（Noneの場合は全カラム）
+            compact: Trueの場合、日付・日時をdatetime64[s]、体重・体脂肪率をfloat32、
+                     idをInt32で返す（日付以外の日時カラムも変換する）
             
         Returns:
-            測定データのDataFrame
+            日付の昇順に並んだ測定データのDataFrame
         """
+        columns = list(columns) if columns else list(MEASUREMENT_COLUMNS)
+        unknown = [col for col in columns if col not in MEASUREMENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"不明なカラムです: {unknown}")
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 if days is None:
-                    query = '''
-                        SELECT id, date, weight, body_fat, created_at, updated_at
+                    query = f'''
+                        SELECT {_select_columns(columns)}
                         FROM measurements
-                        ORDER BY date DESC
+                        ORDER BY day ASC
                     '''
                     df = pd.read_sql_query(query, conn)
                 else:
-                    query = '''
-                        SELECT id, date, weight, body_fat, created_at, updated_at
-                        FROM measurements
-                        ORDER BY date DESC
-                        LIMIT ?
+                    # 最新days件を取得し、日付の昇順に並べ直す
+                    query = f'''
+                        SELECT {_select_columns(columns)}
+                        FROM (
+                            SELECT * FROM measurements
+                            ORDER BY day DESC
+                            LIMIT ?
+                        )
+                        ORDER BY day ASC
                     '''
                     df = pd.read_sql_query(query, conn, params=(days,))
                 
-                if not df.empty:
-                    # 日付順に並び替え（昇順）
-                    df = df.sort_values('date').reset_index(drop=True)
-                    # 日付をdatetime型に変換
-                    df['date'] = pd.to_datetime(df['date'])
+                return _convert_frame(df, compact)
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return pd.DataFrame(columns=columns)
+    
+    @_instrumented
+    def get_measurements_between(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                                 columns: Optional[List[str]] = None, compact: bool = False) -> pd.DataFrame:
+        """
+        日付範囲を指定して測定データを取得
+        
+        idx_measurements_dayの範囲スキャンで取得し、日付の昇順で返す。
+        
+        Args:
+            start: 開始日（YYYY-MM-DD形式またはdate、Noneの場合は下限なし）
+            end: 終了日（YYYY-MM-DD形式またはdate、Noneの場合は上限なし、終了日を含む）
+            columns: 取得するカラム（Noneの場合は全カラム）。
+                     weight_ma7 などの移動平均カラムも指定可能
+            compact: Trueの場合、get_measurementsと同様に省メモリの型で返す
+            
+        Returns:
+            測定データのDataFrame
+        """
+        columns = list(columns) if columns else list(MEASUREMENT_COLUMNS)
+        unknown = [col for col in columns if col not in MEASUREMENT_COLUMNS + ROLLUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"不明なカラムです: {unknown}")
+        
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append('day >= ?')
+            params.append(_to_day(start))
+        if end is not None:
+            conditions.append('day <= ?')
+            params.append(_to_day(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        source = 'measurements'
+        if any(col in ROLLUP_COLUMNS for col in columns):
+            source = 'measurements LEFT JOIN measurement_rollups USING (date)'
+        
+        try:
+            with self._connect() as conn:
+                query = f'''
+                    SELECT {_select_columns(columns)}
+                    FROM {source}
+                    {where}
+                    ORDER BY day ASC
+                '''
+                df = pd.read_sql_query(query, conn, params=params)
                 
-                return df
+                return _convert_frame(df, compact)
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
-            return pd.DataFrame()
+            return pd.DataFrame(columns=columns)
     
+    @_instrumented
+    def get_measurements_page(self, cursor: Optional[Any] = None, page_size: int = 50,
+                              direction: str = 'older',
+                              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        日付をキーにしたキーセットページングで測定データを取得
+
+        OFFSETを使わずidx_measurements_dayの範囲スキャンで1ページ分だけ読むため、
+        履歴の長さやページ位置によらず一定時間で取得できる。
+        日付を変換できないデータ（日番号がNULL）は範囲検索と同様に除外する。
+
+        Args:
+            cursor: 基準日（YYYY-MM-DD形式またはdate、Noneの場合は最新から）。基準日自体は含まない
+            page_size: 1ページの件数
+            direction: 'older'は基準日より前、'newer'は基準日より後の直近page_size件
+            columns: 取得するカラム（Noneの場合は全カラム）
+
+        Returns:
+            日付の降順（新しい順）に並んだ測定データのDataFrame
+        """
+        if direction not in ('older', 'newer'):
+            raise ValueError(f"不明なページ方向です: {direction}")
+        columns = list(columns) if columns else list(MEASUREMENT_COLUMNS)
+        unknown = [col for col in columns if col not in MEASUREMENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"不明なカラムです: {unknown}")
+
+        older = direction == 'older'
+        where = 'WHERE day IS NOT NULL'
+        params = []
+        if cursor is not None:
+            where = f"WHERE day {'<' if older else '>'} ?"
+            params.append(_to_day(cursor))
+        params.append(int(page_size))
+
+        try:
+            with self._connect() as conn:
+                query = f'''
+                    SELECT {_select_columns(columns)}
+                    FROM measurements
+                    {where}
+                    ORDER BY day {'DESC' if older else 'ASC'}
+                    LIMIT ?
+                '''
+                df = pd.read_sql_query(query, conn, params=params)
+                if not older:
+                    df = df.iloc[::-1].reset_index(drop=True)
+
+                return _convert_frame(df, False)
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return pd.DataFrame(columns=columns)
+
+    @_instrumented
+    def get_latest_date(self) -> Optional[str]:
+        """
+        最新の測定日を取得
+        
+        Returns:
+            最新の測定日（YYYY-MM-DD形式、データがない場合None）
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT date FROM measurements ORDER BY day DESC LIMIT 1')
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return None
+    
+    @_instrumented
     def get_measurement_by_date(self, date: str) -> Optional[Dict[str, Any]]:
         """
         指定日の測定データを取得
@@ -143,8 +783,11 @@ class WeightDatabase:
         Returns:
             測定データの辞書（存在しない場合None）
         """
+        date = _checked_date(date)
+        if date is None:
+            return None
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, date, weight, body_fat, created_at, updated_at
@@ -167,6 +810,7 @@ class WeightDatabase:
             print(f"データベースエラー: {e}")
             return None
     
+    @_instrumented
     def update_measurement(self, id: int, weight: float, body_fat: Optional[float] = None) -> bool:
         """
         測定データの更新
@@ -180,19 +824,26 @@ class WeightDatabase:
             成功時True、失敗時False
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE measurements
                     SET weight = ?, body_fat = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (weight, body_fat, id))
+                if cursor.rowcount > 0:
+                    # 日付を変換できないデータ（日番号がNULL）には移動平均がない
+                    day = conn.execute('SELECT day FROM measurements WHERE id = ?', (id,)).fetchone()[0]
+                    if day is not None:
+                        self._refresh_rollups(conn, _from_day(day), _from_day(day))
                 conn.commit()
+                self._bump_data_version()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return False
     
+    @_instrumented
     def update_measurement_by_date(self, date: str, weight: float, body_fat: Optional[float] = None) -> bool:
         """
         指定日の測定データを更新
@@ -205,20 +856,27 @@ class WeightDatabase:
         Returns:
             成功時True、失敗時False
         """
+        date = _checked_date(date)
+        if date is None:
+            return False
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE measurements
                     SET weight = ?, body_fat = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE date = ?
                 ''', (weight, body_fat, date))
+                if cursor.rowcount > 0:
+                    self._refresh_rollups(conn, date, date)
                 conn.commit()
+                self._bump_data_version()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return False
     
+    @_instrumented
     def delete_measurement(self, id: int) -> bool:
         """
         測定データの削除
@@ -230,15 +888,101 @@ class WeightDatabase:
             成功時True、失敗時False
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
+                row = conn.execute('SELECT day FROM measurements WHERE id = ?', (id,)).fetchone()
                 cursor.execute('DELETE FROM measurements WHERE id = ?', (id,))
+                if row is not None and row[0] is not None:
+                    self._refresh_rollups(conn, _from_day(row[0]), _from_day(row[0]))
                 conn.commit()
+                self._bump_data_version()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return False
-    
+
+    @_instrumented
+    def bulk_update(self, updates: pd.DataFrame) -> Optional[int]:
+        """
+        複数の測定データを1トランザクションで更新
+
+        Args:
+            updates: id, weight, body_fatカラムを持つ更新内容
+
+        Returns:
+            更新件数、失敗時None
+        """
+        result = self.apply_edits(updates=updates)
+        return None if result is None else result['updated']
+
+    @_instrumented
+    def bulk_delete(self, ids: List[int]) -> Optional[int]:
+        """
+        複数の測定データを1トランザクションで削除
+
+        Args:
+            ids: 削除する測定データIDのリスト
+
+        Returns:
+            削除件数、失敗時None
+        """
+        result = self.apply_edits(deleted_ids=ids)
+        return None if result is None else result['deleted']
+
+    @_instrumented
+    def apply_edits(self, updates: Optional[pd.DataFrame] = None,
+                    deleted_ids: Optional[List[int]] = None) -> Optional[Dict[str, int]]:
+        """
+        更新と削除をまとめて1トランザクションで反映
+
+        移動平均は変更された日付の範囲について1回だけ再計算する。
+
+        Args:
+            updates: id, weight, body_fatカラムを持つ更新内容
+            deleted_ids: 削除する測定データIDのリスト
+
+        Returns:
+            {'updated': 更新件数, 'deleted': 削除件数}、失敗時None
+        """
+        rows = []
+        if updates is not None and not updates.empty:
+            values = updates[['weight', 'body_fat', 'id']].astype(object)
+            rows = list(values.where(values.notna(), None).itertuples(index=False, name=None))
+        ids = json.dumps([int(id) for id in (deleted_ids or [])])
+        result = {'updated': 0, 'deleted': 0}
+        if not rows and ids == '[]':
+            return result
+
+        try:
+            with self._connect() as conn:
+                # 削除前に影響を受ける日付の範囲を求める
+                changed_ids = json.dumps([int(row[2]) for row in rows] + json.loads(ids))
+                start_day, end_day = conn.execute('''
+                    SELECT MIN(day), MAX(day) FROM measurements
+                    WHERE id IN (SELECT value FROM json_each(?))
+                ''', (changed_ids,)).fetchone()
+
+                cursor = conn.executemany('''
+                    UPDATE measurements
+                    SET weight = ?, body_fat = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', rows)
+                result['updated'] = max(cursor.rowcount, 0)
+                cursor = conn.execute(
+                    'DELETE FROM measurements WHERE id IN (SELECT value FROM json_each(?))', (ids,)
+                )
+                result['deleted'] = max(cursor.rowcount, 0)
+
+                if start_day is not None:
+                    self._refresh_rollups(conn, _from_day(start_day), _from_day(end_day))
+                conn.commit()
+            self._bump_data_version()
+            return result
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return None
+
+    @_instrumented
     def get_setting(self, key: str) -> Optional[float]:
         """
         設定値の取得
@@ -250,7 +994,7 @@ class WeightDatabase:
             設定値（存在しない場合None）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
                 row = cursor.fetchone()
@@ -259,6 +1003,7 @@ class WeightDatabase:
             print(f"データベースエラー: {e}")
             return None
     
+    @_instrumented
     def set_setting(self, key: str, value: float) -> bool:
         """
         設定値の更新
@@ -271,71 +1016,200 @@ class WeightDatabase:
             成功時True、失敗時False
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO settings (key, value, updated_at)
                     VALUES (?, ?, CURRENT_TIMESTAMP)
                 ''', (key, value))
                 conn.commit()
+                self._bump_data_version()
                 return True
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return False
     
-    def get_statistics(self, days: int = 30) -> Dict[str, Any]:
+    def _refresh_rollups(self, conn: sqlite3.Connection, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> None:
         """
-        統計情報の取得
+        移動平均テーブルの再計算
+        
+        start_date～end_dateの測定が変更された場合に影響を受けるのは、
+        start_date～end_date + 最大窓幅の測定日のみなので、その範囲だけを再計算する。
         
         Args:
-            days: 統計対象日数
-            
+            conn: データベース接続（呼び出し側のトランザクション内で実行）
+            start_date: 変更された最初の日付（Noneの場合は全期間）
+            end_date: 変更された最後の日付（Noneの場合は最新まで）
+        """
+        span = max(MOVING_AVERAGE_WINDOWS) - 1
+        params = {
+            'start': None if start_date is None else _to_day(start_date),
+            'end': None if end_date is None else _to_day(end_date) + span,
+        }
+        params['before'] = None if start_date is None else params['start'] - span
+        conditions = []
+        if start_date is not None:
+            conditions.append('{column} >= :start')
+        if end_date is not None:
+            conditions.append('{column} <= :end')
+        target = ' AND '.join(conditions) if conditions else '1'
+        
+        # 再計算対象の範囲と、その最初の窓に含まれる過去分を読み込む
+        source = target.format(column='day').replace(':start', ':before')
+        df = pd.read_sql_query(
+            f'SELECT date, day, weight, body_fat FROM measurements WHERE {source} ORDER BY day ASC',
+            conn, params=params
+        )
+        # measurement_rollupsは日付文字列がキーのため、対象範囲を日付文字列に戻して削除
+        conn.execute(
+            f"DELETE FROM measurement_rollups WHERE {target.format(column='date')}",
+            {key: _from_day(value) for key, value in params.items()}
+        )
+        df = df[df['day'].notna()]
+        if df.empty:
+            return
+        
+        series = df.set_index(_days_to_datetime(df['day'], 's'))
+        rollups = pd.DataFrame({'date': series['date']})
+        for window in MOVING_AVERAGE_WINDOWS:
+            for column in ('weight', 'body_fat'):
+                rollups[f'{column}_ma{window}'] = series[column].rolling(f'{window}D', min_periods=1).mean()
+        in_target = np.ones(len(series), dtype=bool)
+        if start_date is not None:
+            in_target &= series['day'].to_numpy() >= params['start']
+        if end_date is not None:
+            in_target &= series['day'].to_numpy() <= params['end']
+        rollups = rollups[in_target]
+        
+        rollups = rollups[['date', *ROLLUP_COLUMNS]].astype(object)
+        rollups = rollups.where(rollups.notna(), None)
+        columns = ', '.join(('date', *ROLLUP_COLUMNS))
+        placeholders = ', '.join('?' * (len(ROLLUP_COLUMNS) + 1))
+        conn.executemany(
+            f'INSERT OR REPLACE INTO measurement_rollups ({columns}) VALUES ({placeholders})',
+            rollups.itertuples(index=False, name=None)
+        )
+    
+    @_instrumented
+    def rebuild_rollups(self) -> bool:
+        """
+        移動平均テーブルを全期間で再計算
+        
+        WeightDatabaseを経由せずにmeasurementsを変更した場合に使用する。
+        
+        Returns:
+            成功時True、失敗時False
+        """
+        try:
+            with self._connect() as conn:
+                self._refresh_rollups(conn)
+            self._bump_data_version()
+            return True
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return False
+    
+    @_instrumented
+    def get_latest_moving_averages(self) -> Optional[Dict[str, Any]]:
+        """
+        最新の測定日の移動平均を取得
+        
         Returns:
-            統計情報の辞書
+            date と各移動平均（weight_ma7 など）の辞書（データがない場合None）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                
-                # 全データを取得して日付で絞り込み
-                cursor.execute('''
-                    SELECT weight, body_fat, date
-                    FROM measurements
+                columns = ('date', *ROLLUP_COLUMNS)
+                cursor.execute(f'''
+                    SELECT {', '.join(columns)}
+                    FROM measurement_rollups
                     ORDER BY date DESC
-                    LIMIT ?
-                ''', (days,))
-                rows = cursor.fetchall()
-                
-                if not rows:
-                    return {}
-                
-                weights = [row[0] for row in rows]
-                body_fats = [row[1] for row in rows if row[1] is not None]
-                
-                stats = {
-                    'count': len(weights),
-                    'weight_avg': sum(weights) / len(weights),
-                    'weight_max': max(weights),
-                    'weight_min': min(weights),
-                    'weight_latest': weights[0],
-                    'weight_oldest': weights[-1],
-                    'weight_change': weights[0] - weights[-1],
-                    'trend': 'up' if weights[0] > weights[-1] else 'down' if weights[0] < weights[-1] else 'flat'
-                }
-                
-                if body_fats:
-                    stats.update({
-                        'body_fat_avg': sum(body_fats) / len(body_fats),
-                        'body_fat_max': max(body_fats),
-                        'body_fat_min': min(body_fats),
-                        'body_fat_latest': next((row[1] for row in rows if row[1] is not None), None)
-                    })
+                    LIMIT 1
+                ''')
+                row = cursor.fetchone()
+                return dict(zip(columns, row)) if row else None
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return None
+    
+    @_instrumented
+    def get_statistics(self, days: Optional[int] = 30) -> Dict[str, Any]:
+        """
+        統計情報の取得
+        
+        最新の測定日から遡ったdays日間（暦日）を1回の集計クエリで計算する。
+        全期間（days=None）の統計はmeasurement_summaryテーブルにキャッシュされ、
+        measurementsが変更されるまで再利用される。
+        
+        Args:
+            days: 統計対象日数（Noneの場合は全期間）
+            
+        Returns:
+            統計情報の辞書（データがない場合は空の辞書）
+        """
+        try:
+            with self._connect() as conn:
+                if days is None:
+                    row = self._get_summary_statistics(conn)
+                else:
+                    latest_day = conn.execute('SELECT MAX(day) FROM measurements').fetchone()[0]
+                    if latest_day is None:
+                        return {}
+                    row = self._aggregate_statistics(conn, latest_day - (days - 1))
                 
-                return stats
+                return _build_statistics(dict(zip(STATISTICS_FIELDS, row)))
         except sqlite3.Error as e:
             print(f"データベースエラー: {e}")
             return {}
     
+    def _aggregate_statistics(self, conn: sqlite3.Connection, start_day: Optional[int] = None) -> tuple:
+        """
+        集計クエリで統計値を計算
+        
+        Args:
+            conn: データベース接続
+            start_day: 集計開始日の日番号（Noneの場合は全期間）
+            
+        Returns:
+            STATISTICS_FIELDSの順に並んだ集計値
+        """
+        # 日付を変換できないデータ（日番号がNULL）は範囲検索と同様に除外
+        where = 'day >= :start' if start_day is not None else 'day IS NOT NULL'
+        query = f'''
+            SELECT
+                COUNT(*), AVG(weight), MIN(weight), MAX(weight),
+                (SELECT weight FROM measurements WHERE {where} ORDER BY day ASC LIMIT 1),
+                (SELECT weight FROM measurements WHERE {where} ORDER BY day DESC LIMIT 1),
+                COUNT(body_fat), AVG(body_fat), MIN(body_fat), MAX(body_fat),
+                (SELECT body_fat FROM measurements WHERE {where} AND body_fat IS NOT NULL
+                 ORDER BY day ASC LIMIT 1),
+                (SELECT body_fat FROM measurements WHERE {where} AND body_fat IS NOT NULL
+                 ORDER BY day DESC LIMIT 1),
+                MIN(date), MAX(date)
+            FROM measurements
+            WHERE {where}
+        '''
+        return conn.execute(query, {'start': start_day}).fetchone()
+    
+    def _get_summary_statistics(self, conn: sqlite3.Connection) -> tuple:
+        """全期間の統計値をキャッシュから取得（キャッシュがない場合は集計して保存）"""
+        columns = ', '.join(STATISTICS_FIELDS)
+        row = conn.execute(f'SELECT {columns} FROM measurement_summary WHERE id = 1').fetchone()
+        if row is None:
+            row = self._aggregate_statistics(conn)
+            placeholders = ', '.join('?' * len(STATISTICS_FIELDS))
+            conn.execute(f'''
+                INSERT OR REPLACE INTO measurement_summary (id, {columns})
+                VALUES (1, {placeholders})
+            ''', row)
+            # キャッシュの保存は測定データの変更ではないため、データバージョンは進めない
+            conn.commit()
+            self._sync_seen_data_version()
+        return row
+    
+    @_instrumented
     def import_from_csv(self, csv_data: pd.DataFrame) -> tuple[int, int]:
         """
         CSVデータからの一括インポート
@@ -346,25 +1220,220 @@ class WeightDatabase:
         Returns:
             (成功件数, 失敗件数)
         """
-        success_count = 0
-        error_count = 0
+        result = self.bulk_import(csv_data)
+        return result['success_count'], result['error_count']
+    
+    @_instrumented
+    def bulk_import(self, csv_data: pd.DataFrame, on_duplicate: str = 'overwrite',
+                    progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """
+        測定データを単一トランザクションで一括インポート
         
-        for _, row in csv_data.iterrows():
-            try:
-                date_str = str(row['date'])
-                weight = float(row['weight'])
-                body_fat = float(row['body_fat']) if pd.notna(row['body_fat']) else None
+        列単位でバリデーションを行い、有効な行をimport_measurementsでまとめて書き込む。
+        
+        Args:
+            csv_data: date, weight, body_fat（任意）列を持つDataFrame
+            on_duplicate: 既存の日付の扱い（'overwrite': 上書き, 'skip': スキップ）
+            progress: 書き込みが終わった時点で有効行数を受け取る関数（import_measurementsを参照）
+            
+        Returns:
+            インポート結果の辞書
+            - success_count: 書き込んだ件数
+            - skipped_count: 重複のためスキップした件数
+            - error_count: 失敗件数
+            - errors: 行ごとのエラー詳細 [{'row': CSV行番号, 'message': 内容}, ...]
+        """
+        valid, errors = validate_import_frame(csv_data)
+        result = self.import_measurements(valid, on_duplicate, progress)
+        result['error_count'] += len(errors)
+        result['errors'] = errors + result['errors']
+        return result
+    
+    @_instrumented
+    def import_measurements(self, valid: pd.DataFrame, on_duplicate: str = 'overwrite',
+                            progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """
+        バリデーション済みの測定データを一括書き込み
+        
+        一時ステージングテーブルへexecutemanyで読み込み、重複の解決と書き込みを
+        INSERT ... ON CONFLICT(date) の1文で行う。ファイル内で日付が重複する場合、
+        上書きでは後の行、スキップでは先の行が採用される。
+        
+        Args:
+            valid: validate_import_frameが返す有効行のDataFrame
+            on_duplicate: 既存の日付の扱い（'overwrite': 上書き, 'skip': スキップ）
+            progress: 書き込みが終わった時点で処理した行数を受け取る関数
+                      （ProgressReporterなど、import_chunksと共通）
+            
+        Returns:
+            インポート結果の辞書（bulk_importと同じ形式）
+        """
+        if on_duplicate not in DUPLICATE_ACTIONS:
+            raise ValueError(f"不明な重複データの処理方法です: {on_duplicate}")
+        
+        result = {
+            'success_count': 0,
+            'skipped_count': 0,
+            'error_count': 0,
+            'errors': []
+        }
+        if valid.empty:
+            return result
+        
+        try:
+            with self._connect() as conn:
+                self._stage_import(conn, valid)
+                written, start_date, end_date = self._write_staged(conn, on_duplicate)
+                self._refresh_rollups(conn, start_date, end_date)
+            self._bump_data_version()
+            result['success_count'] = written
+            result['skipped_count'] = len(valid) - written
+            if progress is not None:
+                progress(len(valid))
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            result['error_count'] = len(valid)
+            result['errors'].append({'row': None, 'message': f"データベースエラー: {e}"})
+        
+        return result
+    
+    @_instrumented
+    def import_chunks(self, chunks: Iterable[pd.DataFrame], on_duplicate: str = 'overwrite',
+                      progress: Optional[Callable[[int], None]] = None,
+                      max_errors: Optional[int] = None) -> Dict[str, Any]:
+        """
+        CSVをチャンクごとにバリデーション・書き込みする（大きなファイル向け）
+        
+        pd.read_csv(..., chunksize=N)などが返すチャンクを1つずつ処理するため、
+        ファイル全体を読み込まずに一定のメモリでインポートできる。
+        全チャンクを1トランザクションで書き込み、移動平均は最後に1回だけ再計算する。
+        ファイル内で日付が重複する場合の扱いはimport_measurementsと同じ。
+        
+        Args:
+            chunks: date, weight, body_fat（任意）列を持つDataFrameのイテラブル（ファイルの先頭から順に）
+            on_duplicate: 既存の日付の扱い（'overwrite': 上書き, 'skip': スキップ）
+            progress: チャンクを処理するたびに、それまでに読み込んだ行数で呼び出す関数
+                      （ProgressReporterを渡すと通知頻度が間引かれる）
+            max_errors: 保持するエラー詳細の最大件数（Noneの場合は全件、件数はerror_countに全て計上）
+            
+        Returns:
+            インポート結果の辞書（bulk_importと同じ形式）
+        """
+        if on_duplicate not in DUPLICATE_ACTIONS:
+            raise ValueError(f"不明な重複データの処理方法です: {on_duplicate}")
+        
+        result = {
+            'success_count': 0,
+            'skipped_count': 0,
+            'error_count': 0,
+            'errors': []
+        }
+        rows_read = 0
+        start_date = end_date = None
+        try:
+            with self._connect() as conn:
+                for chunk in chunks:
+                    valid, errors = validate_import_frame(chunk, first_row=CSV_ROW_OFFSET + rows_read)
+                    rows_read += len(chunk)
+                    result['error_count'] += len(errors)
+                    if max_errors is None:
+                        result['errors'].extend(errors)
+                    else:
+                        result['errors'].extend(errors[:max(0, max_errors - len(result['errors']))])
+                    
+                    if not valid.empty:
+                        self._stage_import(conn, valid)
+                        written, chunk_start, chunk_end = self._write_staged(conn, on_duplicate)
+                        result['success_count'] += written
+                        result['skipped_count'] += len(valid) - written
+                        start_date = chunk_start if start_date is None else min(start_date, chunk_start)
+                        end_date = chunk_end if end_date is None else max(end_date, chunk_end)
+                    if progress is not None:
+                        progress(rows_read)
                 
-                if self.add_measurement(date_str, weight, body_fat):
-                    success_count += 1
-                else:
-                    error_count += 1
-            except (ValueError, KeyError) as e:
-                print(f"データ変換エラー: {e}")
-                error_count += 1
+                if start_date is not None:
+                    self._refresh_rollups(conn, start_date, end_date)
+            if start_date is not None:
+                self._bump_data_version()
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            # 全体がロールバックされるため書き込み済みの件数もエラーとして扱う
+            result['error_count'] += result['success_count'] + result['skipped_count']
+            result['success_count'] = result['skipped_count'] = 0
+            result['errors'].append({'row': None, 'message': f"データベースエラー: {e}"})
+        
+        return result
+    
+    @_instrumented
+    def find_duplicate_dates(self, valid: pd.DataFrame) -> List[str]:
+        """
+        インポート候補のうち既に登録されている日付を取得
+        
+        候補を一時ステージングテーブルに読み込み、measurementsとの結合1回で判定する。
+        
+        Args:
+            valid: validate_import_frameが返す有効行のDataFrame
+            
+        Returns:
+            重複する日付（YYYY-MM-DD形式、昇順・重複なし）のリスト
+        """
+        if valid.empty:
+            return []
+        try:
+            with self._connect() as conn:
+                self._stage_import(conn, valid)
+                rows = conn.execute('''
+                    SELECT DISTINCT s.date
+                    FROM import_staging s
+                    JOIN measurements m ON m.date = s.date
+                    ORDER BY s.date
+                ''').fetchall()
+                conn.execute('DELETE FROM import_staging')
+                return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+            return []
+    
+    def _stage_import(self, conn: sqlite3.Connection, valid: pd.DataFrame) -> None:
+        """インポート候補を接続ごとの一時ステージングテーブルに読み込み"""
+        conn.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS import_staging (
+                row_num INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                weight REAL NOT NULL,
+                body_fat REAL
+            )
+        ''')
+        conn.execute('DELETE FROM import_staging')
+        body_fats = [None if value != value else value for value in valid['body_fat'].tolist()]
+        conn.executemany(
+            'INSERT INTO import_staging (row_num, date, weight, body_fat) VALUES (?, ?, ?, ?)',
+            zip(valid['row_num'].tolist(), valid['date'].tolist(), valid['weight'].tolist(), body_fats)
+        )
+    
+    def _write_staged(self, conn: sqlite3.Connection, on_duplicate: str) -> tuple:
+        """
+        ステージングテーブルの内容をmeasurementsへ書き込み、ステージングを空にする
         
-        return success_count, error_count
+        Returns:
+            (書き込んだ件数, ステージングの最初の日付, 最後の日付)
+        """
+        cursor = conn.execute(f'''
+            INSERT INTO measurements (date, weight, body_fat, updated_at)
+            SELECT date, weight, body_fat, CURRENT_TIMESTAMP
+            FROM import_staging
+            WHERE true
+            ORDER BY date, row_num
+            ON CONFLICT(date) DO {DUPLICATE_ACTIONS[on_duplicate]}
+        ''')
+        written = cursor.rowcount
+        start_date, end_date = conn.execute(
+            'SELECT MIN(date), MAX(date) FROM import_staging'
+        ).fetchone()
+        conn.execute('DELETE FROM import_staging')
+        return written, start_date, end_date
     
+    @_instrumented
     def export_to_csv(self) -> pd.DataFrame:
         """
         全データをCSV形式で出力
@@ -374,6 +1443,56 @@ class WeightDatabase:
         """
         return self.get_measurements()
     
+    @_instrumented
+    def iter_csv_chunks(self, chunk_size: int = 10000, columns: Optional[List[str]] = None,
+                        compress: bool = False) -> Iterator[bytes]:
+        """
+        全データをCSV形式で少しずつ出力
+        
+        カーソルからchunk_size行ずつ読み出してCSVに変換するため、
+        件数によらずメモリ使用量は一定。出力はexport_to_csv().to_csv(index=False)と同じ内容。
+        
+        Args:
+            chunk_size: 1回に読み出す行数
+            columns: 出力するカラム（Noneの場合は全カラム）
+            compress: Trueの場合、gzip形式で圧縮して出力
+            
+        Yields:
+            CSV（UTF-8）のバイト列。compress=Trueの場合はgzipのバイト列
+        """
+        columns = list(columns) if columns else list(MEASUREMENT_COLUMNS)
+        unknown = [col for col in columns if col not in MEASUREMENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"不明なカラムです: {unknown}")
+        
+        # wbits=31でgzipヘッダー付きの圧縮ストリームにする
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        try:
+            cursor = self._connect().execute(
+                f"SELECT {', '.join(columns)} FROM measurements ORDER BY day ASC"
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if rows:
+                    writer.writerows(rows)
+                chunk = buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+                if not rows:
+                    break
+        except sqlite3.Error as e:
+            print(f"データベースエラー: {e}")
+        if compressor is not None:
+            yield compressor.flush()
+    
+    @_instrumented
     def get_record_count(self) -> int:
         """
         総レコード数の取得
@@ -382,7 +1501,7 @@ class WeightDatabase:
             総レコード数
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT COUNT(*) FROM measurements')
                 return cursor.fetchone()[0]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - グラフ用の時系列ダウンサンプリング
+描画ピクセル数を超える点を、形状（山・谷）を保ったまま間引く
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 間引き方法
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Bucketsで残す点のインデックスを選択
+
+    先頭・末尾の点を固定し、残りをn_out - 2個のバケットに分けて、
+    前に選んだ点と次のバケットの平均点とで作る三角形の面積が最大の点を各バケットから選ぶ。
+
+    Args:
+        x: 昇順の数値配列
+        y: 値の配列（欠損なし）
+        n_out: 出力する点の数
+
+    Returns:
+        選択した点のインデックス配列（昇順）
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # バケット境界（先頭・末尾の点を除く）
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # 次のバケットの平均点（最後のバケットでは末尾の点）
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[i + 1] = previous
+
+    return indices
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    バケットごとの最小値・最大値の点を残すインデックスを選択
+
+    Args:
+        y: 値の配列（欠損なし）
+        n_out: 出力する点数の上限（先頭・末尾の点と、(n_out - 2) // 2個のバケットの最小・最大）
+
+    Returns:
+        選択した点のインデックス配列（昇順）
+    """
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    indices = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        indices.append(start + int(np.argmin(bucket)))
+        indices.append(start + int(np.argmax(bucket)))
+    return np.unique(indices)
+
+
+def downsample_series(x: pd.Series, y: pd.Series, max_points: int,
+                      method: str = 'lttb') -> Tuple[pd.Series, pd.Series]:
+    """
+    1系列を最大max_points点に間引く
+
+    max_points以下の場合は欠損値（線の途切れ）も含めてそのまま返す。
+    間引く場合は欠損値を除外してから選択する。
+
+    Args:
+        x: 日付の系列（昇順）
+        y: 値の系列
+        max_points: 出力する点数の上限
+        method: 'lttb' または 'minmax'
+
+    Returns:
+        (間引き後の日付, 間引き後の値)
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"不明な間引き方法です: {method}")
+
+    mask = y.notna().to_numpy()
+    if max_points is None or mask.sum() <= max_points:
+        return x, y
+    x = x[mask]
+    y = y[mask]
+
+    values = y.to_numpy(dtype=np.float64)
+    if method == 'lttb':
+        positions = pd.to_datetime(x).to_numpy().astype('datetime64[s]').astype(np.float64)
+        indices = lttb_indices(positions, values, max_points)
+    else:
+        indices = minmax_indices(values, max_points)
+    return x.iloc[indices], y.iloc[indices]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - グラフのメモ化キャッシュ
+作成済みの図をキーごとに保持し、件数とおおよそのメモリ量の上限でLRU削除する
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+import plotly.graph_objects as go
+
+
+def estimate_figure_bytes(fig: go.Figure) -> int:
+    """図のおおよそのメモリ量（JSONシリアライズ後のサイズ）を算出"""
+    return len(fig.to_json())
+
+
+class FigureCache:
+    """作成済みグラフのLRUキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        """
+        キャッシュの初期化
+
+        Args:
+            max_entries: 保持する図の最大数
+            max_bytes: 保持する図の合計サイズの上限（バイト）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # キー -> (図, サイズ)。末尾ほど最近使用
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """
+        キャッシュ済みの図を返し、なければ作成して登録
+
+        返り値は全セッションで共有されるため、呼び出し側では変更しないこと。
+
+        Args:
+            key: 図を一意に決めるキー
+            build: キャッシュにない場合に図を作成する関数
+
+        Returns:
+            図オブジェクト
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # 作成はロックの外で行う（同時に作成された場合は後の結果で上書き）
+        fig = build()
+        size = estimate_figure_bytes(fig)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            # 単体で上限を超える図はキャッシュしない
+            if size <= self.max_bytes:
+                self._entries[key] = (fig, size)
+                self._total_bytes += size
+                self._evict()
+        return fig
+
+    def _evict(self) -> None:
+        """上限を超えた分を古いものから削除（ロック取得済みで呼び出すこと）"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """全ての図を削除"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            件数・合計サイズ・ヒット数・ミス数・削除数の辞書
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
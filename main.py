@@ -1,12 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import base64
 from datetime import datetime, date, timedelta, timezone
 import plotly.graph_objects as go
 import plotly.express as px
 from database import WeightDatabase
+from csv_import import IMPORT_CHUNK_ROWS, validate_import_frame, format_error_messages, read_csv_chunks
+from downsampling import downsample_series
+from figure_cache import FigureCache
+from progress_reporter import ProgressReporter, format_progress
+from render_profiler import RenderProfiler
+from metrics import AppMetrics
 
 import sys
 import os
+import time
 import warnings
 
 # Plotlyの警告を無視
@@ -159,10 +168,15 @@ def get_jst_now():
         return jst_now.date()
 
 
+@st.cache_resource(show_spinner=False)
+def get_database() -> WeightDatabase:
+    """プロセス全体で共有するデータベースハンドルを取得（スキーマの確認・移行は初回のみ）"""
+    return WeightDatabase()
+
 def init_database():
     """データベースの初期化"""
     try:
-        db = WeightDatabase()
+        db = get_database()
         return db
     except Exception as e:
         st.error(f"データベース初期化エラー: {str(e)}")
@@ -192,7 +206,7 @@ def get_simple_recommendations(db):
     """推奨値の簡単な算出"""
     try:
         # 過去7日間のデータを取得
-        recent_data = db.get_measurements(7)
+        recent_data = db.get_measurements(7, columns=['weight', 'body_fat'])
         if recent_data.empty:
             return {}
         
@@ -209,6 +223,20 @@ def get_simple_recommendations(db):
     except Exception:
         return {}
 
+# グラフの描画幅（ピクセル）。1系列あたりこの点数を超える場合は間引いて描画する
+GRAPH_PIXEL_WIDTH = 1200
+
+# 表示するデータ件数（間引く前）がこの値を超える場合はWebGL（Scattergl）で描画する
+GRAPH_WEBGL_THRESHOLD = 5000
+
+# アップロードされたCSVがこのサイズ（バイト）を超える場合は分割して読み込む
+IMPORT_STREAMING_BYTES = 5 * 1024 * 1024
+
+# 分割インポートで保持・表示するエラー詳細の最大件数
+IMPORT_ERROR_DISPLAY_LIMIT = 100
+# 描画プロファイルの推移として保持する再実行の回数
+PROFILE_HISTORY_LIMIT = 50
+
 def calculate_moving_average(df: pd.DataFrame, window: int = 7) -> pd.DataFrame:
     """移動平均を計算"""
     df_sorted = df.sort_values('date').copy()
@@ -217,105 +245,108 @@ def calculate_moving_average(df: pd.DataFrame, window: int = 7) -> pd.DataFrame:
         df_sorted['body_fat_ma'] = df_sorted['body_fat'].rolling(window=window, min_periods=1).mean()
     return df_sorted
 
-def create_weight_graph(df: pd.DataFrame, period_days: int = None, target_weight: float = None) -> go.Figure:
-    """体重グラフの作成"""
-    if df.empty:
-        # データが空の場合のプレースホルダー
-        fig = go.Figure()
-        fig.add_annotation(
-            text="データがありません<br>左側のフォームから記録を追加してください",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, xanchor='center', yanchor='middle',
-            showarrow=False,
-            font=dict(size=16, color="#666666")
-        )
-        fig.update_layout(
-            title="体重推移グラフ",
-            xaxis_title="日付",
-            yaxis_title="体重 (kg)",
-            height=400
-        )
-        return fig
+def _trace_array(values: pd.Series, typed_arrays: bool = False):
+    """
+    トレースに渡す配列を作成
     
-    # データの前処理
-    df_with_ma = calculate_moving_average(df)
+    typed_arrays=Trueの場合はplotly.jsの型付き配列（base64）形式にする。
+    日付はエポックからのミリ秒として渡す（日付軸ではそのまま日付として表示される）。
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        array = values.to_numpy()
+        if not typed_arrays:
+            return array
+        array = array.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    else:
+        array = values.to_numpy(dtype=np.float64)
+        if not typed_arrays:
+            return array
+    return {'dtype': 'f8', 'bdata': base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')}
+
+def build_weight_graph_spec(df: pd.DataFrame, period_days: int = None, target_weight: float = None,
+                            max_points: int = GRAPH_PIXEL_WIDTH,
+                            webgl_threshold: int = GRAPH_WEBGL_THRESHOLD,
+                            typed_arrays: bool = False) -> dict:
+    """
+    体重グラフの図の定義（data・layout）をPlotlyのオブジェクトを介さずに辞書で作成
     
-    # 図の作成
-    fig = go.Figure()
+    Args:
+        df: 測定データ（date, weight, body_fat、任意でweight_ma）
+        period_days: 表示期間（タイトル用）
+        target_weight: 目標体重（Noneの場合は参照線なし）
+        max_points: 1系列あたりの最大描画点数（超える場合はLTTBで間引く、Noneの場合は全点）
+        webgl_threshold: データ件数（間引く前）がこの値を超える場合はscatterglで描画
+                         （Noneの場合は常にSVG、0の場合は常にWebGL）
+        typed_arrays: 配列をbase64の型付き配列で埋め込む
+        
+    Returns:
+        {'data': [...], 'layout': {...}}
+    """
+    if df.empty:
+        # データが空の場合のプレースホルダー
+        return {
+            'data': [],
+            'layout': {
+                'annotations': [{
+                    'text': "データがありません<br>左側のフォームから記録を追加してください",
+                    'xref': 'paper', 'yref': 'paper',
+                    'x': 0.5, 'y': 0.5, 'xanchor': 'center', 'yanchor': 'middle',
+                    'showarrow': False,
+                    'font': {'size': 16, 'color': "#666666"}
+                }],
+                'title': {'text': "体重推移グラフ"},
+                'xaxis': {'title': {'text': "日付"}},
+                'yaxis': {'title': {'text': "体重 (kg)"}},
+                'height': 400
+            }
+        }
     
-    # 体重ライン（メイン）
-    fig.add_trace(go.Scatter(
-        x=df_with_ma['date'],
-        y=df_with_ma['weight'],
-        mode='lines',
-        name='体重',
-        line=dict(color=COLOR_SCHEME['primary'], width=2),
-        hovertemplate='<b>%{fullData.name}</b><br>' +
-                     '日付: %{x}<br>' +
-                     '体重: %{y:.1f}kg<br>' +
-                     '<extra></extra>'
-    ))
+    # データの前処理（移動平均が事前計算済みの場合はそのまま使用）
+    df_with_ma = df if 'weight_ma' in df.columns else calculate_moving_average(df)
+    has_body_fat = 'body_fat' in df_with_ma.columns and df_with_ma['body_fat'].notna().any()
     
-    # 7日移動平均ライン
+    # 系列ごとの表示設定: (カラム, 名前, 線の設定, ホバーの項目名, 単位, その他)
+    series = [('weight', '体重', {'color': COLOR_SCHEME['primary'], 'width': 2}, '体重', 'kg', {})]
     if len(df_with_ma) >= 3:  # 最低3つのデータポイントがある場合のみ
-        fig.add_trace(go.Scatter(
-            x=df_with_ma['date'],
-            y=df_with_ma['weight_ma'],
-            mode='lines',
-            name='7日移動平均',
-            line=dict(color=COLOR_SCHEME['primary'], width=2, dash='dash'),
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         '日付: %{x}<br>' +
-                         '移動平均: %{y:.1f}kg<br>' +
-                         '<extra></extra>'
-        ))
-    
-    # 体脂肪率ライン（データがある場合）
-    has_body_fat = 'body_fat' in df_with_ma.columns and df_with_ma['body_fat'].notna().any()
+        series.append(('weight_ma', '7日移動平均',
+                       {'color': COLOR_SCHEME['primary'], 'dash': 'dash', 'width': 2}, '移動平均', 'kg', {}))
     if has_body_fat:
-        fig.add_trace(go.Scatter(
-            x=df_with_ma['date'],
-            y=df_with_ma['body_fat'],
-            mode='lines',
-            name='体脂肪率',
-            line=dict(color=COLOR_SCHEME['secondary'], width=2),
-            marker=dict(size=6, color=COLOR_SCHEME['secondary']),
-            yaxis='y2',
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         '日付: %{x}<br>' +
-                         '体脂肪率: %{y:.1f}%<br>' +
-                         '<extra></extra>'
-        ))
+        series.append(('body_fat', '体脂肪率', {'color': COLOR_SCHEME['secondary'], 'width': 2}, '体脂肪率', '%',
+                       {'marker': {'color': COLOR_SCHEME['secondary'], 'size': 6}, 'yaxis': 'y2'}))
     
-    # 目標体重の参照線（設定されている場合）
-    if target_weight is not None:
-        fig.add_hline(
-            y=target_weight,
-            line=dict(color='red', width=2),
-            annotation_text=f"目標体重: {target_weight:.1f}kg",
-            annotation_position="top left",
-            annotation=dict(
-                bgcolor="rgba(255, 255, 255, 0.8)",
-                bordercolor="red",
-                borderwidth=1
-            )
-        )
-        
-
+    # 各系列を描画幅に合わせて間引き、データ件数が多い場合はWebGLで描画
+    # （間引き後の点数は描画幅以下になるため、判定には間引く前の件数を使う）
+    points = [downsample_series(df_with_ma['date'], df_with_ma[column], max_points)
+              for column, *_ in series]
+    trace_type = 'scattergl' if webgl_threshold is not None and len(df_with_ma) > webgl_threshold else 'scatter'
+    
+    data = []
+    for (column, name, line, label, unit, extra), (x, y) in zip(series, points):
+        trace = {
+            'hovertemplate': f'<b>%{{fullData.name}}</b><br>日付: %{{x}}<br>{label}: %{{y:.1f}}{unit}<br><extra></extra>',
+            'line': line,
+            **extra,
+            'mode': 'lines',
+            'name': name,
+            'x': _trace_array(x, typed_arrays),
+            'y': _trace_array(y, typed_arrays),
+            'type': trace_type
+        }
+        data.append(trace)
     
     # レイアウト設定
     title = f"体重推移グラフ"
     if period_days:
         title += f" (過去{period_days}日間)"
     
-    layout_config = {
+    layout = {
         'title': {
-            'text': title,
             'font': {'size': 20, 'color': COLOR_SCHEME['text']},
+            'text': title,
             'x': 0.5
         },
         'xaxis': {
-            'title': '日付',
+            'title': {'text': '日付'},
             'type': 'date',
             'tickformat': '%Y-%m-%d',
             'tickangle': -45,
@@ -323,28 +354,46 @@ def create_weight_graph(df: pd.DataFrame, period_days: int = None, target_weight
             'showgrid': True
         },
         'yaxis': {
-            'title': '体重 (kg)',
+            'title': {'text': '体重 (kg)'},
             'gridcolor': '#E0E0E0',
             'showgrid': True,
             'zeroline': False
         },
-        'plot_bgcolor': COLOR_SCHEME['background'],
-        'paper_bgcolor': COLOR_SCHEME['background'],
-        'height': 500,
-        'hovermode': 'x unified',
         'legend': {
             'orientation': 'h',
             'yanchor': 'bottom',
             'y': 1.02,
             'xanchor': 'right',
             'x': 1
-        }
+        },
+        'plot_bgcolor': COLOR_SCHEME['background'],
+        'paper_bgcolor': COLOR_SCHEME['background'],
+        'height': 500,
+        'hovermode': 'x unified'
     }
     
+    # 目標体重の参照線（設定されている場合）
+    if target_weight is not None:
+        layout['shapes'] = [{
+            'line': {'color': 'red', 'width': 2},
+            'type': 'line',
+            'x0': 0, 'x1': 1, 'xref': 'x domain',
+            'y0': target_weight, 'y1': target_weight, 'yref': 'y'
+        }]
+        layout['annotations'] = [{
+            'bgcolor': "rgba(255, 255, 255, 0.8)",
+            'bordercolor': "red",
+            'borderwidth': 1,
+            'showarrow': False,
+            'text': f"目標体重: {target_weight:.1f}kg",
+            'x': 0, 'xanchor': 'left', 'xref': 'x domain',
+            'y': target_weight, 'yanchor': 'bottom', 'yref': 'y'
+        }]
+    
     # 体脂肪率がある場合は右側Y軸を追加
     if has_body_fat:
-        layout_config['yaxis2'] = {
-            'title': '体脂肪率 (%)',
+        layout['yaxis2'] = {
+            'title': {'text': '体脂肪率 (%)'},
             'overlaying': 'y',
             'side': 'right',
             'gridcolor': '#E0E0E0',
@@ -352,9 +401,23 @@ def create_weight_graph(df: pd.DataFrame, period_days: int = None, target_weight
             'zeroline': False
         }
     
-    fig.update_layout(**layout_config)
+    return {'data': data, 'layout': layout}
+
+def create_weight_graph(df: pd.DataFrame, period_days: int = None, target_weight: float = None,
+                        max_points: int = GRAPH_PIXEL_WIDTH,
+                        webgl_threshold: int = GRAPH_WEBGL_THRESHOLD,
+                        typed_arrays: bool = False) -> go.Figure:
+    """
+    体重グラフの作成
     
-    return fig
+    各系列はmax_points点を超える場合にLTTBで間引く（Noneの場合は全点を描画）。
+    データ件数（間引く前）がwebgl_threshold件を超える場合はScatterglで描画する
+    （Noneの場合は常にSVG、0の場合は常にWebGL）。
+    図の定義はbuild_weight_graph_specで組み立て済みのため、Plotlyのプロパティ検証は省略する。
+    """
+    spec = build_weight_graph_spec(df, period_days, target_weight, max_points, webgl_threshold, typed_arrays)
+    # _validate=False: 配列・属性ごとの検証を行わずに図オブジェクトを作成
+    return go.Figure(spec, _validate=False)
 
 def filter_data_by_period(df: pd.DataFrame, period_days: int) -> pd.DataFrame:
     """期間でデータをフィルタリング"""
@@ -367,18 +430,274 @@ def filter_data_by_period(df: pd.DataFrame, period_days: int) -> pd.DataFrame:
     
     return df[df['date'] >= start_date]
 
+def diff_edited_data(original_df: pd.DataFrame, edited_df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    """
+    データエディタの編集前後を日付で突き合わせ、更新・削除された行を一度に検出
+
+    Args:
+        original_df: 編集前のデータ（id, 日付, 体重(kg), 体脂肪率(%)）
+        edited_df: 編集後のデータ（日付, 体重(kg), 体脂肪率(%)）
+
+    Returns:
+        (更新内容のDataFrame[id, date, weight, body_fat], 削除された行のidリスト)
+        日付が欠損している編集前の行は突き合わせられないため、削除とはみなさない
+    """
+    merged = original_df[['id', '日付', '体重(kg)', '体脂肪率(%)']].merge(
+        edited_df[['日付', '体重(kg)', '体脂肪率(%)']].dropna(subset=['日付']).drop_duplicates('日付'),
+        on='日付', how='left', suffixes=('', '_edited'), indicator=True
+    )
+
+    deleted = (merged['_merge'] == 'left_only') & merged['日付'].notna()
+    kept = merged[merged['_merge'] == 'both']
+
+    # 欠損同士は変更なしとみなして比較
+    changed = pd.Series(False, index=kept.index)
+    for column in ('体重(kg)', '体脂肪率(%)'):
+        before = kept[column]
+        after = kept[f'{column}_edited']
+        changed |= (before != after) & ~(before.isna() & after.isna())
+
+    updates = kept.loc[changed, ['id', '日付', '体重(kg)_edited', '体脂肪率(%)_edited']]
+    updates.columns = ['id', 'date', 'weight', 'body_fat']
+    deleted_ids = merged.loc[deleted, 'id'].astype(int).tolist()
+    return updates.reset_index(drop=True), deleted_ids
+
+def load_editor_page(db, cursor: str = None, direction: str = 'older', page_size: int = 50) -> tuple[pd.DataFrame, bool, bool]:
+    """
+    データエディタに表示する1ページ分を日付カーソルで取得
+
+    1件余分に読み込み、進む方向に続きのページがあるかを判定する。
+    カーソルの先にデータがない場合（最初の記録より前の日付へ移動した場合や、最古のページの行を
+    すべて削除した場合）は最新ページを表示する。
+
+    Returns:
+        (新しい順のページデータ, より古いページがあるか, より新しいページがあるか)
+    """
+    page = db.get_measurements_page(
+        cursor, page_size + 1, direction, columns=['id', 'date', 'weight', 'body_fat']
+    )
+    has_more = len(page) > page_size
+    if page.empty and cursor is not None:
+        return load_editor_page(db, None, 'older', page_size)
+    if direction == 'older':
+        return page.iloc[:page_size], has_more, cursor is not None
+    if not has_more:
+        # 最新まで到達した場合は最新ページを表示
+        return load_editor_page(db, None, 'older', page_size)
+    return page.iloc[1:].reset_index(drop=True), True, True
+
+def get_period_data(db, period_days: int = None, columns: list = None, compact: bool = False) -> pd.DataFrame:
+    """期間のデータをデータベースの日付範囲検索で取得（最新の記録日から指定日数分）"""
+    if period_days is None:
+        return db.get_measurements_between(columns=columns, compact=compact)
+    
+    latest_date = db.get_latest_date()
+    if latest_date is None:
+        return pd.DataFrame()
+    
+    end_date = pd.Timestamp(latest_date)
+    start_date = end_date - pd.Timedelta(days=period_days - 1)
+    return db.get_measurements_between(start_date, end_date, columns=columns, compact=compact)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_data_snapshot(_db, db_path: str, data_version: int) -> dict:
+    """
+    統計・最新の測定・設定のスナップショットを読み込み
+    
+    data_versionが変わった時のみ再読み込みされる。全測定データは読み込まず、件数と最新体重は
+    全期間統計から、最新の体脂肪率は最新1件から取得する。返り値は全セッションで共有されるため、
+    呼び出し側では変更せずにコピーして使用すること。
+    """
+    get_app_metrics(_db, db_path).record_cache_miss('data_snapshot')
+    latest = _db.get_measurements(1, columns=['date', 'weight', 'body_fat'])
+    return {
+        'latest_measurement': latest.iloc[-1].to_dict() if not latest.empty else None,
+        'statistics': _db.get_statistics(None),
+        'moving_averages': _db.get_latest_moving_averages(),
+        'target_weight': _db.get_setting('target_weight')
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_period_snapshot(_db, db_path: str, data_version: int, period_days: int = None) -> pd.DataFrame:
+    """期間データのスナップショットを読み込み（data_versionが変わった時のみ再読み込み）"""
+    get_app_metrics(_db, db_path).record_cache_miss('period_snapshot')
+    df = get_period_data(_db, period_days, columns=['date', 'weight', 'body_fat', 'weight_ma7'], compact=True)
+    # 事前計算済みの7日移動平均をグラフ用のカラム名で保持
+    return df.rename(columns={'weight_ma7': 'weight_ma'})
+
+def get_period_snapshot(db, data_version: int, period_days: int = None) -> pd.DataFrame:
+    """期間データのスナップショットを取得（キャッシュの参照をメトリクスに記録）"""
+    get_app_metrics(db, db.db_path).record_cache_request('period_snapshot')
+    return load_period_snapshot(db, db.db_path, data_version, period_days)
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache() -> FigureCache:
+    """プロセス全体で共有するグラフのキャッシュを取得"""
+    return FigureCache()
+
+@st.cache_resource(show_spinner=False)
+def get_app_metrics(_db, db_path: str) -> AppMetrics:
+    """
+    プロセス全体で共有するメトリクスを取得
+    
+    環境変数 WEIGHT_TRACKER_METRICS_PORT が設定されていればHTTPエンドポイント（/metrics）を、
+    WEIGHT_TRACKER_METRICS_FILE が設定されていればファイルへの出力を開始する。
+    """
+    return AppMetrics.from_environment(_db, get_figure_cache())
+
+def get_weight_graph(db, data_version: int, period_days: int = None, target_weight: float = None,
+                     theme: str = None, zoom: tuple = None) -> go.Figure:
+    """
+    体重グラフをキャッシュから取得（データ・期間・目標体重・テーマ・拡大範囲が同じ間は再作成しない）
+    
+    Args:
+        db: データベース
+        data_version: データバージョン（書き込みのたびに変わる）
+        period_days: 表示期間（日数、Noneの場合は全期間）
+        target_weight: 目標体重
+        theme: 表示テーマ（ライト/ダーク）
+        zoom: 拡大表示する範囲 (開始日, 終了日)。Noneの場合は期間全体
+    """
+    def build() -> go.Figure:
+        if zoom is None:
+            df = get_period_snapshot(db, data_version, period_days)
+        else:
+            df = db.get_measurements_between(
+                zoom[0], zoom[1], columns=['date', 'weight', 'body_fat', 'weight_ma7'], compact=True
+            ).rename(columns={'weight_ma7': 'weight_ma'})
+        return create_weight_graph(df, period_days, target_weight)
+    
+    key = (db.db_path, data_version, period_days, target_weight, theme, zoom)
+    return get_figure_cache().get_or_build(key, build)
+
+def get_data_snapshot(db) -> dict:
+    """現在のデータバージョンに対応するスナップショットを取得"""
+    data_version = db.get_data_version()
+    get_app_metrics(db, db.db_path).record_cache_request('data_snapshot')
+    snapshot = dict(load_data_snapshot(db, db.db_path, data_version))
+    snapshot['version'] = data_version
+    return snapshot
+
+def export_csv_data(db, compress: bool = False) -> bytes:
+    """
+    ダウンロード用のCSVをデータベースのカーソルから少しずつ作成
+
+    DataFrameを経由しないため、保持するのは出力するバイト列のみ。
+
+    Args:
+        db: データベース
+        compress: Trueの場合、gzip形式で圧縮
+    """
+    return b''.join(db.iter_csv_chunks(compress=compress))
+
+def create_import_progress(total: int = None) -> ProgressReporter:
+    """
+    インポートの進捗バーと状況表示を作成
+    
+    進捗の通知はProgressReporterで間引かれるため、チャンク数によらず画面の更新回数は一定以下。
+    
+    Args:
+        total: 全体の行数（不明な場合None）
+    """
+    progress_bar = st.progress(0.0)
+    status_text = st.empty()
+    
+    def render(update: dict) -> None:
+        if update['fraction'] is not None:
+            progress_bar.progress(update['fraction'])
+        status_text.text(format_progress(update))
+    
+    return ProgressReporter(render, total)
+
+def show_import_result(result: dict) -> bool:
+    """
+    インポート結果を表示
+    
+    Args:
+        result: import_measurements・import_chunksが返すインポート結果
+        
+    Returns:
+        データが書き込まれた場合True（画面の再実行が必要）
+    """
+    success_count = result['success_count']
+    skipped_count = result['skipped_count']
+    error_count = result['error_count']
+    for error in format_error_messages(result['errors']):
+        st.error(error)
+    if error_count > len(result['errors']):
+        st.text(f"  ... 他 {error_count - len(result['errors'])}件")
+    
+    # 結果表示
+    if success_count > 0:
+        st.success(f"✅ {success_count}件のデータをインポートしました")
+        
+    if skipped_count > 0:
+        st.info(f"ℹ️ {skipped_count}件のデータをスキップしました（重複のため）")
+        
+    if error_count > 0:
+        st.warning(f"⚠️ {error_count}件のデータでエラーが発生しました")
+    
+    if success_count == 0 and error_count == 0:
+        st.info("📝 インポートする新しいデータがありませんでした")
+    return success_count > 0
+
+def show_render_profile(record: dict):
+    """描画プロファイル（区間ごとの時間・DB呼び出し・メモリ）を折りたたみ表示"""
+    history = st.session_state.setdefault('render_profile_history', [])
+    history.append(record['total_ms'])
+    del history[:-PROFILE_HISTORY_LIMIT]
+    
+    with st.expander(f"⏱️ 描画プロファイル（{record['total_ms']:.0f}ms）", expanded=False):
+        sections = pd.DataFrame(record['sections']).rename(columns={
+            'name': '区間', 'ms': '時間(ms)', 'db_calls': 'DB呼び出し', 'queries': 'SQL',
+            'rows': '行数', 'query_ms': 'SQL時間(ms)', 'memory_kb': 'メモリ増減(KB)', 'peak_kb': 'ピーク(KB)'
+        })
+        st.dataframe(sections, hide_index=True, use_container_width=True)
+        if len(history) > 1:
+            st.caption(f"直近{len(history)}回の再実行の合計時間(ms)")
+            st.line_chart(pd.Series(history, name='合計時間(ms)'), height=120)
+
 def main():
     """メインアプリケーション"""
     
     # データベース初期化
     db = init_database()
     
+    # 描画プロファイル（環境変数 WEIGHT_TRACKER_PROFILE=1、または許可されている場合はURLの ?profile=1 で有効）
+    profiler = RenderProfiler.from_environment(db.query_stats, st.query_params)
+    metrics = get_app_metrics(db, db.db_path)
+    started = time.perf_counter()
+    completed = False
+    try:
+        render_app(db, profiler)
+        completed = True
+    finally:
+        # st.rerun等で中断した再実行もトレース・メトリクスに残す
+        record = profiler.finish(completed)
+        metrics.observe_rerun(time.perf_counter() - started, completed)
+    if record is not None:
+        show_render_profile(record)
+
+def render_app(db, profiler: RenderProfiler):
+    """
+    画面全体を描画
+    
+    Args:
+        db: データベース
+        profiler: 区間ごとの計測に使うプロファイラー
+    """
+    profiler.checkpoint('snapshot')
+    
+    # データスナップショット（データベースが変更された時のみ再読み込み）
+    snapshot = get_data_snapshot(db)
+    
     # メインヘッダー
     st.markdown('<h1 class="main-header">⚖️ 体重トラッカー</h1>', unsafe_allow_html=True)
     
     # 左サイドバー（入力・設定エリア）
     with st.sidebar:
         # 1. 体重記録セクション
+        profiler.checkpoint('entry')
         st.header("📝 体重記録")
         
         # 推奨値の表示
@@ -504,11 +823,12 @@ def main():
         st.markdown("---")
         
         # 2. 目標体重設定セクション
+        profiler.checkpoint('goal')
         st.header("🎯 目標体重設定")
         
         try:
             # 現在の目標体重を取得
-            current_target = db.get_setting('target_weight')
+            current_target = snapshot['target_weight']
             if current_target is None:
                 current_target = 70.0
             
@@ -538,9 +858,8 @@ def main():
             # 進捗バー表示
             try:
                 # 最新の体重データを取得
-                recent_data = db.get_measurements(1)
-                if not recent_data.empty:
-                    current_weight = recent_data.iloc[0]['weight']
+                if not df_snapshot.empty:
+                    current_weight = float(df_snapshot.iloc[-1]['weight'])
                     
                     # 進捗計算
                     weight_diff = current_weight - target_weight
@@ -560,12 +879,9 @@ def main():
                     
                     # 進捗バーの計算と表示
                     # 開始体重を30日前のデータまたは初回データから取得
-                    all_data = db.get_measurements()
-                    if not all_data.empty:
-                        # 30日前のデータを取得（期間フィルタリング）
-                        start_data = filter_data_by_period(all_data, 30)
-                        if not start_data.empty:
-                            start_weight = start_data.iloc[0]['weight']  # 最も古いデータ
+                    start_data = get_period_snapshot(db, snapshot['version'], 30)
+                    if not start_data.empty:
+                        start_weight = float(start_data.iloc[0]['weight'])  # 最も古いデータ
                         
                         # 進捗率計算
                         if start_weight != target_weight:
@@ -594,30 +910,35 @@ def main():
         st.header("📁 データ管理")
         
         # CSVエクスポート
+        profiler.checkpoint('export')
         st.subheader("📤 データエクスポート")
         
         try:
-            # 全データをCSV形式で取得
-            df_export = db.export_to_csv()
+            record_count = (snapshot['statistics'] or {}).get('count', 0)
             
-            if not df_export.empty:
-                # CSVファイルとして出力
-                csv_data = df_export.to_csv(index=False)
+            if record_count > 0:
+                compress_export = st.checkbox(
+                    "gzip形式で圧縮する", key="export_gzip",
+                    help="大量のデータをダウンロードする場合に推奨"
+                )
                 
                 # 現在の日付をファイル名に含める
                 current_date = datetime.now().strftime("%Y%m%d")
                 filename = f"weight_data_{current_date}.csv"
+                if compress_export:
+                    filename += ".gz"
                 
+                # CSVはボタンが押された時にだけ作成する
                 st.download_button(
                     label="📥 CSVファイルをダウンロード",
-                    data=csv_data,
+                    data=lambda: export_csv_data(db, compress_export),
                     file_name=filename,
-                    mime="text/csv",
+                    mime="application/gzip" if compress_export else "text/csv",
                     key="download_csv",
-                    help=f"{len(df_export)}件のデータをダウンロード"
+                    help=f"{record_count}件のデータをダウンロード"
                 )
                 
-                st.info(f"💾 ダウンロード可能: {len(df_export)}件のデータ")
+                st.info(f"💾 ダウンロード可能: {record_count}件のデータ")
             else:
                 st.warning("⚠️ エクスポートするデータがありません")
                 
@@ -625,6 +946,7 @@ def main():
             st.error(f"❌ エクスポートの準備に失敗しました: {str(e)}")
         
         # CSVインポート
+        profiler.checkpoint('import')
         st.subheader("📤 データインポート")
         
         uploaded_file = st.file_uploader(
@@ -635,8 +957,13 @@ def main():
         
         if uploaded_file is not None:
             try:
-                # CSVファイルを読み込み
-                df_import = pd.read_csv(uploaded_file)
+                # 大きなファイルは最初のチャンクだけ読み込み、インポート時に分割して読み込む
+                streaming = uploaded_file.size > IMPORT_STREAMING_BYTES
+                if streaming:
+                    df_import = pd.read_csv(uploaded_file, nrows=IMPORT_CHUNK_ROWS)
+                else:
+                    # CSVファイルを読み込み
+                    df_import = pd.read_csv(uploaded_file)
                 
                 # データの確認
                 st.write("**プレビュー（最初の5行）:**")
@@ -649,75 +976,62 @@ def main():
                 if missing_columns:
                     st.error(f"❌ 必要なカラムが不足しています: {missing_columns}")
                     st.info("💡 CSVファイルには少なくとも 'date' と 'weight' のカラムが必要です")
-                else:
-                    # データのバリデーション
-                    valid_rows = []
-                    invalid_rows = []
+                elif streaming:
+                    st.info(f"📦 大きなファイル（{uploaded_file.size / 1024 / 1024:.1f}MB）のため、"
+                            f"{IMPORT_CHUNK_ROWS:,}行ずつ検証・インポートします")
+                    duplicate_action = st.radio(
+                        "既存の日付と重複するデータの処理方法",
+                        options=["スキップ", "上書き"],
+                        help="スキップ: 重複データを無視, 上書き: 既存データを新しいデータで置き換え",
+                        key="duplicate_action"
+                    )
                     
-                    for idx, row in df_import.iterrows():
+                    if st.button("📤 データをインポート", key="csv_import"):
                         try:
-                            # 日付のバリデーション
-                            date_str = str(row['date']).strip()
-                            if not date_str or date_str.lower() in ['nan', 'none', '']:
-                                invalid_rows.append(f"行{idx+2}: 日付が空です")
-                                continue
-                            
-                            # 体重のバリデーション
-                            weight_val = row['weight']
-                            if pd.isna(weight_val) or weight_val == '':
-                                invalid_rows.append(f"行{idx+2}: 体重が空です")
-                                continue
-                            
-                            weight = float(weight_val)
-                            if not (10.0 <= weight <= 300.0):
-                                invalid_rows.append(f"行{idx+2}: 体重が範囲外です ({weight}kg)")
-                                continue
+                            reporter = create_import_progress()
                             
-                            # 体脂肪率のバリデーション（任意）
-                            body_fat = None
-                            if 'body_fat' in row and pd.notna(row['body_fat']) and str(row['body_fat']).strip():
-                                body_fat_val = float(row['body_fat'])
-                                if not (0.0 <= body_fat_val <= 100.0):
-                                    invalid_rows.append(f"行{idx+2}: 体脂肪率が範囲外です ({body_fat_val}%)")
-                                    continue
-                                body_fat = body_fat_val
+                            def report_progress(rows_read: int) -> None:
+                                # 総行数は不明なため、読み込み済みのバイト数から進捗率を概算
+                                reporter.update(rows_read, uploaded_file.tell() / uploaded_file.size)
                             
-                            valid_rows.append({
-                                'date': date_str,
-                                'weight': weight,
-                                'body_fat': body_fat,
-                                'row_num': idx + 2
-                            })
+                            uploaded_file.seek(0)
+                            started = time.perf_counter()
+                            result = db.import_chunks(
+                                read_csv_chunks(uploaded_file, IMPORT_CHUNK_ROWS),
+                                on_duplicate='skip' if duplicate_action == "スキップ" else 'overwrite',
+                                progress=report_progress,
+                                max_errors=IMPORT_ERROR_DISPLAY_LIMIT
+                            )
+                            get_app_metrics(db, db.db_path).record_import(
+                                result['success_count'], time.perf_counter() - started
+                            )
                             
-                        except (ValueError, TypeError) as e:
-                            invalid_rows.append(f"行{idx+2}: データ変換エラー ({str(e)})")
+                            if show_import_result(result):
+                                st.rerun()
+                        
+                        except Exception as e:
+                            st.error(f"❌ インポートエラー: {str(e)}")
+                else:
+                    # データのバリデーション（列単位で一括判定）
+                    valid_df, import_errors = validate_import_frame(df_import)
                     
                     # バリデーション結果の表示
-                    if invalid_rows:
-                        st.warning(f"⚠️ {len(invalid_rows)}件の無効なデータがあります:")
-                        for error in invalid_rows[:5]:  # 最初の5件のみ表示
+                    if import_errors:
+                        st.warning(f"⚠️ {len(import_errors)}件の無効なデータがあります:")
+                        for error in format_error_messages(import_errors[:5]):  # 最初の5件のみ表示
                             st.text(f"  • {error}")
-                        if len(invalid_rows) > 5:
-                            st.text(f"  ... 他 {len(invalid_rows)-5}件")
+                        if len(import_errors) > 5:
+                            st.text(f"  ... 他 {len(import_errors)-5}件")
                     
-                    if not valid_rows:
+                    if valid_df.empty:
                         st.error("❌ 有効なデータがありません")
                     else:
-                        st.info(f"✅ {len(valid_rows)}件の有効なデータが見つかりました")
+                        st.info(f"✅ {len(valid_df)}件の有効なデータが見つかりました")
                         
-                        # 重複データの確認
-                        existing_data = db.get_measurements()
-                        existing_dates = set()
-                        if not existing_data.empty:
-                            existing_dates = set(existing_data['date'].dt.strftime('%Y-%m-%d').tolist())
+                        # 重複データの確認（ステージングテーブルとの結合で判定）
+                        unique_duplicates = db.find_duplicate_dates(valid_df)
                         
-                        duplicate_dates = []
-                        for row_data in valid_rows:
-                            if row_data['date'] in existing_dates:
-                                duplicate_dates.append(row_data['date'])
-                        
-                        if duplicate_dates:
-                            unique_duplicates = list(set(duplicate_dates))
+                        if unique_duplicates:
                             st.warning(f"⚠️ 重複する日付が{len(unique_duplicates)}件見つかりました")
                             st.write("重複する日付:", unique_duplicates[:10])
                             
@@ -735,65 +1049,19 @@ def main():
                         # インポート実行ボタン
                         if st.button("📤 データをインポート", key="csv_import"):
                             try:
-                                success_count = 0
-                                error_count = 0
-                                skipped_count = 0
-                                
-                                # プログレスバー
-                                progress_bar = st.progress(0)
-                                status_text = st.empty()
-                                
-                                for i, row_data in enumerate(valid_rows):
-                                    try:
-                                        date_str = row_data['date']
-                                        weight = row_data['weight']
-                                        body_fat = row_data['body_fat']
-                                        
-                                        # 重複チェック
-                                        if date_str in existing_dates:
-                                            if duplicate_action == "スキップ":
-                                                skipped_count += 1
-                                                continue
-                                            elif duplicate_action == "上書き":
-                                                # 既存データを削除
-                                                matching_record = existing_data[existing_data['date'].dt.strftime('%Y-%m-%d') == date_str]
-                                                if not matching_record.empty:
-                                                    record_id = int(matching_record.iloc[0]['id'])
-                                                    db.delete_measurement(record_id)
-                                        
-                                        # 新しいデータを挿入
-                                        if db.add_measurement(date_str, weight, body_fat):
-                                            success_count += 1
-                                            existing_dates.add(date_str)
-                                        else:
-                                            error_count += 1
-                                        
-                                        # プログレス更新
-                                        progress = (i + 1) / len(valid_rows)
-                                        progress_bar.progress(progress)
-                                        status_text.text(f"処理中... {i+1}/{len(valid_rows)}")
-                                        
-                                    except Exception as row_error:
-                                        st.error(f"行{row_data['row_num']}のエラー: {str(row_error)}")
-                                        error_count += 1
-                                
-                                # 結果表示
-                                progress_bar.empty()
-                                status_text.empty()
-                                
-                                if success_count > 0:
-                                    st.success(f"✅ {success_count}件のデータをインポートしました")
-                                    
-                                if skipped_count > 0:
-                                    st.info(f"ℹ️ {skipped_count}件のデータをスキップしました（重複のため）")
-                                    
-                                if error_count > 0:
-                                    st.warning(f"⚠️ {error_count}件のデータでエラーが発生しました")
-                                
-                                if success_count > 0:
+                                # 重複の解決と書き込みを1つのトランザクションで実行
+                                with st.spinner(f"{len(valid_df)}件のデータをインポート中..."):
+                                    started = time.perf_counter()
+                                    result = db.import_measurements(
+                                        valid_df,
+                                        on_duplicate='skip' if duplicate_action == "スキップ" else 'overwrite',
+                                        progress=create_import_progress(len(valid_df))
+                                    )
+                                    get_app_metrics(db, db.db_path).record_import(
+                                        result['success_count'], time.perf_counter() - started
+                                    )
+                                if show_import_result(result):
                                     st.rerun()
-                                elif success_count == 0 and error_count == 0:
-                                    st.info("📝 インポートする新しいデータがありませんでした")
                                 
                             except Exception as e:
                                 st.error(f"❌ インポートエラー: {str(e)}")
@@ -804,29 +1072,30 @@ def main():
     
     # 右メインコンテンツ（表示・分析エリア）
     # 1. 統計情報セクション（最上部）
+    profiler.checkpoint('statistics')
     st.subheader("📊 統計情報")
     
     try:
         # 基本統計情報を取得
-        df_all = db.get_measurements()
-        if not df_all.empty:
+        statistics = snapshot['statistics']
+        if statistics:
             # 最新のデータを取得
-            latest_data = df_all.iloc[-1]  # 最新データ
+            latest_data = snapshot['latest_measurement']
             
-            # 7日移動平均を計算
-            df_with_ma = calculate_moving_average(df_all, 7)
-            latest_ma = df_with_ma.iloc[-1]['weight_ma'] if not df_with_ma.empty else None
+            # 7日移動平均（事前計算済みの値を使用）
+            moving_averages = snapshot['moving_averages']
+            latest_ma = moving_averages['weight_ma7'] if moving_averages else None
             
             # 目標体重を取得
-            target_weight = db.get_setting('target_weight')
+            target_weight = snapshot['target_weight']
             
             # 目標差分の計算
-            goal_diff = latest_data['weight'] - target_weight if target_weight is not None else None
+            goal_diff = statistics['weight_latest'] - target_weight if target_weight is not None else None
             
-            # 統計情報をカード風で表示
+            # 統計情報をカード風で表示（全期間統計はデータベース側のキャッシュから取得）
             metrics = [
-                ("データ数", f"{len(df_all)}件"),
-                ("直近体重", f"{latest_data['weight']:.1f}kg"),
+                ("データ数", f"{statistics['count']}件"),
+                ("直近体重", f"{statistics['weight_latest']:.1f}kg"),
                 ("7日移動平均", f"{latest_ma:.1f}kg" if latest_ma is not None else "N/A"),
                 ("目標差分", f"{goal_diff:+.1f}kg" if goal_diff is not None else "未設定"),
                 ("直近体脂肪率", f"{latest_data['body_fat']:.1f}%" if pd.notna(latest_data['body_fat']) else "未記録")
@@ -851,6 +1120,7 @@ def main():
         st.error(f"統計情報の取得に失敗しました: {str(e)}")
     
     # 2. 期間選択セクション
+    profiler.checkpoint('period')
     st.subheader("📅 期間選択")
     
     # 期間選択用のラジオボタン
@@ -872,43 +1142,69 @@ def main():
     period_days = period_options[selected_period]
     
     # 3. グラフセクション
+    profiler.checkpoint('graph')
     st.subheader("📈 体重推移グラフ")
     
     try:
-        # データ取得（全データを取得）
-        df = db.get_measurements()
+        # 選択期間のデータのみを日付範囲検索で取得
+        df = get_period_snapshot(db, snapshot['version'], period_days)
         
-        if not df.empty:
-            # 期間でフィルタリング
-            if period_days:
-                df = filter_data_by_period(df, period_days)
-            
-            # 目標体重を取得
-            target_weight = db.get_setting('target_weight')
-            
-            # グラフ作成・表示
-            fig = create_weight_graph(df, period_days, target_weight)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            # データがない場合
-            target_weight = db.get_setting('target_weight')
-            fig = create_weight_graph(pd.DataFrame(), period_days, target_weight)
-            st.plotly_chart(fig, use_container_width=True)
+        target_weight = snapshot['target_weight']
+        
+        # 描画幅を超える場合は間引いて表示し、範囲を絞ると元データで再描画する
+        zoom = None
+        if len(df) > GRAPH_PIXEL_WIDTH:
+            first_date = df['date'].iloc[0].date()
+            last_date = df['date'].iloc[-1].date()
+            zoom_start, zoom_end = st.slider(
+                "🔍 拡大表示する範囲",
+                min_value=first_date,
+                max_value=last_date,
+                value=(first_date, last_date),
+                format="YYYY-MM-DD",
+                key=f"graph_zoom_{period_days}"
+            )
+            if (zoom_start, zoom_end) != (first_date, last_date):
+                zoom = (zoom_start, zoom_end)
+            else:
+                st.caption(f"📉 {len(df):,}件を約{GRAPH_PIXEL_WIDTH:,}点に間引いて表示しています。範囲を絞ると元データで表示します。")
+        
+        # グラフ作成・表示（データ・期間・目標体重が変わらない間はキャッシュ済みの図を使用）
+        fig = get_weight_graph(db, snapshot['version'], period_days, target_weight,
+                               st.context.theme.type, zoom)
+        st.plotly_chart(fig, use_container_width=True)
     
     except Exception as e:
         st.error(f"グラフの表示に失敗しました: {str(e)}")
     
     # 4. データ編集セクション
+    profiler.checkpoint('editor')
     st.subheader("📋 データ編集・削除")
     
     try:
-        df_recent = db.get_measurements()  # 全件数を取得
+        # ページ位置（日付カーソル）と表示件数
+        editor_cursor = st.session_state.get('editor_cursor')
+        editor_direction = st.session_state.get('editor_direction', 'older')
+        
+        nav_cols = st.columns([1, 2, 1])
+        with nav_cols[0]:
+            page_size = st.selectbox("表示件数", options=[30, 50, 100, 200], index=1, key="editor_page_size")
+        with nav_cols[1]:
+            jump_date = st.date_input("指定日へ移動", value=None, key="editor_jump_date")
+        with nav_cols[2]:
+            st.write("")
+            if st.button("📅 移動", key="editor_jump") and jump_date is not None:
+                # 指定日を含むページ（指定日以前の新しい順）へ移動
+                st.session_state.editor_cursor = (jump_date + timedelta(days=1)).strftime('%Y-%m-%d')
+                st.session_state.editor_direction = 'older'
+                st.rerun()
+        
+        df_recent, has_older, has_newer = load_editor_page(db, editor_cursor, editor_direction, page_size)
         
         if not df_recent.empty:
             # 編集用データフレームの準備
             edit_df = df_recent.copy()
             edit_df['date'] = edit_df['date'].dt.strftime('%Y-%m-%d')
-            edit_df = edit_df.sort_values('date', ascending=False)
             
             # 表示用にカラム名を日本語に変更
             edit_df = edit_df.rename(columns={
@@ -917,8 +1213,27 @@ def main():
                 'body_fat': '体脂肪率(%)'
             })
             
+            # ページ送り
+            page_cols = st.columns([1, 1, 1, 3])
+            with page_cols[0]:
+                if st.button("⏮ 最新", key="editor_latest", disabled=not has_newer):
+                    st.session_state.editor_cursor = None
+                    st.session_state.editor_direction = 'older'
+                    st.rerun()
+            with page_cols[1]:
+                if st.button("◀ 新しい", key="editor_newer", disabled=not has_newer):
+                    st.session_state.editor_cursor = edit_df['日付'].iloc[0]
+                    st.session_state.editor_direction = 'newer'
+                    st.rerun()
+            with page_cols[2]:
+                if st.button("古い ▶", key="editor_older", disabled=not has_older):
+                    st.session_state.editor_cursor = edit_df['日付'].iloc[-1]
+                    st.session_state.editor_direction = 'older'
+                    st.rerun()
+            
             # 編集可能なデータエディタ
-            st.info(f"💡 データをダブルクリックで編集できます。行を削除するには、行の左端にあるゴミ箱アイコンをクリックしてください。（全データ：{len(edit_df)}件表示中）")
+            total_count = (snapshot['statistics'] or {}).get('count', len(edit_df))
+            st.info(f"💡 データをダブルクリックで編集できます。行を削除するには、行の左端にあるゴミ箱アイコンをクリックしてください。（全{total_count}件中 {edit_df['日付'].iloc[-1]}〜{edit_df['日付'].iloc[0]} の{len(edit_df)}件表示中）")
             
             edited_df = st.data_editor(
                 edit_df[['日付', '体重(kg)', '体脂肪率(%)']],
@@ -948,75 +1263,38 @@ def main():
                         format="%.1f",
                     ),
                 },
-                key="data_editor"
+                # ページ・データごとに編集状態を分ける
+                key=f"data_editor_{edit_df['日付'].iloc[0]}_{len(edit_df)}_{snapshot['version']}"
             )
             
             # 変更の検知と処理
             if st.button("💾 変更を保存", type="primary", key="save_changes"):
                 try:
-                    # 変更されたデータをデータベースに反映
-                    changes_made = False
-                    deletions_made = False
+                    # 編集前後の差分を一括で検出
+                    updates, deleted_ids = diff_edited_data(edit_df, edited_df)
                     
-                    # 削除された行の検知
-                    if len(edited_df) < len(edit_df):
+                    missing_weight = updates['weight'].isna()
+                    for missing_date in updates.loc[missing_weight, 'date']:
+                        st.error(f"❌ {missing_date}の体重が空のため更新できません")
+                    updates = updates[~missing_weight]
+                    
+                    if deleted_ids:
                         st.warning("⚠️ 削除された行が検出されました。データベースから削除します。")
-                        
-                        # 削除された行を特定
-                        original_dates = set(edit_df['日付'].tolist())
-                        edited_dates = set(edited_df['日付'].tolist())
-                        deleted_dates = original_dates - edited_dates
-                        
-                        for deleted_date in deleted_dates:
-                            # 日付をキーにしてdf_recentから対応するレコードを検索
-                            matching_records = df_recent[df_recent['date'].dt.strftime('%Y-%m-%d') == deleted_date]
-                            
-                            if not matching_records.empty:
-                                record_id = int(matching_records.iloc[0]['id'])
-                                
-                                # データベースから削除
-                                success = db.delete_measurement(record_id)
-                                if success:
-                                    st.success(f"✅ {deleted_date}のデータを削除しました")
-                                    deletions_made = True
-                                else:
-                                    st.error(f"❌ {deleted_date}のデータ削除に失敗しました")
-                            else:
-                                st.error(f"❌ {deleted_date}のレコードが見つかりません")
                     
-                    # 編集された行の検知
-                    for i in range(len(edited_df)):
-                        # 編集されたデータフレームの日付でマッチング
-                        edited_row = edited_df.iloc[i]
-                        edited_date = edited_row['日付']
-                        
-                        # 元データから対応する行を探す
-                        original_matching = edit_df[edit_df['日付'] == edited_date]
-                        if not original_matching.empty:
-                            original_row = original_matching.iloc[0]
-                            
-                            # 変更があったかチェック
-                            if (original_row['体重(kg)'] != edited_row['体重(kg)'] or 
-                                original_row['体脂肪率(%)'] != edited_row['体脂肪率(%)']):
-                                
-                                # 日付をキーにしてdf_recentから対応するレコードを検索
-                                matching_records = df_recent[df_recent['date'].dt.strftime('%Y-%m-%d') == edited_date]
-                                
-                                if not matching_records.empty:
-                                    record_id = int(matching_records.iloc[0]['id'])
-                                    success = db.update_measurement(
-                                        record_id,
-                                        float(edited_row['体重(kg)']),
-                                        float(edited_row['体脂肪率(%)']) if pd.notna(edited_row['体脂肪率(%)']) else None
-                                    )
-                                    
-                                    if success:
-                                        changes_made = True
-                                        st.success(f"✅ {edited_row['日付']}のデータを更新しました")
-                                    else:
-                                        st.error(f"❌ {edited_row['日付']}のデータ更新に失敗しました")
-                                else:
-                                    st.error(f"❌ {edited_date}のレコードが見つかりません")
+                    changes_made = False
+                    deletions_made = False
+                    if not updates.empty or deleted_ids:
+                        # 更新・削除を1トランザクションで反映
+                        result = db.apply_edits(updates=updates, deleted_ids=deleted_ids)
+                        if result is None:
+                            st.error("❌ データの保存に失敗しました")
+                        else:
+                            changes_made = result['updated'] > 0
+                            deletions_made = result['deleted'] > 0
+                            if deletions_made:
+                                st.success(f"✅ {result['deleted']}件のデータを削除しました")
+                            if changes_made:
+                                st.success(f"✅ {result['updated']}件のデータを更新しました")
                     
                     if changes_made or deletions_made:
                         st.success("✅ 変更を保存しました！")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - メトリクス
+再実行の時間、WeightDatabaseのメソッドごとの時間・呼び出し回数、キャッシュのヒット率、
+データ件数、インポートの処理速度をPrometheusのテキスト形式で出力する
+（ローカルのHTTPエンドポイントまたはファイル）
+"""
+
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# HTTPエンドポイントのポート・待ち受けアドレス（ポート未設定の場合は起動しない）
+METRICS_PORT_ENV = 'WEIGHT_TRACKER_METRICS_PORT'
+METRICS_HOST_ENV = 'WEIGHT_TRACKER_METRICS_HOST'
+DEFAULT_METRICS_HOST = '127.0.0.1'
+# ファイル出力先（node_exporterのtextfile collector等で収集、未設定の場合は出力しない）
+METRICS_FILE_ENV = 'WEIGHT_TRACKER_METRICS_FILE'
+METRICS_FILE_INTERVAL = 5.0
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# ヒストグラムのバケット（秒）
+RERUN_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_METHOD_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_metric(name: str, metric_type: str, help_text: str, samples: Iterable[Sample]) -> List[str]:
+    """
+    1つのメトリクスをPrometheusのテキスト形式の行に変換
+
+    Args:
+        name: メトリクス名
+        metric_type: counter / gauge / histogram
+        help_text: 説明
+        samples: (名前の接尾辞, ラベル, 値) のリスト
+
+    Returns:
+        HELP・TYPE行とサンプル行のリスト
+    """
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    for suffix, labels, value in samples:
+        label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+        lines.append(f'{name}{suffix}{{{label_text}}} {_format_value(value)}' if label_text
+                     else f'{name}{suffix} {_format_value(value)}')
+    return lines
+
+
+class Histogram:
+    """ラベルごとに値の分布を集計するヒストグラム（スレッドセーフ）"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], label_name: str = None):
+        """
+        ヒストグラムの初期化
+
+        Args:
+            name: メトリクス名
+            help_text: 説明
+            buckets: バケットの上限値（昇順、+Infは自動で追加）
+            label_name: 値を分類するラベル名（Noneの場合は分類しない）
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_name = label_name
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, value: float, label: str = '') -> None:
+        """値を記録"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(label, {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0})
+            if index < len(self.buckets):
+                series['buckets'][index] += 1
+            series['count'] += 1
+            series['sum'] += value
+
+    def render(self) -> List[str]:
+        """Prometheusのテキスト形式の行を作成（バケットは累積値）"""
+        samples: List[Sample] = []
+        with self._lock:
+            for label, series in sorted(self._series.items()):
+                labels = {self.label_name: label} if self.label_name else {}
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['buckets']):
+                    cumulative += count
+                    samples.append(('_bucket', {**labels, 'le': _format_value(bound)}, cumulative))
+                samples.append(('_bucket', {**labels, 'le': '+Inf'}, series['count']))
+                samples.append(('_sum', labels, series['sum']))
+                samples.append(('_count', labels, series['count']))
+        return format_metric(self.name, 'histogram', self.help_text, samples)
+
+
+class AppMetrics:
+    """
+    アプリケーションのメトリクス
+
+    再実行・インポート・キャッシュは呼び出し側から記録し、データベースの統計とデータ件数は出力時に取得する。
+    """
+
+    def __init__(self, db, figure_cache=None, textfile_path: str = None,
+                 textfile_interval: float = METRICS_FILE_INTERVAL, clock: Callable[[], float] = time.monotonic):
+        """
+        メトリクスの初期化
+
+        Args:
+            db: 計測対象のWeightDatabase
+            figure_cache: ヒット率を出力するグラフのキャッシュ（FigureCache）
+            textfile_path: 出力するファイルのパス（Noneの場合はファイルに出力しない）
+            textfile_interval: ファイルを書き換える最短間隔（秒）
+            clock: ファイル出力の間隔の判定に使う時計（秒）
+        """
+        self.db = db
+        self.figure_cache = figure_cache
+        self.textfile_path = textfile_path
+        self.textfile_interval = textfile_interval
+        self.clock = clock
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._lock = threading.Lock()
+        self._last_write: Optional[float] = None
+        self._caches: Dict[str, Dict[str, int]] = {}
+        self._imports = {'count': 0, 'rows': 0, 'seconds': 0.0, 'last_rate': 0.0}
+        self._record_count: Optional[Tuple[int, int]] = None
+
+        self.rerun_seconds = Histogram(
+            'weight_tracker_rerun_duration_seconds', '画面の再実行にかかった時間', RERUN_BUCKETS, 'outcome'
+        )
+        self.db_method_seconds = Histogram(
+            'weight_tracker_db_method_duration_seconds',
+            'WeightDatabaseのメソッドの実行時間（ジェネレーターは値の取り出しごと）', DB_METHOD_BUCKETS, 'method'
+        )
+        db.query_stats.add_observer(
+            lambda method, elapsed_ms: self.db_method_seconds.observe(elapsed_ms / 1000, method)
+        )
+
+    @classmethod
+    def from_environment(cls, db, figure_cache=None, environ: Mapping[str, str] = None) -> "AppMetrics":
+        """環境変数の設定からメトリクスを作成し、ポートが設定されていればHTTPエンドポイントを起動"""
+        environ = os.environ if environ is None else environ
+        metrics = cls(db, figure_cache, textfile_path=environ.get(METRICS_FILE_ENV) or None)
+        port = environ.get(METRICS_PORT_ENV)
+        if port:
+            try:
+                metrics.server = start_http_server(
+                    metrics, int(port), environ.get(METRICS_HOST_ENV) or DEFAULT_METRICS_HOST
+                )
+            except (OSError, ValueError) as e:
+                print(f"メトリクスサーバー起動エラー: {e}")
+        return metrics
+
+    def observe_rerun(self, seconds: float, completed: bool = True) -> None:
+        """
+        再実行の時間を記録し、設定されていればファイルに出力
+
+        Args:
+            seconds: 再実行にかかった時間（秒）
+            completed: 最後まで描画したか（st.rerun等で中断した場合はFalse）
+        """
+        self.rerun_seconds.observe(seconds, 'completed' if completed else 'interrupted')
+        self.write_textfile()
+
+    def record_cache_request(self, cache: str) -> None:
+        """キャッシュの参照を記録"""
+        with self._lock:
+            self._caches.setdefault(cache, {'requests': 0, 'misses': 0})['requests'] += 1
+
+    def record_cache_miss(self, cache: str) -> None:
+        """キャッシュのミス（キャッシュされた関数の本体の実行）を記録"""
+        with self._lock:
+            self._caches.setdefault(cache, {'requests': 0, 'misses': 0})['misses'] += 1
+
+    def record_import(self, rows: int, seconds: float) -> None:
+        """
+        インポートの結果を記録
+
+        Args:
+            rows: インポートした行数
+            seconds: インポートにかかった時間（秒）
+        """
+        with self._lock:
+            self._imports['count'] += 1
+            self._imports['rows'] += rows
+            self._imports['seconds'] += seconds
+            self._imports['last_rate'] = rows / seconds if seconds > 0 else 0.0
+
+    def _cache_counts(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            caches = {
+                name: {'hits': max(counts['requests'] - counts['misses'], 0), 'misses': counts['misses']}
+                for name, counts in self._caches.items()
+            }
+        if self.figure_cache is not None:
+            stats = self.figure_cache.stats()
+            caches['figure'] = {'hits': stats['hits'], 'misses': stats['misses']}
+        return caches
+
+    def _measurement_count(self) -> int:
+        """データ件数（データバージョンが変わった時のみ数え直す）"""
+        version = self.db.get_data_version()
+        if self._record_count is None or self._record_count[0] != version:
+            self._record_count = (version, self.db.get_record_count())
+        return self._record_count[1]
+
+    def render(self) -> str:
+        """全てのメトリクスをPrometheusのテキスト形式で作成"""
+        stats = self.db.query_stats.snapshot()
+        methods = sorted(stats['methods'].items())
+        caches = sorted(self._cache_counts().items())
+        with self._lock:
+            imports = dict(self._imports)
+
+        lines = self.rerun_seconds.render() + self.db_method_seconds.render()
+        for field, suffix, help_text in (
+            ('calls', 'calls_total', 'WeightDatabaseのメソッドの呼び出し回数'),
+            ('queries', 'queries_total', 'メソッド内で実行したSQLの数'),
+            ('rows', 'rows_total', 'メソッド内で取得・変更した行数')
+        ):
+            lines += format_metric(f'weight_tracker_db_{suffix}', 'counter', help_text,
+                                   [('', {'method': name}, entry[field]) for name, entry in methods])
+        lines += format_metric('weight_tracker_db_connections_opened_total', 'counter',
+                               '作成したデータベース接続の数', [('', {}, stats['connections']['opened'])])
+        lines += format_metric('weight_tracker_db_connection_setup_seconds_total', 'counter',
+                               'データベース接続の作成にかかった時間の合計',
+                               [('', {}, stats['connections']['setup_ms'] / 1000)])
+
+        lines += format_metric('weight_tracker_cache_hits_total', 'counter', 'キャッシュのヒット数',
+                               [('', {'cache': name}, counts['hits']) for name, counts in caches])
+        lines += format_metric('weight_tracker_cache_misses_total', 'counter', 'キャッシュのミス数',
+                               [('', {'cache': name}, counts['misses']) for name, counts in caches])
+        lines += format_metric('weight_tracker_cache_hit_ratio', 'gauge', 'キャッシュのヒット率（起動後の累計）', [
+            ('', {'cache': name}, counts['hits'] / (counts['hits'] + counts['misses']))
+            for name, counts in caches if counts['hits'] + counts['misses'] > 0
+        ])
+
+        lines += format_metric('weight_tracker_measurements', 'gauge', '保存されている測定データの件数',
+                               [('', {}, self._measurement_count())])
+
+        lines += format_metric('weight_tracker_imports_total', 'counter', '実行したインポートの回数',
+                               [('', {}, imports['count'])])
+        lines += format_metric('weight_tracker_import_rows_total', 'counter', 'インポートした行数',
+                               [('', {}, imports['rows'])])
+        lines += format_metric('weight_tracker_import_duration_seconds_total', 'counter',
+                               'インポートにかかった時間の合計', [('', {}, imports['seconds'])])
+        lines += format_metric('weight_tracker_import_last_rows_per_second', 'gauge',
+                               '直近のインポートの処理速度（行/秒）', [('', {}, imports['last_rate'])])
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, force: bool = False) -> bool:
+        """
+        メトリクスをファイルに出力（一時ファイルに書いてから置き換え）
+
+        Args:
+            force: Trueの場合、前回の出力からの間隔に関わらず出力
+
+        Returns:
+            出力した場合True
+        """
+        if not self.textfile_path:
+            return False
+        now = self.clock()
+        with self._lock:
+            if not force and self._last_write is not None and now - self._last_write < self.textfile_interval:
+                return False
+            self._last_write = now
+        try:
+            directory = os.path.dirname(self.textfile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f'{self.textfile_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(temp_path, self.textfile_path)
+            return True
+        except OSError as e:
+            print(f"メトリクスファイル書き込みエラー: {e}")
+            return False
+
+
+def start_http_server(metrics: AppMetrics, port: int, host: str = DEFAULT_METRICS_HOST) -> ThreadingHTTPServer:
+    """
+    /metrics でメトリクスを返すHTTPサーバーをバックグラウンドで起動
+
+    Args:
+        metrics: 出力するメトリクス
+        port: 待ち受けポート（0の場合は空いているポート）
+        host: 待ち受けアドレス
+
+    Returns:
+        起動したサーバー（server_address で実際のポートを確認でき、shutdown() で停止）
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 収集のたびにアクセスログを出力しない
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - 進捗報告
+インポートなどの長い処理の進捗を一定の頻度に間引いて通知し、処理速度と残り時間を算出する
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+def format_progress(update: Dict[str, Any], unit: str = "行") -> str:
+    """
+    進捗を画面表示用の文字列に整形
+
+    Args:
+        update: ProgressReporterが通知する進捗
+        unit: 件数の単位
+
+    Returns:
+        「1,000 / 5,000行 (20%)・2,500行/秒・残り約2秒」形式の文字列
+    """
+    parts = [f"{update['done']:,}{unit}" if update['total'] is None
+             else f"{update['done']:,} / {update['total']:,}{unit}"]
+    if update['fraction'] is not None:
+        parts[0] += f" ({update['fraction']:.0%})"
+    if update['rate'] is not None:
+        parts.append(f"{update['rate']:,.0f}{unit}/秒")
+    if update['eta'] is not None and update['fraction'] is not None and update['fraction'] < 1:
+        parts.append(f"残り約{update['eta']:,.0f}秒")
+    return "・".join(parts)
+
+
+class ProgressReporter:
+    """進捗の通知を一定の頻度に間引くレポーター"""
+
+    def __init__(self, on_update: Callable[[Dict[str, Any]], None], total: Optional[int] = None,
+                 min_interval: float = 0.25, min_step: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        レポーターの初期化
+
+        Args:
+            on_update: 進捗を通知する関数（done, total, fraction, elapsed, rate, etaの辞書を受け取る）
+            total: 全体の件数（不明な場合None）
+            min_interval: 通知の最小間隔（秒）
+            min_step: 前回の通知からこの割合以上進んだ場合は間隔によらず通知する
+            clock: 経過時間の計測に使う関数
+        """
+        self.on_update = on_update
+        self.total = total
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self._clock = clock
+        self._start = clock()
+        self._last_time = None
+        self._last_fraction = None
+        self.updates = 0
+
+    def __call__(self, done: int, fraction: Optional[float] = None) -> bool:
+        """updateと同じ（進捗を受け取る関数として渡せるようにする）"""
+        return self.update(done, fraction)
+
+    def update(self, done: int, fraction: Optional[float] = None) -> bool:
+        """
+        進捗を報告（前回の通知から間隔・進み具合が閾値未満の場合は通知しない）
+
+        Args:
+            done: 処理済みの件数
+            fraction: 進捗率（0～1）。Noneの場合はdone / totalから算出
+
+        Returns:
+            通知した場合True
+        """
+        now = self._clock()
+        if fraction is None and self.total:
+            fraction = done / self.total
+        if fraction is not None:
+            fraction = min(max(fraction, 0.0), 1.0)
+
+        due = (self._last_time is None
+               or now - self._last_time >= self.min_interval
+               or (fraction is not None and fraction >= 1.0)
+               or (fraction is not None and self._last_fraction is not None
+                   and fraction - self._last_fraction >= self.min_step))
+        if not due:
+            return False
+        self._emit(done, fraction, now)
+        return True
+
+    def finish(self, done: int) -> None:
+        """完了を報告（間引かずに必ず通知）"""
+        self._emit(done, 1.0, self._clock())
+
+    def _emit(self, done: int, fraction: Optional[float], now: float) -> None:
+        """経過時間から処理速度と残り時間を算出して通知"""
+        elapsed = now - self._start
+        rate = done / elapsed if elapsed > 0 else None
+        eta = elapsed * (1 - fraction) / fraction if fraction and elapsed > 0 else None
+        self._last_time = now
+        self._last_fraction = fraction
+        self.updates += 1
+        self.on_update({
+            'done': done,
+            'total': self.total,
+            'fraction': fraction,
+            'elapsed': elapsed,
+            'rate': rate,
+            'eta': eta
+        })
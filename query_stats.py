@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - クエリの計測
+WeightDatabaseのメソッド・SQLごとの呼び出し回数、行数、実行時間、接続の作成時間を集計し、
+閾値を超えた遅いクエリをSQLとEXPLAIN QUERY PLANの結果とともに記録する
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 実行計画を取得する文の種類（PRAGMA・DDL・トランザクション制御は対象外）
+EXPLAINABLE_STATEMENTS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def normalize_sql(sql: str) -> str:
+    """集計キー用にSQLの空白・改行を1つの空白にまとめる"""
+    return ' '.join(sql.split())
+
+
+class QueryStats:
+    """メソッド・SQLごとの実行統計（スレッドセーフ）"""
+
+    def __init__(self, slow_query_ms: Optional[float] = None, max_slow_queries: int = 100):
+        """
+        統計の初期化
+
+        Args:
+            slow_query_ms: この時間（ミリ秒）以上かかったSQLを遅いクエリとして記録（Noneの場合は記録しない）
+            max_slow_queries: 保持する遅いクエリの最大件数（古いものから削除）
+        """
+        self.slow_query_ms = slow_query_ms
+        self.max_slow_queries = max_slow_queries
+        self._lock = threading.Lock()
+        # スレッドごとの実行中メソッドのスタック
+        self._local = threading.local()
+        self._observers: List[Callable[[str, float], None]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """全ての統計を破棄"""
+        with self._lock:
+            self._methods: Dict[str, Dict[str, float]] = {}
+            self._queries: Dict[str, Dict[str, float]] = {}
+            self._connections = {'opened': 0, 'setup_ms': 0.0}
+            self._slow_queries = deque(maxlen=self.max_slow_queries)
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def add_observer(self, observer: Callable[[str, float], None]) -> None:
+        """
+        メソッドの実行ごとに呼び出す関数を登録（メトリクスのヒストグラム用）
+
+        Args:
+            observer: (メソッド名, 実行時間ミリ秒) を受け取る関数。ジェネレーターは値を取り出すたびに呼び出される
+        """
+        self._observers.append(observer)
+
+    def _tally(self) -> Dict[str, float]:
+        if not hasattr(self._local, 'tally'):
+            self._local.tally = {'calls': 0, 'queries': 0, 'rows': 0, 'query_ms': 0.0}
+        return self._local.tally
+
+    def thread_totals(self) -> Dict[str, float]:
+        """
+        現在のスレッドでの累計（calls, queries, rows, query_ms）
+
+        他のスレッド（セッション）の実行を含まないため、前後の差から区間内の件数を求められる。
+        resetでは破棄されない。
+        """
+        return dict(self._tally())
+
+    def current_method(self) -> Optional[str]:
+        """現在のスレッドで実行中の（最も内側の）メソッド名"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def track(self, method: str, count_call: bool = True) -> Iterator[None]:
+        """
+        メソッドの実行時間を計測し、その間に実行されたSQLをメソッドに割り当てる
+
+        Args:
+            method: メソッド名
+            count_call: 呼び出し回数に数えるか（ジェネレーターの再開時はFalse）
+        """
+        stack = self._stack()
+        stack.append(method)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            self._tally()['calls'] += int(count_call)
+            with self._lock:
+                entry = self._methods.setdefault(method, _empty_entry('calls'))
+                entry['calls'] += int(count_call)
+                entry['total_ms'] += elapsed_ms
+                entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            for observer in self._observers:
+                observer(method, elapsed_ms)
+
+    def record_query(self, sql: str, elapsed_ms: float, rows: int = 0, executions: int = 1) -> None:
+        """
+        SQLの実行（または結果の取得）を記録
+
+        Args:
+            sql: 実行したSQL
+            elapsed_ms: 実行・取得にかかった時間（ミリ秒）
+            rows: 取得した行数または変更した行数
+            executions: 実行回数（結果の取得のみの場合は0）
+        """
+        method = self.current_method()
+        tally = self._tally()
+        tally['queries'] += executions
+        tally['rows'] += rows
+        tally['query_ms'] += elapsed_ms
+        with self._lock:
+            entry = self._queries.setdefault(normalize_sql(sql), _empty_entry('executions'))
+            entry['executions'] += executions
+            entry['rows'] += rows
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            if method is not None:
+                method_entry = self._methods.setdefault(method, _empty_entry('calls'))
+                method_entry['queries'] += executions
+                method_entry['rows'] += rows
+                method_entry['query_ms'] += elapsed_ms
+
+    def record_connection(self, elapsed_ms: float) -> None:
+        """接続の作成（接続・PRAGMA設定）にかかった時間を記録"""
+        with self._lock:
+            self._connections['opened'] += 1
+            self._connections['setup_ms'] += elapsed_ms
+
+    def record_slow_query(self, sql: str, elapsed_ms: float, plan: List[str]) -> None:
+        """遅いクエリを記録して表示"""
+        method = self.current_method()
+        with self._lock:
+            self._slow_queries.append({
+                'sql': normalize_sql(sql),
+                'method': method,
+                'elapsed_ms': elapsed_ms,
+                'plan': plan
+            })
+        print(f"🐢 遅いクエリ ({elapsed_ms:.1f}ms, {method or '-'}): {normalize_sql(sql)}")
+        for detail in plan:
+            print(f"   └ {detail}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        集計結果を取得
+
+        Returns:
+            methods（メソッド名ごと）・queries（SQLごと）の calls/executions, rows, total_ms, avg_ms, max_ms、
+            connections（opened, setup_ms）、slow_queries（新しい順）の辞書
+        """
+        with self._lock:
+            return {
+                'methods': {name: _with_average(entry, 'calls') for name, entry in self._methods.items()},
+                'queries': {sql: _with_average(entry, 'executions') for sql, entry in self._queries.items()},
+                'connections': dict(self._connections),
+                'slow_queries': list(reversed(self._slow_queries))
+            }
+
+
+def _empty_entry(count_key: str) -> Dict[str, float]:
+    entry = {count_key: 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+    if count_key == 'calls':
+        entry.update({'queries': 0, 'query_ms': 0.0})
+    return entry
+
+
+def _with_average(entry: Dict[str, float], count_key: str) -> Dict[str, float]:
+    result = dict(entry)
+    result['avg_ms'] = entry['total_ms'] / entry[count_key] if entry[count_key] else 0.0
+    return result
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """実行・取得の時間と行数を接続のQueryStatsへ記録するカーソル"""
+
+    def _stats(self) -> Optional[QueryStats]:
+        return getattr(self.connection, 'stats', None)
+
+    def execute(self, sql: str, parameters: Any = ()) -> "InstrumentedCursor":
+        stats = self._stats()
+        if stats is None:
+            return super().execute(sql, parameters)
+        self._sql, self._parameters, self._elapsed_ms, self._slow_logged = sql, parameters, 0.0, False
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._record(stats, time.perf_counter() - start, max(self.rowcount, 0), 1)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> "InstrumentedCursor":
+        stats = self._stats()
+        if stats is None:
+            return super().executemany(sql, seq_of_parameters)
+        self._sql, self._parameters, self._elapsed_ms, self._slow_logged = sql, None, 0.0, False
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._record(stats, time.perf_counter() - start, max(self.rowcount, 0), 1)
+        return self
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._record_fetch(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> list:
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._record_fetch(start, len(rows))
+        return rows
+
+    def fetchall(self) -> list:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._record_fetch(start, len(rows))
+        return rows
+
+    def _record_fetch(self, start: float, rows: int) -> None:
+        stats = self._stats()
+        if stats is not None and getattr(self, '_sql', None) is not None:
+            self._record(stats, time.perf_counter() - start, rows, 0)
+
+    def _record(self, stats: QueryStats, elapsed: float, rows: int, executions: int) -> None:
+        """実行・取得の結果を記録し、文ごとの累計が閾値を超えたら実行計画とともに記録"""
+        elapsed_ms = elapsed * 1000
+        stats.record_query(self._sql, elapsed_ms, rows, executions)
+        self._elapsed_ms += elapsed_ms
+        if (stats.slow_query_ms is not None and not self._slow_logged
+                and self._elapsed_ms >= stats.slow_query_ms):
+            self._slow_logged = True
+            stats.record_slow_query(self._sql, self._elapsed_ms, self._explain())
+
+    def _explain(self) -> List[str]:
+        """現在の文のEXPLAIN QUERY PLANの結果（計測対象外のカーソルで取得）"""
+        if self._parameters is None or not self._sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+            return []
+        try:
+            cursor = sqlite3.Cursor(self.connection)
+            return [row[3] for row in cursor.execute(f'EXPLAIN QUERY PLAN {self._sql}', self._parameters)]
+        except sqlite3.Error:
+            return []
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    InstrumentedCursorを使う接続（sqlite3.connectのfactoryに指定）
+
+    statsにQueryStatsを設定するまでは計測しない。
+    """
+
+    stats: Optional[QueryStats] = None
+
+    def cursor(self, factory: type = InstrumentedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - 描画プロファイラー
+main()の再実行ごとに、区間（セクション）ごとの実行時間・データベース呼び出し回数・メモリ確保量を計測し、
+JSONL形式のトレースファイルに追記する
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from query_stats import QueryStats
+
+# プロファイルを有効にする環境変数（例: WEIGHT_TRACKER_PROFILE=1）
+PROFILE_ENV = 'WEIGHT_TRACKER_PROFILE'
+# クエリパラメータ（?profile=1）での有効化を許可する環境変数（未設定の場合はクエリパラメータを無視）
+PROFILE_ALLOW_QUERY_ENV = 'WEIGHT_TRACKER_PROFILE_ALLOW_QUERY'
+PROFILE_QUERY_PARAM = 'profile'
+# トレースファイルの出力先を指定する環境変数
+PROFILE_TRACE_ENV = 'WEIGHT_TRACKER_PROFILE_TRACE'
+DEFAULT_TRACE_PATH = 'data/profile_trace.jsonl'
+# トレースファイルの上限サイズ（超えたら .1 に退避して新しいファイルに書き込む）
+PROFILE_TRACE_MAX_BYTES = 10 * 1024 * 1024
+
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def _is_true(value: Any) -> bool:
+    return str(value).strip().lower() in _TRUE_VALUES
+
+
+def is_profiling_enabled(environ: Mapping[str, str] = None, query_params: Mapping[str, str] = None) -> bool:
+    """
+    環境変数またはクエリパラメータでプロファイルが有効にされているか判定
+
+    クエリパラメータは、誰でも有効にできないよう WEIGHT_TRACKER_PROFILE_ALLOW_QUERY=1 の場合のみ使用する。
+
+    Args:
+        environ: 環境変数（Noneの場合はos.environ）
+        query_params: ページのクエリパラメータ（st.query_params）
+    """
+    environ = os.environ if environ is None else environ
+    if _is_true(environ.get(PROFILE_ENV, '')):
+        return True
+    return (query_params is not None and _is_true(environ.get(PROFILE_ALLOW_QUERY_ENV, ''))
+            and _is_true(query_params.get(PROFILE_QUERY_PARAM, '')))
+
+
+class RenderProfiler:
+    """
+    1回の再実行を区間ごとに計測するプロファイラー
+
+    checkpoint(name)で前の区間を閉じて次の区間を開始し、finish()で結果をまとめる。
+    無効な場合は何もしない。
+
+    メモリはtracemallocで計測するため、計測中はプロセス全体の実行が遅くなる。
+    自身が開始したtracemallocはfinish()で停止する。tracemallocとメモリの最大値はプロセスで共有されるため、
+    同時に実行中のセッションがある場合は目安となる（途中で停止された区間のメモリはNone）。
+    """
+
+    def __init__(self, enabled: bool = True, query_stats: QueryStats = None, trace_path: str = None,
+                 clock: Callable[[], float] = time.perf_counter, max_trace_bytes: int = PROFILE_TRACE_MAX_BYTES):
+        """
+        プロファイラーの初期化
+
+        Args:
+            enabled: Falseの場合は計測しない
+            query_stats: データベース呼び出しを数えるQueryStats（Noneの場合は数えない）
+            trace_path: 結果を追記するJSONLファイルのパス（Noneの場合は書き出さない）
+            clock: 経過時間の計測に使う時計（秒）
+            max_trace_bytes: トレースファイルの上限サイズ（超えたら .1 に退避）
+        """
+        self.enabled = enabled
+        self.query_stats = query_stats
+        self.trace_path = trace_path
+        self.clock = clock
+        self.max_trace_bytes = max_trace_bytes
+        self.sections: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._started_tracing = enabled and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @classmethod
+    def from_environment(cls, query_stats: QueryStats = None, query_params: Mapping[str, str] = None,
+                         environ: Mapping[str, str] = None) -> "RenderProfiler":
+        """環境変数・クエリパラメータの設定からプロファイラーを作成"""
+        environ = os.environ if environ is None else environ
+        return cls(
+            enabled=is_profiling_enabled(environ, query_params),
+            query_stats=query_stats,
+            trace_path=environ.get(PROFILE_TRACE_ENV) or DEFAULT_TRACE_PATH
+        )
+
+    def _db_totals(self) -> Dict[str, float]:
+        if self.query_stats is None:
+            return {}
+        return self.query_stats.thread_totals()
+
+    def checkpoint(self, name: str) -> None:
+        """
+        現在の区間を閉じ、新しい区間の計測を開始
+
+        Args:
+            name: 区間名
+        """
+        if not self.enabled:
+            return
+        self._close_section()
+        tracemalloc.reset_peak()
+        self._current = {
+            'name': name,
+            'start': self.clock(),
+            'db': self._db_totals(),
+            'memory': tracemalloc.get_traced_memory()[0]
+        }
+
+    def _close_section(self) -> None:
+        if self._current is None:
+            return
+        elapsed_ms = (self.clock() - self._current['start']) * 1000
+        tracing = tracemalloc.is_tracing()
+        memory, peak = tracemalloc.get_traced_memory()
+        before, after = self._current['db'], self._db_totals()
+        self.sections.append({
+            'name': self._current['name'],
+            'ms': round(elapsed_ms, 3),
+            'db_calls': after.get('calls', 0) - before.get('calls', 0),
+            'queries': after.get('queries', 0) - before.get('queries', 0),
+            'rows': after.get('rows', 0) - before.get('rows', 0),
+            'query_ms': round(after.get('query_ms', 0.0) - before.get('query_ms', 0.0), 3),
+            'memory_kb': round((memory - self._current['memory']) / 1024, 1) if tracing else None,
+            'peak_kb': round(max(peak - self._current['memory'], 0) / 1024, 1) if tracing else None
+        })
+        self._current = None
+
+    def finish(self, completed: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        計測を終了し、トレースファイルに追記
+
+        Args:
+            completed: 最後まで描画したか（st.rerun等で中断した場合はFalse）
+
+        Returns:
+            timestamp, completed, total_ms, sections の辞書（無効な場合はNone）
+        """
+        if not self.enabled:
+            return None
+        self._close_section()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'completed': completed,
+            'total_ms': round(sum(section['ms'] for section in self.sections), 3),
+            'sections': self.sections
+        }
+        if self.trace_path:
+            self._write_trace(record)
+        return record
+
+    def _write_trace(self, record: Dict[str, Any]) -> None:
+        try:
+            directory = os.path.dirname(self.trace_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.trace_path) and os.path.getsize(self.trace_path) >= self.max_trace_bytes:
+                os.replace(self.trace_path, f'{self.trace_path}.1')
+            with open(self.trace_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"トレースファイル書き込みエラー: {e}")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+体重トラッカー - 負荷試験・ベンチマーク用の合成データ生成
+長期間・複数ユーザーの体重・体脂肪率の履歴（長期トレンド、季節・曜日変動、ノイズ、
+記録の空白期間、外れ値、同日の複数回測定）を生成し、SQLiteファイルまたはCSVへ一括で書き出す
+
+使い方:
+    python synthetic_data.py --days 3650 --output data/synthetic.db                # 10年分を1ユーザーで生成
+    python synthetic_data.py --users 100 --days 100000 --output data/synthetic     # 約1,000万件（ユーザーごとのファイル）
+    python synthetic_data.py --days 3650 --format csv --output synthetic.csv       # CSVで出力
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from csv_import import BODY_FAT_RANGE, WEIGHT_RANGE
+from database import WeightDatabase
+
+# 最終日の既定値と最初の日の下限（日付は1ユーザーあたり1日1件まで保存されるため、
+# 1ユーザーの履歴は4桁の西暦で表せる範囲に収める。大量の行はユーザー数で増やす）
+DEFAULT_END_DATE = '2024-12-31'
+MIN_DATE = np.datetime64('1000-01-01')
+
+# 生成・書き込みを行う単位（日数）
+CHUNK_DAYS = 100_000
+
+# 既定の発生率
+DEFAULT_GAP_RATE = 0.01          # 1日あたりの空白期間の開始確率
+DEFAULT_GAP_LENGTH = 7           # 空白期間の平均日数
+DEFAULT_OUTLIER_RATE = 0.002     # 外れ値（測定ミス・入力ミス）の割合
+DEFAULT_DUPLICATE_RATE = 0.05    # 同日に2回測定する割合
+DEFAULT_BODY_FAT_MISSING_RATE = 0.1
+
+
+def make_profile(user: int, seed: int = 0) -> Dict[str, float]:
+    """
+    ユーザーごとの体型・変動の特徴を生成
+
+    Args:
+        user: ユーザー番号
+        seed: 乱数シード
+
+    Returns:
+        基準体重・長期トレンド・季節変動などのパラメータの辞書
+    """
+    rng = np.random.default_rng([seed, user])
+    return {
+        'base_weight': rng.uniform(50.0, 100.0),
+        'base_body_fat': rng.uniform(12.0, 32.0),
+        'trend_kg_per_year': rng.normal(-0.5, 1.5),
+        'trend_limit_kg': rng.uniform(3.0, 15.0),
+        'yearly_amplitude_kg': rng.uniform(0.5, 2.0),
+        'weekend_gain_kg': rng.uniform(0.1, 0.6),
+        'noise_kg': rng.uniform(0.2, 0.6),
+        'body_fat_per_kg': rng.uniform(0.2, 0.6),
+    }
+
+
+def _history_chunk(profile: Dict[str, float], start: np.datetime64, first_day: int, days: int,
+                   rng: np.random.Generator, gap_rate: float, gap_length: float, outlier_rate: float,
+                   duplicate_rate: float, body_fat_missing_rate: float) -> pd.DataFrame:
+    """履歴の開始日からfirst_day日目以降のdays日分を生成（トレンド・季節変動は通し日数で計算）"""
+    offsets = np.arange(first_day, first_day + days)
+    dates = start + offsets.astype('timedelta64[D]')
+    years = offsets / 365.25
+
+    # 長期トレンド（一定の範囲で頭打ち）＋年周期（冬に増加）＋曜日変動（週末に増加）＋ノイズ
+    limit = profile['trend_limit_kg']
+    trend = limit * np.tanh(profile['trend_kg_per_year'] * years / limit)
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(int)
+    seasonal = profile['yearly_amplitude_kg'] * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+    weekday = (dates.astype('int64') + 3) % 7  # 0 = 月曜日
+    weekly = profile['weekend_gain_kg'] * np.isin(weekday, (0, 6))  # 日曜・月曜の朝に増加
+    weights = profile['base_weight'] + trend + seasonal + weekly + rng.normal(0, profile['noise_kg'], days)
+    body_fats = (profile['base_body_fat'] + profile['body_fat_per_kg'] * (weights - profile['base_weight'])
+                 + rng.normal(0, 0.5, days))
+
+    # 空白期間（旅行・記録忘れ）: 開始日から平均gap_length日間の記録を除く
+    gap_starts = np.flatnonzero(rng.random(days) < gap_rate)
+    marks = np.zeros(days + 1, dtype=np.int64)
+    np.add.at(marks, gap_starts, 1)
+    np.add.at(marks, np.minimum(gap_starts + rng.geometric(1 / gap_length, len(gap_starts)), days), -1)
+    recorded = np.cumsum(marks[:-1]) == 0
+
+    # 同日の複数回測定（2回目は少しずれた値）
+    counts = np.where(rng.random(days) < duplicate_rate, 2, 1) * recorded
+    dates = np.repeat(dates, counts)
+    weights = np.repeat(weights, counts)
+    body_fats = np.repeat(body_fats, counts)
+    second = np.zeros(len(dates), dtype=bool)
+    second[1:] = dates[1:] == dates[:-1]
+    weights[second] += rng.normal(0.3, 0.2, second.sum())
+
+    # 外れ値（体重の入力ミスなど）。インポートの許容範囲内に収める
+    outliers = rng.random(len(weights)) < outlier_rate
+    weights[outliers] += rng.choice([-1.0, 1.0], outliers.sum()) * rng.uniform(5.0, 15.0, outliers.sum())
+
+    weights = np.clip(np.round(weights, 1), *WEIGHT_RANGE)
+    body_fats = np.clip(np.round(body_fats, 1), *BODY_FAT_RANGE)
+    body_fats[rng.random(len(body_fats)) < body_fat_missing_rate] = np.nan
+    return pd.DataFrame({
+        'date': np.datetime_as_string(dates, unit='D'),
+        'weight': weights,
+        'body_fat': body_fats
+    })
+
+
+def iter_history(days: int, user: int = 0, seed: int = 0, end_date: str = DEFAULT_END_DATE,
+                 chunk_days: int = CHUNK_DAYS, gap_rate: float = DEFAULT_GAP_RATE,
+                 gap_length: float = DEFAULT_GAP_LENGTH, outlier_rate: float = DEFAULT_OUTLIER_RATE,
+                 duplicate_rate: float = DEFAULT_DUPLICATE_RATE,
+                 body_fat_missing_rate: float = DEFAULT_BODY_FAT_MISSING_RATE) -> Iterator[pd.DataFrame]:
+    """
+    1ユーザーの履歴をchunk_days日分ずつ生成
+
+    同じ引数（chunk_daysを含む）からは常に同じ履歴が生成される。
+
+    Args:
+        days: 履歴の日数（end_dateまで）
+        user: ユーザー番号（体型・変動の特徴とシードに使用）
+        seed: 乱数シード
+        end_date: 最終日（YYYY-MM-DD形式）
+        chunk_days: 1チャンクの日数
+        gap_rate: 1日あたりの空白期間の開始確率
+        gap_length: 空白期間の平均日数
+        outlier_rate: 外れ値の割合
+        duplicate_rate: 同日に2回測定する割合
+        body_fat_missing_rate: 体脂肪率が未記録の割合
+
+    Yields:
+        date（YYYY-MM-DD形式）, weight, body_fat 列の日付順のDataFrame（同じ日付の行が続く場合あり）
+    """
+    start = np.datetime64(end_date, 'D') - (days - 1)
+    if start < MIN_DATE:
+        raise ValueError(f"日数が多すぎます: {days}日（{end_date}から遡ると{MIN_DATE}より前になります）")
+    profile = make_profile(user, seed)
+    for first_day in range(0, days, chunk_days):
+        rng = np.random.default_rng([seed, user, first_day])
+        yield _history_chunk(profile, start, first_day, min(chunk_days, days - first_day), rng,
+                             gap_rate, gap_length, outlier_rate, duplicate_rate, body_fat_missing_rate)
+
+
+def generate_history(days: int, user: int = 0, seed: int = 0, **options: Any) -> pd.DataFrame:
+    """
+    1ユーザーの履歴をまとめて生成
+
+    Args:
+        days: 履歴の日数
+        user: ユーザー番号
+        seed: 乱数シード
+        options: iter_historyのその他の引数
+
+    Returns:
+        date, weight, body_fat 列のDataFrame
+    """
+    return pd.concat(list(iter_history(days, user, seed, **options)), ignore_index=True)
+
+
+def write_sqlite(chunks: Iterator[pd.DataFrame], db_path: str) -> int:
+    """
+    履歴をSQLiteファイルへ一括で書き込み
+
+    WeightDatabaseでスキーマを作成した後、チャンクごとに一時テーブルへexecutemanyで読み込み、
+    INSERT ... SELECT ... ON CONFLICT(date) の1文でmeasurementsへ書き込む。
+    同じ日付の行は後の行（その日の最後の測定）で上書きし、最後に移動平均を一括で計算する。
+
+    Args:
+        chunks: iter_historyが返すチャンク
+        db_path: 書き込み先のデータベースファイル
+
+    Returns:
+        書き込み後のmeasurementsの行数（同じ日付の行はまとめた件数）
+    """
+    WeightDatabase(db_path).close()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('CREATE TEMP TABLE synthetic_staging (date TEXT, weight REAL, body_fat REAL)')
+        for chunk in chunks:
+            body_fats = chunk['body_fat'].astype(object).where(chunk['body_fat'].notna(), None)
+            conn.executemany(
+                'INSERT INTO synthetic_staging (date, weight, body_fat) VALUES (?, ?, ?)',
+                zip(chunk['date'].tolist(), chunk['weight'].tolist(), body_fats.tolist())
+            )
+            conn.execute('''
+                INSERT INTO measurements (date, weight, body_fat)
+                SELECT date, weight, body_fat FROM synthetic_staging
+                WHERE true
+                ORDER BY rowid
+                ON CONFLICT(date) DO UPDATE SET weight = excluded.weight, body_fat = excluded.body_fat
+            ''')
+            conn.execute('DELETE FROM synthetic_staging')
+        rows = conn.execute('SELECT COUNT(*) FROM measurements').fetchone()[0]
+    conn.close()
+
+    db = WeightDatabase(db_path)
+    db.rebuild_rollups()
+    db.close()
+    return rows
+
+
+def write_csv(chunks: Iterator[pd.DataFrame], csv_path: str) -> int:
+    """
+    履歴をCSVファイルへ書き込み（アプリのインポート形式: date, weight, body_fat）
+
+    Args:
+        chunks: iter_historyが返すチャンク
+        csv_path: 書き込み先のCSVファイル
+
+    Returns:
+        書き込んだ行数
+    """
+    written = 0
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=written == 0)
+            written += len(chunk)
+    return written
+
+
+def output_path(output: str, user: int, users: int, file_format: str) -> str:
+    """ユーザーごとの出力先（複数ユーザーの場合はoutputディレクトリ内のuser_NNNN.db/.csv）"""
+    if users == 1:
+        return output
+    return os.path.join(output, f'user_{user:04d}.{"db" if file_format == "sqlite" else "csv"}')
+
+
+def remove_output(path: str) -> None:
+    """出力先のファイルと、SQLiteの -wal / -shm ファイルを削除"""
+    for target in (path, f'{path}-wal', f'{path}-shm'):
+        if os.path.exists(target):
+            os.remove(target)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="負荷試験・ベンチマーク用の合成データ生成")
+    parser.add_argument("--days", type=int, default=3650, help="1ユーザーあたりの日数")
+    parser.add_argument("--users", type=int, default=1,
+                        help="ユーザー数（2以上の場合、--outputをディレクトリとしてユーザーごとに出力）")
+    parser.add_argument("--format", choices=["sqlite", "csv"], default="sqlite", help="出力形式")
+    parser.add_argument("--output", required=True, help="出力先のファイル（複数ユーザーの場合はディレクトリ）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="最終日（YYYY-MM-DD形式）")
+    parser.add_argument("--gap-rate", type=float, default=DEFAULT_GAP_RATE, help="空白期間の開始確率（1日あたり）")
+    parser.add_argument("--outlier-rate", type=float, default=DEFAULT_OUTLIER_RATE, help="外れ値の割合")
+    parser.add_argument("--duplicate-rate", type=float, default=DEFAULT_DUPLICATE_RATE,
+                        help="同日に2回測定する割合")
+    parser.add_argument("--force", action="store_true", help="既存の出力ファイルを削除して上書きする")
+    args = parser.parse_args(argv)
+
+    paths = [output_path(args.output, user, args.users, args.format) for user in range(args.users)]
+    existing = [path for path in paths if os.path.exists(path)]
+    if existing and not args.force:
+        raise ValueError(f"出力先のファイルが既に存在します（上書きする場合は --force を指定）: {', '.join(existing)}")
+
+    if args.users > 1:
+        os.makedirs(args.output, exist_ok=True)
+    elif os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    write = write_sqlite if args.format == 'sqlite' else write_csv
+    print(f"🚀 合成データ生成開始: {args.users}ユーザー × {args.days:,}日")
+    started = time.perf_counter()
+    total = 0
+    for user, path in enumerate(paths):
+        remove_output(path)
+        chunks = iter_history(args.days, user, args.seed, args.end_date, gap_rate=args.gap_rate,
+                              outlier_rate=args.outlier_rate, duplicate_rate=args.duplicate_rate)
+        rows = write(chunks, path)
+        total += rows
+        print(f"   ✅ {path}: {rows:,}行")
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 合計 {total:,}行（{elapsed:.1f}秒、{total / elapsed:,.0f}行/秒）")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
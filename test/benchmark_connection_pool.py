@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+接続プールのベンチマークスクリプト
+呼び出しごとに接続を張り直す従来方式と、プール接続方式の1回あたりのレイテンシを比較する
+
+使い方:
+    python test/benchmark_connection_pool.py               # 1万件・100万件で計測
+    python test/benchmark_connection_pool.py --rows 10000  # 件数を指定
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import WeightDatabase
+
+
+class LegacyWeightDatabase(WeightDatabase):
+    """呼び出しごとに新しい接続を作成する従来方式（比較用）"""
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+
+def seed_database(db_path: str, rows: int) -> None:
+    """ベンチマーク用データを一括投入"""
+    # 100万件でも日付が一意になるよう、2024-01-01から遡って1日1件ずつ生成
+    start_ordinal = max(1, date(2024, 1, 1).toordinal() - rows)
+    records = (
+        (date.fromordinal(start_ordinal + i).isoformat(), 70.0 + (i % 50) * 0.1, 20.0 + (i % 30) * 0.1)
+        for i in range(rows)
+    )
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO measurements (date, weight, body_fat) VALUES (?, ?, ?)",
+            records
+        )
+
+
+def time_call(func, iterations: int) -> float:
+    """1回あたりの平均実行時間（ミリ秒）を計測"""
+    func()  # ウォームアップ
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run_benchmark(rows: int, iterations: int = 200) -> None:
+    """指定件数のデータベースで従来方式とプール方式を比較"""
+    print(f"\n📊 {rows:,}件のデータベース")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "bench.db")
+    WeightDatabase(db_path).close()
+    seed_database(db_path, rows)
+
+    legacy_db = LegacyWeightDatabase(db_path)
+    pooled_db = WeightDatabase(db_path)
+    probe_date = "2023-12-31"
+
+    calls = [
+        ("get_setting", lambda db: db.get_setting('target_weight')),
+        ("get_record_count", lambda db: db.get_record_count()),
+        ("get_measurement_by_date", lambda db: db.get_measurement_by_date(probe_date)),
+        ("get_measurements(7)", lambda db: db.get_measurements(7)),
+        ("add_measurement", lambda db: db.add_measurement(probe_date, 70.0, 20.0)),
+    ]
+
+    print(f"   {'メソッド':<26}{'従来(ms)':>10}{'プール(ms)':>12}{'倍率':>8}")
+    for name, call in calls:
+        legacy_ms = time_call(lambda: call(legacy_db), iterations)
+        pooled_ms = time_call(lambda: call(pooled_db), iterations)
+        print(f"   {name:<26}{legacy_ms:>10.3f}{pooled_ms:>12.3f}{legacy_ms / pooled_ms:>7.1f}x")
+
+    pooled_db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.rmdir(temp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="接続プールのベンチマーク")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000],
+                        help="データ件数（複数指定可）")
+    parser.add_argument("--iterations", type=int, default=200, help="各メソッドの実行回数")
+    args = parser.parse_args()
+
+    print("🚀 接続プール ベンチマーク開始")
+    for rows in args.rows:
+        run_benchmark(rows, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
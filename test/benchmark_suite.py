@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+データベース・ダッシュボードの主要処理のベンチマークスクリプト
+件数ごとにWeightDatabaseのCRUD・統計・CSVインポート/エクスポートと、
+main.pyの移動平均・期間絞り込み・グラフ作成を計測し、結果をJSONに保存する。
+ベースラインのJSONを指定すると、処理ごとに比較して性能低下を検出する。
+
+使い方:
+    python test/benchmark_suite.py                                  # 1千件・10万件・100万件で計測
+    python test/benchmark_suite.py --rows 1000 --repeat 5           # 件数・繰り返し回数を指定
+    python test/benchmark_suite.py --output base.json               # 結果をbase.jsonに保存
+    python test/benchmark_suite.py --baseline base.json             # base.jsonと比較（低下時は終了コード1）
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_import import read_csv_chunks
+from database import WeightDatabase
+from main import calculate_moving_average, create_weight_graph, export_csv_data, filter_data_by_period
+
+# 既定の計測件数
+DEFAULT_ROWS = (1_000, 100_000, 1_000_000)
+
+# CRUDの計測で1回あたりに実行する操作数
+CRUD_OPERATIONS = 20
+
+# 比較時に性能低下とみなす増加率と、誤差として無視する差（ミリ秒）
+DEFAULT_THRESHOLD = 0.2
+MIN_DELTA_MS = 1.0
+
+
+def make_csv(rows: int) -> bytes:
+    """ベンチマーク用のCSV（1日1件、2024-12-31まで。100万件の場合は1000-01-01から）を作成"""
+    start = max(date(2024, 12, 31).toordinal() - rows + 1, date(1000, 1, 1).toordinal())
+    days = np.arange(rows)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'date': [date.fromordinal(start + day).isoformat() for day in days.tolist()],
+        'weight': np.round(70.0 + np.sin(days / 500) * 3 + rng.normal(0, 0.3, rows), 1),
+        'body_fat': np.round(20.0 + rng.normal(0, 0.5, rows), 1)
+    })
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def time_case(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], None]] = None,
+              operations: int = 1) -> Dict[str, Any]:
+    """
+    処理をrepeat回実行し、1操作あたりの実行時間（ミリ秒）の中央値・最小値を算出
+
+    Args:
+        func: 計測する処理
+        repeat: 繰り返し回数
+        setup: 毎回の計測前に実行する準備処理（計測に含めない）
+        operations: funcの1回に含まれる操作数
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000 / operations)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'repeat': repeat}
+
+
+def benchmark_rows(rows: int, repeat: int, workdir: str) -> Dict[str, Dict[str, Any]]:
+    """指定件数で全ての処理を計測"""
+    results = {}
+    csv_bytes = make_csv(rows)
+
+    # CSVインポート（毎回空のデータベースへ分割インポート。最後のデータベースを以降の計測に使用）
+    db_paths = iter(os.path.join(workdir, f'bench_{rows}_{i}.db') for i in range(repeat))
+    state = {}
+
+    def new_database():
+        if 'db' in state:
+            state['db'].close()
+        state['db'] = WeightDatabase(next(db_paths))
+
+    results['csv_import'] = time_case(
+        lambda: state['db'].import_chunks(read_csv_chunks(io.BytesIO(csv_bytes))), repeat, new_database
+    )
+    db = state['db']
+    assert db.get_record_count() == rows
+
+    results['csv_export'] = time_case(lambda: export_csv_data(db), repeat)
+    results['get_measurements'] = time_case(lambda: db.get_measurements(), repeat)
+    results['get_measurements_compact'] = time_case(lambda: db.get_measurements(compact=True), repeat)
+    results['get_measurements_between_30d'] = time_case(
+        lambda: db.get_measurements_between(pd.Timestamp(db.get_latest_date()) - pd.Timedelta(days=29)), repeat
+    )
+    results['get_statistics_30d'] = time_case(lambda: db.get_statistics(30), repeat)
+
+    def clear_summary():
+        with sqlite3.connect(db.db_path) as conn:
+            conn.execute('DELETE FROM measurement_summary')
+
+    results['get_statistics_all'] = time_case(lambda: db.get_statistics(None), repeat, clear_summary)
+    results['get_statistics_all_cached'] = time_case(lambda: db.get_statistics(None), repeat)
+
+    # CRUD（最新日の翌日以降に追加し、取得・更新・削除して元に戻す）
+    next_day = date.fromisoformat(db.get_latest_date()).toordinal() + 1
+    batches = [[date.fromordinal(next_day + i * CRUD_OPERATIONS + j).isoformat() for j in range(CRUD_OPERATIONS)]
+               for i in range(repeat)]
+    crud = {name: [] for name in ('crud_add', 'crud_get', 'crud_update', 'crud_delete')}
+    for dates in batches:
+        crud['crud_add'].append(time_case(lambda: [db.add_measurement(d, 70.0, 20.0) for d in dates],
+                                          1, operations=CRUD_OPERATIONS))
+        found = []
+        crud['crud_get'].append(time_case(lambda: found.extend(db.get_measurement_by_date(d) for d in dates),
+                                          1, operations=CRUD_OPERATIONS))
+        crud['crud_update'].append(time_case(lambda: [db.update_measurement_by_date(d, 71.0, 21.0) for d in dates],
+                                             1, operations=CRUD_OPERATIONS))
+        crud['crud_delete'].append(time_case(lambda: [db.delete_measurement(row['id']) for row in found],
+                                             1, operations=CRUD_OPERATIONS))
+    for name, runs in crud.items():
+        times = [run['median_ms'] for run in runs]
+        results[name] = {'median_ms': statistics.median(times), 'min_ms': min(times), 'repeat': repeat}
+    assert db.get_record_count() == rows
+
+    # ダッシュボードの処理（グラフ用のスナップショットと同じ列・型のデータを使用）
+    df = db.get_measurements_between(
+        columns=['date', 'weight', 'body_fat', 'weight_ma7'], compact=True
+    ).rename(columns={'weight_ma7': 'weight_ma'})
+    results['calculate_moving_average'] = time_case(lambda: calculate_moving_average(df), repeat)
+    results['filter_data_by_period_30d'] = time_case(lambda: filter_data_by_period(df, 30), repeat)
+    results['create_weight_graph'] = time_case(lambda: create_weight_graph(df, None, 65.0), repeat)
+    results['create_weight_graph_30d'] = time_case(
+        lambda: create_weight_graph(filter_data_by_period(df, 30), 30, 65.0), repeat
+    )
+    db.close()
+    return results
+
+
+def run_suite(rows_list: List[int], repeat: int) -> Dict[str, Any]:
+    """
+    全件数でベンチマークを実行
+
+    Returns:
+        実行環境（meta）と「処理名@件数」ごとの計測結果（results）の辞書
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in rows_list:
+            print(f"\n📊 {rows:,}件")
+            print("=" * 60)
+            for name, result in benchmark_rows(rows, repeat, workdir).items():
+                print(f"   {name:<32}{result['median_ms']:>12.2f}ms")
+                results[f'{name}@{rows}'] = {'case': name, 'rows': rows, **result}
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sqlite': sqlite3.sqlite_version
+        },
+        'results': results
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD, min_delta_ms: float = MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """
+    計測結果をベースラインと比較
+
+    中央値がベースラインの(1 + threshold)倍を超え、かつ差がmin_delta_msを超える処理を性能低下とする。
+
+    Args:
+        current: run_suiteの結果
+        baseline: 比較対象のrun_suiteの結果
+        threshold: 性能低下とみなす増加率
+        min_delta_ms: 誤差として無視する差（ミリ秒）
+
+    Returns:
+        処理ごとの比較結果（key, baseline_ms, current_ms, ratio, status）のリスト。
+        statusは 'regression'（低下）, 'improved'（改善）, 'ok', 'new'（ベースラインになし）
+    """
+    comparisons = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        current_ms = result['median_ms']
+        if base is None:
+            comparisons.append({'key': key, 'baseline_ms': None, 'current_ms': current_ms,
+                                'ratio': None, 'status': 'new'})
+            continue
+        base_ms = base['median_ms']
+        ratio = current_ms / base_ms if base_ms > 0 else float('inf')
+        delta = current_ms - base_ms
+        if ratio > 1 + threshold and delta > min_delta_ms:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold) and -delta > min_delta_ms:
+            status = 'improved'
+        else:
+            status = 'ok'
+        comparisons.append({'key': key, 'baseline_ms': base_ms, 'current_ms': current_ms,
+                            'ratio': ratio, 'status': status})
+    return comparisons
+
+
+def print_comparison(comparisons: List[Dict[str, Any]]) -> None:
+    """比較結果を表形式で表示"""
+    labels = {'regression': '❌ 低下', 'improved': '✅ 改善', 'ok': '  変化なし', 'new': '  新規'}
+    print(f"\n   {'処理@件数':<40}{'基準(ms)':>12}{'今回(ms)':>12}{'比率':>8}  判定")
+    for item in comparisons:
+        base = f"{item['baseline_ms']:.2f}" if item['baseline_ms'] is not None else "-"
+        ratio = f"{item['ratio']:.2f}" if item['ratio'] is not None else "-"
+        print(f"   {item['key']:<40}{base:>12}{item['current_ms']:>12.2f}{ratio:>8}  {labels[item['status']]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="データベース・ダッシュボードのベンチマーク")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                        help="データ件数（複数指定可）")
+    parser.add_argument("--repeat", type=int, default=3, help="処理ごとの繰り返し回数（中央値を採用）")
+    parser.add_argument("--output", default="benchmark_results.json", help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較するベースラインのJSONファイル")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="性能低下とみなす増加率（0.2 = 20%%）")
+    args = parser.parse_args()
+
+    print("🚀 ベンチマーク開始")
+    report = run_suite(args.rows, args.repeat)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 結果を保存しました: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparisons = compare_results(report, baseline, args.threshold)
+        print_comparison(comparisons)
+        regressions = [item['key'] for item in comparisons if item['status'] == 'regression']
+        if regressions:
+            print(f"\n❌ 性能低下: {len(regressions)}件")
+            sys.exit(1)
+        print("\n✅ 性能低下はありません")
+
+
+if __name__ == "__main__":
+    main()
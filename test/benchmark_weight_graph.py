@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+体重グラフ作成のベンチマークスクリプト
+全点描画と間引き描画で、図の作成時間・JSONシリアライズ時間・JSONサイズを比較する
+（ブラウザでの描画時間はJSONサイズにほぼ比例するため、サイズを指標とする）
+
+使い方:
+    python test/benchmark_weight_graph.py                     # 1千件・10万件・100万件で計測
+    python test/benchmark_weight_graph.py --points 10000      # 件数を指定
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import GRAPH_PIXEL_WIDTH, create_weight_graph
+
+
+def make_frame(points: int) -> pd.DataFrame:
+    """ベンチマーク用の体重データ（1時間ごと）を作成"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'date': pd.date_range('1990-01-01', periods=points, freq='h'),
+        'weight': 70.0 + np.sin(np.arange(points) / 500) * 3 + rng.normal(0, 0.3, points),
+        'body_fat': 20.0 + rng.normal(0, 0.5, points)
+    })
+    df['weight_ma'] = df['weight'].rolling(7, min_periods=1).mean()
+    return df
+
+
+def measure(df: pd.DataFrame, max_points, typed_arrays: bool = False) -> tuple:
+    """図の作成時間(ms)・シリアライズ時間(ms)・JSONサイズ(KB)を計測"""
+    start = time.perf_counter()
+    fig = create_weight_graph(df, None, 65.0, max_points=max_points, typed_arrays=typed_arrays)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    payload = fig.to_json()
+    json_ms = (time.perf_counter() - start) * 1000
+    return build_ms, json_ms, len(payload) / 1024
+
+
+def run_benchmark(points: int) -> None:
+    """指定件数で全点描画と間引き描画を比較"""
+    print(f"\n📊 {points:,}点")
+    print("=" * 60)
+    df = make_frame(points)
+
+    print(f"   {'方式':<12}{'作成(ms)':>12}{'JSON(ms)':>12}{'サイズ(KB)':>14}")
+    for label, max_points, typed_arrays in (("全点", None, False), ("全点+型付き", None, True),
+                                            ("間引き", GRAPH_PIXEL_WIDTH, False)):
+        build_ms, json_ms, size_kb = measure(df, max_points, typed_arrays)
+        print(f"   {label:<12}{build_ms:>12.1f}{json_ms:>12.1f}{size_kb:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="体重グラフ作成のベンチマーク")
+    parser.add_argument("--points", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="データ点数（複数指定可）")
+    args = parser.parse_args()
+
+    print("🚀 体重グラフ ベンチマーク開始")
+    for points in args.points:
+        run_benchmark(points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+ベンチマークスイート（計測・ベースライン比較）のテストスクリプト
+"""
+
+import sys
+
+from benchmark_suite import compare_results, run_suite
+
+
+def make_report(**medians) -> dict:
+    return {'meta': {}, 'results': {key: {'median_ms': value} for key, value in medians.items()}}
+
+
+def test_compare_results():
+    """増加率と誤差の閾値で性能低下・改善が判定されることを確認"""
+    print("🧪 ベースライン比較テスト...")
+    baseline = make_report(slow=100.0, fast=100.0, tiny=0.1, same=50.0)
+    current = make_report(slow=130.0, fast=60.0, tiny=0.5, same=55.0, added=1.0)
+    statuses = {item['key']: item['status'] for item in compare_results(current, baseline, threshold=0.2)}
+    assert statuses == {'slow': 'regression', 'fast': 'improved', 'tiny': 'ok', 'same': 'ok', 'added': 'new'}
+    print(f"   ✅ {statuses}")
+    return True
+
+
+def test_run_suite():
+    """少ない件数で全ての処理が計測され、自身との比較で性能低下がないことを確認"""
+    print("🧪 計測テスト...")
+    report = run_suite([50], repeat=1)
+    cases = {result['case'] for result in report['results'].values()}
+    for case in ('csv_import', 'csv_export', 'crud_add', 'crud_delete', 'get_statistics_30d',
+                 'calculate_moving_average', 'filter_data_by_period_30d', 'create_weight_graph'):
+        assert case in cases, case
+    assert all(result['rows'] == 50 and result['median_ms'] >= 0 for result in report['results'].values())
+    assert report['meta']['sqlite']
+    assert all(item['status'] == 'ok' for item in compare_results(report, report))
+    print(f"   ✅ {len(cases)}件の処理を計測")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 ベンチマークスイート テスト開始\n")
+    results = [
+        test_compare_results(),
+        test_run_suite(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+データエディタ保存処理（差分検出・一括更新/削除）のテストスクリプト
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from database import WeightDatabase
+from main import diff_edited_data
+
+
+def make_editor_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """画面と同じ形式の編集用データフレームを作成"""
+    edit_df = df.copy()
+    edit_df['date'] = edit_df['date'].dt.strftime('%Y-%m-%d')
+    return edit_df.rename(columns={'date': '日付', 'weight': '体重(kg)', 'body_fat': '体脂肪率(%)'})
+
+
+def test_diff_edited_data():
+    """更新・削除された行だけが検出されることを確認"""
+    print("🧪 差分検出テスト...")
+    original = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        '日付': ['2024-01-04', '2024-01-03', '2024-01-02', '2024-01-01'],
+        '体重(kg)': [70.0, 70.5, 71.0, 71.5],
+        '体脂肪率(%)': [20.0, None, 21.0, None]
+    })
+    edited = original.drop(columns='id').drop(index=2)
+    edited.loc[0, '体重(kg)'] = 69.8
+    edited.loc[3, '体脂肪率(%)'] = 22.0
+
+    updates, deleted_ids = diff_edited_data(original, edited)
+    assert deleted_ids == [3]
+    assert updates['id'].tolist() == [1, 4]
+    assert updates['weight'].tolist() == [69.8, 71.5]
+    assert updates['body_fat'].tolist() == [20.0, 22.0]
+
+    # 欠損値のままの行は変更なしとみなす
+    updates, deleted_ids = diff_edited_data(original, original.drop(columns='id'))
+    assert updates.empty and deleted_ids == []
+    print("   ✅ 更新2件・削除1件を検出")
+    return True
+
+
+def test_apply_edits():
+    """更新と削除が1回の呼び出しで反映され、移動平均も更新されることを確認"""
+    print("🧪 一括更新・削除テスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    for day in range(1, 6):
+        db.add_measurement(f"2024-01-{day:02d}", 70.0 + day, 20.0)
+    df = db.get_measurements()
+    ids = dict(zip(df['date'].dt.strftime('%Y-%m-%d'), df['id']))
+    version = db.get_data_version()
+
+    updates = pd.DataFrame({'id': [ids['2024-01-05']], 'weight': [80.0], 'body_fat': [np.nan]})
+    result = db.apply_edits(updates=updates, deleted_ids=[ids['2024-01-01']])
+    assert result == {'updated': 1, 'deleted': 1}
+    assert db.get_data_version() > version
+    assert db.get_record_count() == 4
+    latest = db.get_measurement_by_date("2024-01-05")
+    assert latest['weight'] == 80.0 and latest['body_fat'] is None
+
+    moving_averages = db.get_latest_moving_averages()
+    assert round(moving_averages['weight_ma7'], 3) == round((72.0 + 73.0 + 74.0 + 80.0) / 4, 3)
+    assert db.get_statistics(None)['weight_max'] == 80.0
+
+    assert db.bulk_update(pd.DataFrame({'id': [ids['2024-01-02']], 'weight': [60.0], 'body_fat': [18.0]})) == 1
+    assert db.bulk_delete([ids['2024-01-02'], ids['2024-01-03']]) == 2
+    assert db.bulk_delete([]) == 0
+    assert db.get_record_count() == 2
+    print(f"   ✅ 一括反映 (7日平均 {moving_averages['weight_ma7']:.2f}kg)")
+    return True
+
+
+def test_large_history_save():
+    """10年以上の履歴でも差分検出と保存が短時間で終わることを確認"""
+    print("🧪 長期履歴の保存性能テスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    dates = pd.date_range('2010-01-01', periods=5000, freq='D')
+    db.import_measurements(pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'weight': 70.0 + np.sin(np.arange(5000) / 30),
+        'body_fat': 20.0,
+        'row_num': np.arange(5000) + 2
+    }))
+    edit_df = make_editor_frame(db.get_measurements()).sort_values('日付', ascending=False)
+    edited_df = edit_df[['日付', '体重(kg)', '体脂肪率(%)']].iloc[10:].copy()
+    edited_df.iloc[::50, 1] += 0.5
+
+    start = time.perf_counter()
+    updates, deleted_ids = diff_edited_data(edit_df, edited_df)
+    result = db.apply_edits(updates=updates, deleted_ids=deleted_ids)
+    elapsed = time.perf_counter() - start
+
+    assert result == {'updated': len(updates), 'deleted': 10}
+    assert db.get_record_count() == 4990
+    assert elapsed < 2.0, f"保存に{elapsed:.2f}秒かかりました"
+    print(f"   ✅ 更新{result['updated']}件・削除{result['deleted']}件: {elapsed * 1000:.0f}ms")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 データ編集保存 テスト開始\n")
+    results = [
+        test_diff_edited_data(),
+        test_apply_edits(),
+        test_large_history_save(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+一括インポート（bulk_import）のテストスクリプト
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from database import WeightDatabase
+from csv_import import validate_import_frame
+
+
+def test_validate_import_frame():
+    """列単位バリデーションのテスト"""
+    print("🧪 列単位バリデーションテスト...")
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '', '2024/01/03', 'abc', '2024-01-05', '2024-01-06', '2024-01-07'],
+        'weight': [70.0, 71.0, 70.5, 70.0, 5.0, None, 72.0],
+        'body_fat': [20.0, None, None, 20.0, 20.0, 20.0, 150.0]
+    })
+    valid, errors = validate_import_frame(df)
+
+    assert valid['date'].tolist() == ['2024-01-01', '2024-01-03']
+    assert valid['row_num'].tolist() == [2, 4]
+    assert [error['row'] for error in errors] == [3, 5, 6, 7, 8]
+    for error in errors:
+        print(f"   行{error['row']}: {error['message']}")
+    assert errors[2]['message'] == "体重が範囲外です (5.0kg)"
+    print("✅ 列単位バリデーション成功")
+    return True
+
+
+def test_bulk_import():
+    """一括インポートと行ごとのエラー詳細のテスト"""
+    print("🧪 一括インポートテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement('2024-01-01', 80.0, 25.0)
+
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-01-03', 'invalid'],
+        'weight': [70.0, 70.5, 400.0, 70.0],
+        'body_fat': [20.0, None, 20.0, 20.0]
+    })
+    result = db.bulk_import(df)
+    print(f"   成功: {result['success_count']}件, 失敗: {result['error_count']}件")
+
+    assert result['success_count'] == 2
+    assert result['error_count'] == 2
+    assert [error['row'] for error in result['errors']] == [4, 5]
+    # 既存の日付は上書きされる
+    assert db.get_measurement_by_date('2024-01-01')['weight'] == 70.0
+    assert db.get_measurement_by_date('2024-01-02')['body_fat'] is None
+    assert db.import_from_csv(df) == (2, 2)
+    print("✅ 一括インポート成功")
+    return True
+
+
+def test_bulk_import_performance():
+    """10万件の一括インポート性能テスト"""
+    print("🧪 一括インポート性能テスト...")
+    rows = 100_000
+    df = pd.DataFrame({
+        'date': pd.date_range('1800-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+        'weight': np.random.normal(70, 2, rows).round(1),
+        'body_fat': np.random.normal(20, 3, rows).round(1)
+    })
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+
+    start_time = time.time()
+    result = db.bulk_import(df)
+    processing_time = time.time() - start_time
+
+    print(f"   {rows:,}件: {processing_time:.3f}秒")
+    assert result['success_count'] == rows
+    assert db.get_record_count() == rows
+    assert processing_time < 5.0
+    print("✅ 一括インポート性能テスト成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 一括インポート テスト開始\n")
+    results = [
+        test_validate_import_frame(),
+        test_bulk_import(),
+        test_bulk_import_performance(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
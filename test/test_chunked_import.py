@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+CSVの分割インポート（チャンクごとの検証・書き込み）のテストスクリプト
+"""
+
+import io
+import sys
+import tempfile
+
+import pandas as pd
+
+from csv_import import read_csv_chunks
+from database import WeightDatabase
+
+
+CSV_TEXT = """date,weight,body_fat
+2024-01-01,70.0,20.0
+2024-01-02,abc,20.0
+2024-01-03,70.2,
+2024-01-01,71.0,21.0
+2024-01-04,500,20.0
+2024-01-05,70.4,19.5
+2024-01-06,70.3,19.4
+"""
+
+
+def make_database() -> WeightDatabase:
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement("2024-01-05", 69.0, 18.0)
+    return db
+
+
+def test_matches_bulk_import():
+    """分割インポートの結果が一括インポートと一致することを確認"""
+    print("🧪 一括インポートとの一致テスト...")
+    for on_duplicate in ('overwrite', 'skip'):
+        bulk_db = make_database()
+        expected = bulk_db.bulk_import(pd.read_csv(io.StringIO(CSV_TEXT)), on_duplicate)
+
+        chunk_db = make_database()
+        result = chunk_db.import_chunks(read_csv_chunks(io.StringIO(CSV_TEXT), 2), on_duplicate)
+
+        assert result == expected, (result, expected)
+        columns = ['date', 'weight', 'body_fat', 'weight_ma7']
+        pd.testing.assert_frame_equal(chunk_db.get_measurements_between(columns=columns),
+                                      bulk_db.get_measurements_between(columns=columns))
+        print(f"   ✅ {on_duplicate}: 成功{result['success_count']}件・スキップ{result['skipped_count']}件・"
+              f"エラー{[error['row'] for error in result['errors']]}")
+    return True
+
+
+def test_progress_and_error_limit():
+    """チャンクごとに進捗が通知され、エラー詳細が上限件数までに制限されることを確認"""
+    print("🧪 進捗・エラー上限テスト...")
+    db = make_database()
+    reported = []
+    result = db.import_chunks(read_csv_chunks(io.StringIO(CSV_TEXT), 3), progress=reported.append, max_errors=1)
+    assert reported == [3, 6, 7]
+    assert result['error_count'] == 2 and len(result['errors']) == 1
+    assert result['errors'][0]['row'] == 3
+    print(f"   ✅ 進捗: {reported}")
+    return True
+
+
+def test_rollback_on_parse_error():
+    """途中のチャンクで読み込みに失敗した場合、書き込み済みのチャンクも取り消されることを確認"""
+    print("🧪 途中失敗時のロールバックテスト...")
+    db = make_database()
+    version = db.get_data_version()
+    broken = CSV_TEXT + "2024-01-07,70.1,19.0,extra,fields\n"
+    try:
+        db.import_chunks(read_csv_chunks(io.StringIO(broken), 2))
+        assert False, "読み込みエラーが発生しませんでした"
+    except pd.errors.ParserError:
+        pass
+    assert db.get_record_count() == 1
+    assert db.get_data_version() == version
+    print("   ✅ 既存データのみ")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 分割インポート テスト開始\n")
+    results = [
+        test_matches_bulk_import(),
+        test_progress_and_error_limit(),
+        test_rollback_on_parse_error(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+WeightDatabase 接続プールのテストスクリプト
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from database import WeightDatabase
+
+
+def test_connection_reuse():
+    """同一スレッドでは同じ接続が再利用されることを確認"""
+    print("🧪 接続再利用テスト...")
+    temp_db = tempfile.mktemp(suffix='.db')
+    with WeightDatabase(temp_db) as db:
+        first = db._connect()
+        db.add_measurement("2024-01-01", 70.0, 20.0)
+        db.get_measurements()
+        assert db._connect() is first
+        journal_mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+        print(f"   ✅ 接続を再利用 (journal_mode={journal_mode})")
+    return True
+
+
+def test_thread_connections():
+    """スレッドごとに別の接続が割り当てられ、終了後は回収されることを確認"""
+    print("🧪 スレッド別接続テスト...")
+    temp_db = tempfile.mktemp(suffix='.db')
+    with WeightDatabase(temp_db) as db:
+        main_conn = db._connect()
+        worker_conns = []
+
+        def worker(day):
+            db.add_measurement(f"2024-01-{day:02d}", 70.0 + day * 0.1)
+            worker_conns.append(db._connect())
+
+        for day in range(1, 4):
+            thread = threading.Thread(target=worker, args=(day,))
+            thread.start()
+            thread.join()
+
+        assert all(conn is not main_conn for conn in worker_conns)
+        # 終了したスレッドの接続は次のスレッドで再利用される
+        assert worker_conns[0] is worker_conns[1] is worker_conns[2]
+        assert db.get_record_count() == 3
+        print(f"   ✅ ワーカー接続数: {len(set(map(id, worker_conns)))}")
+    return True
+
+
+def test_close():
+    """close後は接続が閉じられ、利用できないことを確認"""
+    print("🧪 クローズテスト...")
+    temp_db = tempfile.mktemp(suffix='.db')
+    db = WeightDatabase(temp_db)
+    conn = db._connect()
+    db.close()
+    try:
+        conn.execute("SELECT 1")
+        assert False, "クローズ済みの接続が利用可能です"
+    except sqlite3.ProgrammingError:
+        pass
+    try:
+        db._connect()
+        assert False, "クローズ済みのデータベースから接続を取得できました"
+    except sqlite3.ProgrammingError:
+        pass
+    print("   ✅ 全接続をクローズ")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 接続プール テスト開始\n")
+    results = [
+        test_connection_reuse(),
+        test_thread_connections(),
+        test_close(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
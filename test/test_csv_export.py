@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+CSVエクスポート（カーソルからの分割出力）のテストスクリプト
+"""
+
+import gzip
+import sys
+import tempfile
+
+from database import WeightDatabase
+from main import export_csv_data
+
+
+def make_database(days: int = 25) -> WeightDatabase:
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    for day in range(days, 0, -1):
+        db.add_measurement(f"2024-01-{day:02d}", 70.0 + day * 0.1, None if day % 3 else 20.5)
+    return db
+
+
+def test_matches_dataframe_export():
+    """分割出力を連結した内容がDataFrameのto_csvと一致することを確認"""
+    print("🧪 出力内容テスト...")
+    db = make_database()
+    chunks = list(db.iter_csv_chunks(chunk_size=10))
+    assert len(chunks) == 3  # ヘッダー+10行, 10行, 5行
+    expected = db.export_to_csv().to_csv(index=False)
+    assert b''.join(chunks).decode('utf-8') == expected
+
+    partial = b''.join(db.iter_csv_chunks(columns=['date', 'weight'])).decode('utf-8')
+    assert partial.splitlines()[:2] == ['date,weight', '2024-01-01,70.1']
+    print(f"   ✅ {len(chunks)}チャンク・{len(expected)}文字")
+    return True
+
+
+def test_gzip_export():
+    """gzip圧縮した出力を展開すると同じCSVになることを確認"""
+    print("🧪 gzip圧縮テスト...")
+    db = make_database()
+    plain = export_csv_data(db)
+    compressed = export_csv_data(db, compress=True)
+    assert gzip.decompress(compressed) == plain
+    print(f"   ✅ {len(plain)}B → {len(compressed)}B")
+    return True
+
+
+def test_empty_export():
+    """データがない場合はヘッダーのみを出力することを確認"""
+    print("🧪 空データテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    assert export_csv_data(db) == b'id,date,weight,body_fat,created_at,updated_at\n'
+    assert gzip.decompress(export_csv_data(db, compress=True)).startswith(b'id,date')
+    print("   ✅ ヘッダーのみ")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 CSVエクスポート テスト開始\n")
+    results = [
+        test_matches_dataframe_export(),
+        test_gzip_export(),
+        test_empty_export(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
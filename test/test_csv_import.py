@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+CSVインポートのバリデーション（csv_import）テストスクリプト
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from csv_import import validate_import_frame, format_error_messages
+from database import WeightDatabase
+
+
+def legacy_validate(df: pd.DataFrame):
+    """従来の行単位バリデーション（比較用）"""
+    valid_rows = []
+    invalid_rows = []
+    for idx, row in df.iterrows():
+        try:
+            date_str = str(row['date']).strip()
+            if not date_str or date_str.lower() in ['nan', 'none', '']:
+                invalid_rows.append(f"行{idx+2}: 日付が空です")
+                continue
+            weight_val = row['weight']
+            if pd.isna(weight_val) or weight_val == '':
+                invalid_rows.append(f"行{idx+2}: 体重が空です")
+                continue
+            weight = float(weight_val)
+            if not (10.0 <= weight <= 300.0):
+                invalid_rows.append(f"行{idx+2}: 体重が範囲外です ({weight}kg)")
+                continue
+            body_fat = None
+            if 'body_fat' in row and pd.notna(row['body_fat']) and str(row['body_fat']).strip():
+                body_fat_val = float(row['body_fat'])
+                if not (0.0 <= body_fat_val <= 100.0):
+                    invalid_rows.append(f"行{idx+2}: 体脂肪率が範囲外です ({body_fat_val}%)")
+                    continue
+                body_fat = body_fat_val
+            valid_rows.append({'date': date_str, 'weight': weight, 'body_fat': body_fat, 'row_num': idx + 2})
+        except (ValueError, TypeError) as e:
+            invalid_rows.append(f"行{idx+2}: データ変換エラー ({str(e)})")
+    return valid_rows, invalid_rows
+
+
+CSV_TEXT = """date,weight,body_fat
+2024-01-01,70.5,20.1
+,70.0,20.0
+2024-01-03,,20.0
+2024-01-04,5.0,20.0
+2024-01-05,70.0,150.0
+2024-01-06,abc,20.0
+2024-01-07,301,
+2024-01-08,69.8,
+2024-01-09,10.0,0.0
+"""
+
+
+def test_matches_legacy_validation():
+    """従来の行単位バリデーションと同じ判定になることを確認"""
+    print("🧪 従来バリデーションとの比較テスト...")
+    df = pd.read_csv(io.StringIO(CSV_TEXT))
+    legacy_valid, legacy_invalid = legacy_validate(df)
+    valid, errors = validate_import_frame(df)
+    messages = format_error_messages(errors)
+    for message in messages:
+        print(f"   • {message}")
+
+    assert valid['row_num'].tolist() == [row['row_num'] for row in legacy_valid]
+    assert valid['weight'].tolist() == [row['weight'] for row in legacy_valid]
+    legacy_body_fats = [row['body_fat'] for row in legacy_valid]
+    assert [None if pd.isna(v) else v for v in valid['body_fat']] == legacy_body_fats
+    assert [error['row'] for error in errors] == [int(m.split(':')[0][1:]) for m in legacy_invalid]
+    # 数値変換エラー以外のメッセージは従来と同じ
+    for message, legacy in zip(messages, legacy_invalid):
+        if 'データ変換エラー' not in legacy:
+            assert message == legacy
+    print("✅ 従来バリデーションとの比較テスト成功")
+    return True
+
+
+def test_missing_columns_and_dates():
+    """必須カラム不足と日付形式のテスト"""
+    print("🧪 カラム不足・日付形式テスト...")
+    valid, errors = validate_import_frame(pd.DataFrame({'date': ['2024-01-01'], 'body_fat': [20.0]}))
+    assert valid.empty
+    assert "必要なカラムがありません" in errors[0]['message']
+
+    valid, errors = validate_import_frame(pd.DataFrame({
+        'date': ['2024/01/02', '2024-1-3', '2024-13-45', 'none'],
+        'weight': [70.0, 70.0, 70.0, 70.0]
+    }))
+    assert valid['date'].tolist() == ['2024-01-02', '2024-01-03']
+    assert format_error_messages(errors) == ["行4: 日付の形式が不正です (2024-13-45)", "行5: 日付が空です"]
+    print("✅ カラム不足・日付形式テスト成功")
+    return True
+
+
+def test_timezone_dates():
+    """タイムゾーン付きの日時が記録時の日付として取り込まれることを確認"""
+    print("🧪 タイムゾーン付き日時テスト...")
+    valid, errors = validate_import_frame(pd.DataFrame({
+        'date': ['2024-01-02T07:30:00+09:00', '2024-01-03T23:30:00-05:00', '2024-01-04T01:00:00Z',
+                 '2024-01-05 08:00', 'invalid'],
+        'weight': [70.0] * 5
+    }))
+    assert valid['date'].tolist() == ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']
+    assert format_error_messages(errors) == ["行6: 日付の形式が不正です (invalid)"]
+
+    # オフセットが1種類のみの場合も同様
+    db = WeightDatabase(os.path.join(tempfile.mkdtemp(), 'timezone.db'))
+    result = db.bulk_import(pd.DataFrame({'date': ['2024-01-01T07:30:00+09:00'], 'weight': [70]}))
+    assert result['success_count'] == 1 and result['error_count'] == 0
+    assert db.get_measurement_by_date('2024-01-01') is not None
+    print("✅ タイムゾーン付き日時テスト成功")
+    return True
+
+
+def test_validation_performance():
+    """50万行のバリデーション性能テスト"""
+    print("🧪 バリデーション性能テスト...")
+    rows = 500_000
+    rng = np.random.default_rng(0)
+    csv_text = pd.DataFrame({
+        'date': np.tile(pd.date_range('2000-01-01', periods=10_000, freq='D').strftime('%Y/%m/%d'), rows // 10_000),
+        'weight': rng.normal(70, 3, rows).round(1),
+        'body_fat': np.where(rng.random(rows) > 0.2, rng.normal(20, 3, rows).round(1), np.nan)
+    }).to_csv(index=False)
+    df = pd.read_csv(io.StringIO(csv_text))
+
+    start_time = time.time()
+    valid, errors = validate_import_frame(df)
+    format_error_messages(errors[:5])
+    processing_time = time.time() - start_time
+
+    print(f"   {rows:,}行: {processing_time:.3f}秒 (有効 {len(valid):,}件, 無効 {len(errors):,}件)")
+    assert len(valid) + len(errors) == rows
+    assert processing_time < 1.0
+    print("✅ バリデーション性能テスト成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 CSVインポート バリデーション テスト開始\n")
+    results = [
+        test_matches_legacy_validation(),
+        test_missing_columns_and_dates(),
+        test_timezone_dates(),
+        test_validation_performance(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
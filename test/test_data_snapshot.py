@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+データバージョンとスナップショットキャッシュのテストスクリプト
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from database import WeightDatabase
+from main import get_data_snapshot, load_data_snapshot
+
+
+class CountingDatabase(WeightDatabase):
+    """get_measurementsの呼び出し回数を記録するデータベース（テスト用）"""
+
+    def __init__(self, db_path: str):
+        self.measurement_calls = 0
+        super().__init__(db_path)
+
+    def get_measurements(self, days=None, **kwargs):
+        self.measurement_calls += 1
+        return super().get_measurements(days, **kwargs)
+
+
+def test_data_version():
+    """書き込みと外部接続による変更でデータバージョンが進むことを確認"""
+    print("🧪 データバージョンテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+
+    version = db.get_data_version()
+    assert db.get_data_version() == version
+    db.get_measurements()
+    db.get_setting('target_weight')
+    assert db.get_data_version() == version
+    print(f"   読み込みのみ: バージョン {version} のまま")
+
+    db.add_measurement('2024-01-01', 70.0, 20.0)
+    assert db.get_data_version() > version
+    version = db.get_data_version()
+
+    db.set_setting('target_weight', 65.0)
+    assert db.get_data_version() > version
+    version = db.get_data_version()
+
+    # 別の接続（他プロセス相当）からの書き込みも検知する
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE measurements SET weight = 71.0")
+    assert db.get_data_version() > version
+    print(f"   書き込み後: バージョン {db.get_data_version()}")
+    print("✅ データバージョンテスト成功")
+    return True
+
+
+def test_data_version_threads():
+    """別スレッドの接続で読み込んでも、1回の書き込みでバージョンが何度も進まないことを確認"""
+    print("🧪 複数スレッドのデータバージョンテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement('2024-01-01', 70.0, 20.0)
+
+    def read_in_thread():
+        # メトリクスの収集など、別スレッドの接続からの読み込み
+        db.get_record_count()
+        versions.append(db.get_data_version())
+
+    for _ in range(3):
+        db.add_measurement('2024-01-02', 69.5, 19.8)
+        version = db.get_data_version()
+        versions = []
+        threads = [threading.Thread(target=read_in_thread) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        assert versions == [version, version], (version, versions)
+        assert db.get_data_version() == version
+
+    # 別スレッドの接続からの書き込みは検知する
+    thread = threading.Thread(target=db.add_measurement, args=('2024-01-03', 69.0, 19.5))
+    thread.start()
+    thread.join()
+    assert db.get_data_version() > version
+    print(f"   ✅ 読み込みのみのスレッドではバージョン {version} のまま")
+    return True
+
+
+def test_snapshot_cache():
+    """データが変わらない限りスナップショットが再利用されることを確認"""
+    print("🧪 スナップショットキャッシュテスト...")
+    load_data_snapshot.clear()
+    db = CountingDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement('2024-01-01', 70.0, 20.0)
+
+    for _ in range(5):
+        snapshot = get_data_snapshot(db)
+    assert db.measurement_calls == 1
+    assert snapshot['statistics']['count'] == 1
+    assert snapshot['latest_measurement']['body_fat'] == 20.0 and 'measurements' not in snapshot
+    assert snapshot['target_weight'] == 70.0
+
+    db.add_measurement('2024-01-02', 69.5, 19.8)
+    snapshot = get_data_snapshot(db)
+    assert db.measurement_calls == 2
+    assert snapshot['statistics']['count'] == 2
+    assert snapshot['latest_measurement']['weight'] == 69.5
+    print(f"   読み込み回数: {db.measurement_calls}回（6回の取得）")
+    print("✅ スナップショットキャッシュテスト成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 スナップショットキャッシュ テスト開始\n")
+    results = [
+        test_data_version(),
+        test_data_version_threads(),
+        test_snapshot_cache(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
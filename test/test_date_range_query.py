@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+日付範囲検索（get_measurements_between）のテストスクリプト
+"""
+
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+
+from database import WeightDatabase
+from main import filter_data_by_period, get_period_data
+
+
+def create_test_db(days: int = 60) -> WeightDatabase:
+    """連続した日付のテストデータベースを作成"""
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    base_date = date(2024, 1, 1)
+    db.bulk_import(pd.DataFrame({
+        'date': [(base_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)],
+        'weight': [70.0 + i * 0.1 for i in range(days)],
+        'body_fat': [20.0] * days
+    }))
+    return db
+
+
+def test_range_query():
+    """範囲指定・昇順・カラム指定のテスト"""
+    print("🧪 日付範囲検索テスト...")
+    db = create_test_db()
+
+    df = db.get_measurements_between('2024-01-10', date(2024, 1, 16), columns=['date', 'weight'])
+    print(f"   2024-01-10～2024-01-16: {len(df)}件")
+    assert len(df) == 7
+    assert list(df.columns) == ['date', 'weight']
+    assert df['date'].is_monotonic_increasing
+    assert df['date'].iloc[0] == pd.Timestamp('2024-01-10')
+
+    assert len(db.get_measurements_between()) == 60
+    assert len(db.get_measurements_between(start='2024-02-25')) == 5
+    assert db.get_latest_date() == '2024-02-29'
+
+    try:
+        db.get_measurements_between(columns=['weight; DROP TABLE measurements'])
+        assert False, "不明なカラムが受け付けられました"
+    except ValueError:
+        pass
+    print("✅ 日付範囲検索成功")
+    return True
+
+
+def test_range_query_uses_index():
+    """範囲検索がインデックスを利用することを確認"""
+    print("🧪 クエリプラン確認テスト...")
+    db = create_test_db(10)
+    plan = db._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT date, weight FROM measurements "
+        "WHERE date >= ? AND date <= ? ORDER BY date ASC",
+        ('2024-01-02', '2024-01-05')
+    ).fetchall()
+    detail = ' '.join(row[-1] for row in plan)
+    print(f"   {detail}")
+    assert 'USING INDEX' in detail
+    assert 'TEMP B-TREE' not in detail
+    print("✅ クエリプラン確認成功")
+    return True
+
+
+def test_period_data_matches_filter():
+    """get_period_dataがfilter_data_by_periodと同じ結果になることを確認"""
+    print("🧪 期間データ取得テスト...")
+    db = create_test_db()
+    all_data = db.get_measurements()
+
+    for period_days in [7, 30, 90, None]:
+        expected = filter_data_by_period(all_data, period_days)
+        actual = get_period_data(db, period_days, columns=['date', 'weight'])
+        print(f"   {period_days}日間: {len(actual)}件")
+        assert actual['date'].tolist() == expected['date'].tolist()
+        assert actual['weight'].tolist() == expected['weight'].tolist()
+
+    empty_db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    assert get_period_data(empty_db, 7).empty
+    print("✅ 期間データ取得成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 日付範囲検索 テスト開始\n")
+    results = [
+        test_range_query(),
+        test_range_query_uses_index(),
+        test_period_data_matches_filter(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+グラフ用ダウンサンプリングのテストスクリプト
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from downsampling import downsample_series, lttb_indices, minmax_indices
+from main import create_weight_graph
+
+
+def make_series(n: int, seed: int = 0) -> pd.DataFrame:
+    """n日分の体重データ（中央に大きな外れ値を1点含む）"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=n, freq='D'),
+        'weight': 70.0 + np.sin(np.arange(n) / 50) + rng.normal(0, 0.2, n),
+        'body_fat': 20.0 + rng.normal(0, 0.5, n)
+    })
+    df.loc[n // 2, 'weight'] = 90.0
+    return df
+
+
+def test_lttb_indices():
+    """LTTBが点数・端点・ピークを保つことを確認"""
+    print("🧪 LTTBテスト...")
+    df = make_series(10_000)
+    x = np.arange(len(df), dtype=np.float64)
+    indices = lttb_indices(x, df['weight'].to_numpy(), 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(df) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert len(df) // 2 in indices, "外れ値が間引かれました"
+
+    # 出力点数以下の場合は全点
+    assert len(lttb_indices(x[:100], df['weight'].to_numpy()[:100], 500)) == 100
+    print(f"   ✅ {len(df):,}点 → {len(indices)}点（外れ値を保持）")
+    return True
+
+
+def test_minmax_indices():
+    """min/max間引きがバケットごとの最小・最大を保つことを確認"""
+    print("🧪 min/max間引きテスト...")
+    y = make_series(10_000)['weight'].to_numpy()
+    indices = minmax_indices(y, 500)
+    assert len(indices) <= 500
+    assert y[indices].max() == y.max() and y[indices].min() == y.min()
+    print(f"   ✅ {len(y):,}点 → {len(indices)}点")
+    return True
+
+
+def test_downsample_series():
+    """欠損値の扱いと、上限以下の場合にそのまま返すことを確認"""
+    print("🧪 系列間引きテスト...")
+    df = make_series(100)
+    df.loc[10:19, 'body_fat'] = np.nan
+
+    x, y = downsample_series(df['date'], df['body_fat'], 1000)
+    assert len(y) == 100 and y.isna().sum() == 10  # 線の途切れを保持
+
+    x, y = downsample_series(df['date'], df['body_fat'], 20)
+    assert len(y) == 20 and y.notna().all()
+    assert x.is_monotonic_increasing
+
+    try:
+        downsample_series(df['date'], df['weight'], 20, method='average')
+        assert False, "不明な間引き方法が受け付けられました"
+    except ValueError:
+        pass
+    print("   ✅ 欠損値・上限以下の入力を処理")
+    return True
+
+
+def test_graph_downsampling():
+    """グラフの各系列が描画幅以下に間引かれ、max_points=Noneでは全点になることを確認"""
+    print("🧪 グラフ間引きテスト...")
+    df = make_series(100_000)
+    fig = create_weight_graph(df, None, 65.0, max_points=1000)
+    assert [len(trace.y) for trace in fig.data] == [1000, 1000, 1000]
+    assert fig.data[2].yaxis == 'y2'
+    assert max(fig.data[0].y) == 90.0
+
+    fig = create_weight_graph(df.iloc[:500], 30, 65.0, max_points=None)
+    assert [len(trace.y) for trace in fig.data] == [500, 500, 500]
+    print("   ✅ 3系列を1,000点に間引き")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 ダウンサンプリング テスト開始\n")
+    results = [
+        test_lttb_indices(),
+        test_minmax_indices(),
+        test_downsample_series(),
+        test_graph_downsampling(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+データエディタのキーセットページングのテストスクリプト
+"""
+
+import sys
+import tempfile
+
+import pandas as pd
+
+from database import WeightDatabase
+from main import load_editor_page
+
+
+def make_database(days: int = 25) -> WeightDatabase:
+    """2024-01-01から1日1件のデータを持つテスト用データベースを作成"""
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    dates = pd.date_range('2024-01-01', periods=days, freq='D')
+    db.import_measurements(pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'weight': [70.0 + i * 0.1 for i in range(days)],
+        'body_fat': 20.0,
+        'row_num': range(2, days + 2)
+    }))
+    return db
+
+
+def page_dates(df: pd.DataFrame) -> list:
+    return df['date'].dt.strftime('%Y-%m-%d').tolist()
+
+
+def test_get_measurements_page():
+    """カーソルの前後から新しい順で1ページ分だけ取得されることを確認"""
+    print("🧪 キーセットページ取得テスト...")
+    db = make_database()
+
+    latest = db.get_measurements_page(page_size=3)
+    assert page_dates(latest) == ['2024-01-25', '2024-01-24', '2024-01-23']
+
+    older = db.get_measurements_page('2024-01-23', page_size=3)
+    assert page_dates(older) == ['2024-01-22', '2024-01-21', '2024-01-20']
+
+    newer = db.get_measurements_page('2024-01-20', page_size=3, direction='newer')
+    assert page_dates(newer) == ['2024-01-23', '2024-01-22', '2024-01-21']
+
+    assert db.get_measurements_page('2024-01-01', page_size=3).empty
+    assert list(db.get_measurements_page(page_size=1, columns=['date', 'weight']).columns) == ['date', 'weight']
+
+    try:
+        db.get_measurements_page(direction='sideways')
+        assert False, "不正なページ方向が受け付けられました"
+    except ValueError:
+        pass
+    print("   ✅ 最新・古い・新しいページを取得")
+    return True
+
+
+def test_editor_navigation():
+    """古い方向に全ページを辿ると全件を1回ずつ表示し、新しい方向で戻れることを確認"""
+    print("🧪 ページ送りテスト...")
+    db = make_database()
+
+    seen = []
+    cursor = None
+    pages = []
+    while True:
+        page, has_older, has_newer = load_editor_page(db, cursor, 'older', page_size=10)
+        assert has_newer == (cursor is not None)
+        pages.append(page)
+        seen.extend(page_dates(page))
+        if not has_older:
+            break
+        cursor = page_dates(page)[-1]
+    assert len(pages) == 3
+    assert seen == sorted(seen, reverse=True) and len(set(seen)) == 25
+
+    # 最古のページから新しい方向へ戻る
+    page, has_older, has_newer = load_editor_page(db, page_dates(pages[-1])[0], 'newer', 10)
+    assert page_dates(page) == page_dates(pages[1])
+    assert has_older and has_newer
+
+    # 最新に到達した場合は最新ページ（満杯）に戻る
+    page, has_older, has_newer = load_editor_page(db, '2024-01-20', 'newer', 10)
+    assert page_dates(page) == page_dates(pages[0])
+    assert has_older and not has_newer
+
+    # 最初の記録より前の日付へ移動した場合も、最新ページを表示してページ送りできる
+    page, has_older, has_newer = load_editor_page(db, '2023-12-01', 'older', 10)
+    assert page_dates(page) == page_dates(pages[0])
+    assert has_older and not has_newer
+
+    # 最古のページの行をすべて削除した後も同様
+    db.bulk_delete(pages[-1]['id'].astype(int).tolist())
+    page, has_older, has_newer = load_editor_page(db, page_dates(pages[1])[-1], 'older', 10)
+    assert page_dates(page) == page_dates(pages[0])
+    print(f"   ✅ {len(pages)}ページ・{len(seen)}件を表示")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 エディタページング テスト開始\n")
+    results = [
+        test_get_measurements_page(),
+        test_editor_navigation(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
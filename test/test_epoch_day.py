@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+日番号（day）カラムによる範囲検索・並び替えのテストスクリプト
+"""
+
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+
+from database import WeightDatabase
+from main import diff_edited_data, load_editor_page
+
+
+class Version3Database(WeightDatabase):
+    """日番号カラム導入前（スキーマバージョン3）のデータベース（テスト用）"""
+    MIGRATIONS = WeightDatabase.MIGRATIONS[:3]
+
+
+MEASUREMENTS = (("2024-03-01", 71.0), ("2023-12-31", 72.0), ("2024-02-29", 70.5), ("1969-12-31", 60.0))
+
+
+def make_database() -> WeightDatabase:
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    for date, weight in MEASUREMENTS:
+        db.add_measurement(date, weight, 20.0)
+    return db
+
+
+def test_day_values():
+    """dayが1970-01-01からの日数になることを確認"""
+    print("🧪 日番号テスト...")
+    db = make_database()
+    with sqlite3.connect(db.db_path) as conn:
+        days = dict(conn.execute('SELECT date, day FROM measurements').fetchall())
+    for date, day in days.items():
+        assert day == (pd.Timestamp(date) - pd.Timestamp('1970-01-01')).days, (date, day)
+    print(f"   ✅ {days}")
+    return True
+
+
+def test_migrate_version3():
+    """バージョン3のデータベースに日番号カラムとインデックスが追加されることを確認"""
+    print("🧪 バージョン3からの移行テスト...")
+    old = Version3Database(tempfile.mktemp(suffix='.db'))
+    assert old.get_schema_version() == 3
+    old.close()
+    with sqlite3.connect(old.db_path) as conn:
+        conn.executemany("INSERT INTO measurements (date, weight) VALUES (?, ?)", MEASUREMENTS)
+
+    db = WeightDatabase(old.db_path)
+    assert db.get_schema_version() == len(WeightDatabase.MIGRATIONS)
+    with sqlite3.connect(db.db_path) as conn:
+        indexes = [row[1] for row in conn.execute('PRAGMA index_list(measurements)')]
+    assert 'idx_measurements_day' in indexes
+    assert db.get_latest_date() == "2024-03-01"
+    assert db.get_latest_moving_averages()['weight_ma7'] == 70.75
+    print(f"   ✅ インデックス: {indexes}")
+    return True
+
+
+def test_queries_use_day_index():
+    """範囲検索・並び替えがidx_measurements_dayを使うことを確認"""
+    print("🧪 クエリプランテスト...")
+    db = make_database()
+    queries = (
+        "SELECT day AS date FROM measurements WHERE day >= 19700 AND day <= 19800 ORDER BY day",
+        "SELECT * FROM measurements ORDER BY day DESC LIMIT 10",
+        "SELECT * FROM measurements WHERE day < 19700 ORDER BY day DESC LIMIT 50",
+    )
+    with sqlite3.connect(db.db_path) as conn:
+        for query in queries:
+            plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}'))
+            assert 'idx_measurements_day' in plan and 'TEMP B-TREE' not in plan, plan
+    print("   ✅ 全てのクエリでインデックスを使用")
+    return True
+
+
+def test_api_unchanged():
+    """YYYY-MM-DD形式のAPIと取得結果が変わらないことを確認"""
+    print("🧪 API互換テスト...")
+    db = make_database()
+    expected = ['1969-12-31', '2023-12-31', '2024-02-29', '2024-03-01']
+
+    df = db.get_measurements()
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist() == expected
+    assert df['date'].dtype == pd.to_datetime(pd.Series(expected)).dtype
+    assert db.get_measurements(2)['weight'].tolist() == [70.5, 71.0]
+    assert db.get_measurements(compact=True)['date'].dt.strftime('%Y-%m-%d').tolist() == expected
+
+    between = db.get_measurements_between('2024-01-01', pd.Timestamp('2024-02-29'), columns=['date', 'weight'])
+    assert between['weight'].tolist() == [70.5]
+    page = db.get_measurements_page('2024-03-01', page_size=2)
+    assert page['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-02-29', '2023-12-31']
+
+    assert db.get_measurement_by_date("2024-02-29")['weight'] == 70.5
+    assert db.get_statistics(2)['count'] == 2
+    assert db.get_statistics(None)['start_date'] == '1969-12-31'
+    print("   ✅ 取得結果は従来通り")
+    return True
+
+
+def test_legacy_dates():
+    """旧形式の日付が移行時にYYYY-MM-DD形式へ統一され、不正な日付の書き込みはFalseになることを確認"""
+    print("🧪 旧形式の日付の移行テスト...")
+    old = Version3Database(tempfile.mktemp(suffix='.db'))
+    old.close()
+    with sqlite3.connect(old.db_path) as conn:
+        conn.executemany("INSERT INTO measurements (date, weight, updated_at) VALUES (?, ?, ?)", [
+            ("2024/01/05", 70.0, "2024-01-05 08:00:00"),
+            ("2024-1-7", 69.5, "2024-01-07 08:00:00"),
+            ("2024-01-05", 71.0, "2024-01-06 08:00:00"),  # 更新日時が新しい方を残す
+            ("2024-01-06 07:30:00", 69.8, "2024-01-06 08:00:00"),
+            ("unknown", 68.0, "2024-01-08 08:00:00"),
+        ])
+
+    db = WeightDatabase(old.db_path)
+    df = db.get_measurements()
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist()[1:] == ['2024-01-05', '2024-01-06', '2024-01-07']
+    assert df['date'].isna().sum() == 1
+    assert db.get_measurement_by_date('2024/01/05')['weight'] == 71.0
+    assert len(db.get_measurements_between('2024-01-01', '2024-01-31')) == 3
+    assert db.get_statistics(None)['count'] == 3
+
+    assert db.add_measurement('2024/01/08', 70.2)
+    assert db.get_measurement_by_date('2024-01-08')['weight'] == 70.2
+    assert db.add_measurement('unknown', 70.0) is False
+    assert db.update_measurement_by_date('2024-13-01', 70.0) is False
+    assert db.get_measurement_by_date('unknown') is None
+    unknown_id = int(df.loc[df['date'].isna(), 'id'].iloc[0])
+
+    # 日付を変換できない行はエディタに表示されず、変更なしで保存しても削除されない
+    page, _, _ = load_editor_page(db, None, 'older', 50)
+    assert unknown_id not in page['id'].tolist() and page['date'].notna().all()
+    edit_df = df.assign(日付=df['date'].dt.strftime('%Y-%m-%d')).rename(
+        columns={'weight': '体重(kg)', 'body_fat': '体脂肪率(%)'}
+    )
+    updates, deleted_ids = diff_edited_data(edit_df, edit_df.drop(columns=['id']))
+    assert updates.empty and deleted_ids == []
+    assert db.update_measurement(unknown_id, 67.0)
+    assert db.apply_edits(deleted_ids=[unknown_id]) == {'updated': 0, 'deleted': 1}
+    print(f"   ✅ {db.get_record_count()}件")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 日番号カラム テスト開始\n")
+    results = [
+        test_day_values(),
+        test_migrate_version3(),
+        test_queries_use_day_index(),
+        test_api_unchanged(),
+        test_legacy_dates(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+グラフのメモ化キャッシュのテストスクリプト
+"""
+
+import sys
+import tempfile
+
+import plotly.graph_objects as go
+
+from database import WeightDatabase
+from figure_cache import FigureCache, estimate_figure_bytes
+from main import get_figure_cache, get_weight_graph
+
+
+def make_figure(points: int) -> go.Figure:
+    return go.Figure(go.Scatter(x=list(range(points)), y=list(range(points))))
+
+
+def test_lru_eviction():
+    """件数の上限を超えると最も使われていない図から削除されることを確認"""
+    print("🧪 LRU削除テスト...")
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def builder(name):
+        def build():
+            builds.append(name)
+            return make_figure(10)
+        return build
+
+    cache.get_or_build('a', builder('a'))
+    cache.get_or_build('b', builder('b'))
+    cache.get_or_build('a', builder('a'))  # aを最近使用に
+    cache.get_or_build('c', builder('c'))  # bが削除される
+    cache.get_or_build('a', builder('a'))
+    cache.get_or_build('b', builder('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 4, 2)
+    print(f"   ✅ {stats}")
+    return True
+
+
+def test_memory_cap():
+    """合計サイズの上限を超えないよう削除され、単体で超える図は保持しないことを確認"""
+    print("🧪 メモリ上限テスト...")
+    size = estimate_figure_bytes(make_figure(1000))
+    cache = FigureCache(max_entries=10, max_bytes=int(size * 2.5))
+    for key in range(4):
+        cache.get_or_build(key, lambda: make_figure(1000))
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['bytes'] <= cache.max_bytes
+
+    cache.get_or_build('huge', lambda: make_figure(10_000))
+    assert cache.stats()['entries'] == 2
+    print(f"   ✅ {stats['entries']}件・{stats['bytes']:,}バイトを保持")
+    return True
+
+
+def test_weight_graph_cache():
+    """同じデータバージョン・期間・目標体重では同じ図が返り、書き込み後は作り直されることを確認"""
+    print("🧪 体重グラフキャッシュテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    for day in range(1, 11):
+        db.add_measurement(f"2024-01-{day:02d}", 70.0 + day * 0.1, 20.0)
+
+    version = db.get_data_version()
+    fig = get_weight_graph(db, version, 30, 65.0)
+    assert get_weight_graph(db, version, 30, 65.0) is fig
+    assert get_weight_graph(db, version, 30, 66.0) is not fig
+    assert get_weight_graph(db, version, 7, 65.0) is not fig
+    assert get_weight_graph(db, version, 30, 65.0, theme='dark') is not fig
+
+    db.add_measurement("2024-01-11", 72.0, 20.0)
+    new_version = db.get_data_version()
+    updated = get_weight_graph(db, new_version, 30, 65.0)
+    assert updated is not fig
+    assert len(updated.data[0].y) == 11
+    print(f"   ✅ キャッシュ統計: {get_figure_cache().stats()}")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 グラフキャッシュ テスト開始\n")
+    results = [
+        test_lru_eviction(),
+        test_memory_cap(),
+        test_weight_graph_cache(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+グラフ描画モード（SVG / WebGL）自動切り替えのテストスクリプト
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from main import create_weight_graph
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    """n日分の体重・体脂肪率データ"""
+    return pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=n, freq='D'),
+        'weight': 70.0 + np.sin(np.arange(n) / 30),
+        'body_fat': 20.0 + np.cos(np.arange(n) / 30)
+    })
+
+
+def test_svg_for_small_charts():
+    """描画点数がしきい値以下ならSVG（Scatter）のままであることを確認"""
+    print("🧪 SVG描画テスト...")
+    fig = create_weight_graph(make_frame(365), 365, 65.0)
+    assert all(type(trace) is go.Scatter for trace in fig.data)
+    print(f"   ✅ {len(fig.data)}系列をScatterで描画")
+    return True
+
+
+def test_webgl_above_threshold():
+    """しきい値を超えるとWebGLに切り替わり、第2軸と目標線が維持されることを確認"""
+    print("🧪 WebGL描画テスト...")
+    df = make_frame(20_000)
+    fig = create_weight_graph(df, None, 65.0, max_points=None, webgl_threshold=10_000)
+    assert [type(trace) for trace in fig.data] == [go.Scattergl] * 3
+    assert fig.data[2].yaxis == 'y2'
+    assert fig.layout.yaxis2.overlaying == 'y'
+    assert fig.data[1].line.dash == 'dash'
+    assert [shape.y0 for shape in fig.layout.shapes] == [65.0]
+
+    # 間引く前の件数で判定する（既定の設定でも件数が多ければWebGLになる）
+    fig = create_weight_graph(df, None, 65.0, max_points=1000, webgl_threshold=10_000)
+    assert all(type(trace) is go.Scattergl for trace in fig.data)
+    assert all(len(trace.x) <= 1000 for trace in fig.data)
+    fig = create_weight_graph(df, None, 65.0)
+    assert all(type(trace) is go.Scattergl for trace in fig.data)
+
+    # None は常にSVG、0 は常にWebGL
+    fig = create_weight_graph(df, None, None, max_points=None, webgl_threshold=None)
+    assert all(type(trace) is go.Scatter for trace in fig.data)
+    fig = create_weight_graph(make_frame(10), 7, None, webgl_threshold=0)
+    assert all(type(trace) is go.Scattergl for trace in fig.data)
+    print("   ✅ しきい値でScatterglに切り替え")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 グラフ描画モード テスト開始\n")
+    results = [
+        test_svg_for_small_charts(),
+        test_webgl_above_threshold(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
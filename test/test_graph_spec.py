@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+体重グラフの図定義ビルダー（検証なしの高速経路）のテストスクリプト
+変更前のgo.Figure組み立て処理と、ブラウザへ送られるJSONが一致することを確認する
+"""
+
+import base64
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from downsampling import downsample_series
+from main import (COLOR_SCHEME, GRAPH_PIXEL_WIDTH, GRAPH_WEBGL_THRESHOLD, build_weight_graph_spec,
+                  calculate_moving_average, create_weight_graph)
+
+
+def legacy_create_weight_graph(df: pd.DataFrame, period_days: int = None, target_weight: float = None,
+                               max_points: int = GRAPH_PIXEL_WIDTH,
+                               webgl_threshold: int = GRAPH_WEBGL_THRESHOLD) -> go.Figure:
+    """
+    変更前の体重グラフ作成処理（go.Scatter・update_layoutによる検証付き、比較用）
+    
+    各系列はmax_points点を超える場合にLTTBで間引く（Noneの場合は全点を描画）。
+    データ件数（間引く前）がwebgl_threshold件を超える場合はScatterglで描画する
+    （Noneの場合は常にSVG、0の場合は常にWebGL）。
+    """
+    if df.empty:
+        # データが空の場合のプレースホルダー
+        fig = go.Figure()
+        fig.add_annotation(
+            text="データがありません<br>左側のフォームから記録を追加してください",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, xanchor='center', yanchor='middle',
+            showarrow=False,
+            font=dict(size=16, color="#666666")
+        )
+        fig.update_layout(
+            title="体重推移グラフ",
+            xaxis_title="日付",
+            yaxis_title="体重 (kg)",
+            height=400
+        )
+        return fig
+    
+    # データの前処理（移動平均が事前計算済みの場合はそのまま使用）
+    df_with_ma = df if 'weight_ma' in df.columns else calculate_moving_average(df)
+    
+    # 各系列を描画幅に合わせて間引く
+    weight_x, weight_y = downsample_series(df_with_ma['date'], df_with_ma['weight'], max_points)
+    weight_ma_x, weight_ma_y = downsample_series(df_with_ma['date'], df_with_ma['weight_ma'], max_points)
+    has_body_fat = 'body_fat' in df_with_ma.columns and df_with_ma['body_fat'].notna().any()
+    if has_body_fat:
+        body_fat_x, body_fat_y = downsample_series(df_with_ma['date'], df_with_ma['body_fat'], max_points)
+    
+    # データ件数（間引く前）が多い場合はWebGLで描画
+    use_webgl = webgl_threshold is not None and len(df_with_ma) > webgl_threshold
+    scatter = go.Scattergl if use_webgl else go.Scatter
+    
+    # 図の作成
+    fig = go.Figure()
+    
+    # 体重ライン（メイン）
+    fig.add_trace(scatter(
+        x=weight_x,
+        y=weight_y,
+        mode='lines',
+        name='体重',
+        line=dict(color=COLOR_SCHEME['primary'], width=2),
+        hovertemplate='<b>%{fullData.name}</b><br>' +
+                     '日付: %{x}<br>' +
+                     '体重: %{y:.1f}kg<br>' +
+                     '<extra></extra>'
+    ))
+    
+    # 7日移動平均ライン
+    if len(df_with_ma) >= 3:  # 最低3つのデータポイントがある場合のみ
+        fig.add_trace(scatter(
+            x=weight_ma_x,
+            y=weight_ma_y,
+            mode='lines',
+            name='7日移動平均',
+            line=dict(color=COLOR_SCHEME['primary'], width=2, dash='dash'),
+            hovertemplate='<b>%{fullData.name}</b><br>' +
+                         '日付: %{x}<br>' +
+                         '移動平均: %{y:.1f}kg<br>' +
+                         '<extra></extra>'
+        ))
+    
+    # 体脂肪率ライン（データがある場合）
+    if has_body_fat:
+        fig.add_trace(scatter(
+            x=body_fat_x,
+            y=body_fat_y,
+            mode='lines',
+            name='体脂肪率',
+            line=dict(color=COLOR_SCHEME['secondary'], width=2),
+            marker=dict(size=6, color=COLOR_SCHEME['secondary']),
+            yaxis='y2',
+            hovertemplate='<b>%{fullData.name}</b><br>' +
+                         '日付: %{x}<br>' +
+                         '体脂肪率: %{y:.1f}%<br>' +
+                         '<extra></extra>'
+        ))
+    
+    # 目標体重の参照線（設定されている場合）
+    if target_weight is not None:
+        fig.add_hline(
+            y=target_weight,
+            line=dict(color='red', width=2),
+            annotation_text=f"目標体重: {target_weight:.1f}kg",
+            annotation_position="top left",
+            annotation=dict(
+                bgcolor="rgba(255, 255, 255, 0.8)",
+                bordercolor="red",
+                borderwidth=1
+            )
+        )
+        
+
+    
+    # レイアウト設定
+    title = f"体重推移グラフ"
+    if period_days:
+        title += f" (過去{period_days}日間)"
+    
+    layout_config = {
+        'title': {
+            'text': title,
+            'font': {'size': 20, 'color': COLOR_SCHEME['text']},
+            'x': 0.5
+        },
+        'xaxis': {
+            'title': '日付',
+            'type': 'date',
+            'tickformat': '%Y-%m-%d',
+            'tickangle': -45,
+            'gridcolor': '#E0E0E0',
+            'showgrid': True
+        },
+        'yaxis': {
+            'title': '体重 (kg)',
+            'gridcolor': '#E0E0E0',
+            'showgrid': True,
+            'zeroline': False
+        },
+        'plot_bgcolor': COLOR_SCHEME['background'],
+        'paper_bgcolor': COLOR_SCHEME['background'],
+        'height': 500,
+        'hovermode': 'x unified',
+        'legend': {
+            'orientation': 'h',
+            'yanchor': 'bottom',
+            'y': 1.02,
+            'xanchor': 'right',
+            'x': 1
+        }
+    }
+    
+    # 体脂肪率がある場合は右側Y軸を追加
+    if has_body_fat:
+        layout_config['yaxis2'] = {
+            'title': '体脂肪率 (%)',
+            'overlaying': 'y',
+            'side': 'right',
+            'gridcolor': '#E0E0E0',
+            'showgrid': False,
+            'zeroline': False
+        }
+    
+    fig.update_layout(**layout_config)
+    
+    return fig
+
+
+def make_frame(n: int, body_fat: bool = True, gaps: bool = False) -> pd.DataFrame:
+    """n日分の体重データ"""
+    rng = np.random.default_rng(n)
+    df = pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=n, freq='D'),
+        'weight': 70.0 + np.sin(np.arange(n) / 40) + rng.normal(0, 0.2, n),
+    })
+    if body_fat:
+        df['body_fat'] = 20.0 + rng.normal(0, 0.5, n)
+        if gaps:
+            df.loc[df.index % 4 == 0, 'body_fat'] = np.nan
+    return df
+
+
+def figure_json(fig: go.Figure) -> dict:
+    return json.loads(fig.to_json())
+
+
+def test_parity():
+    """様々な入力で変更前と同じJSONになることを確認"""
+    print("🧪 出力一致テスト...")
+    ma_frame = make_frame(60)
+    ma_frame['weight_ma'] = ma_frame['weight'].rolling(7, min_periods=1).mean()
+    cases = [
+        ("データなし", pd.DataFrame(), 30, 65.0, {}),
+        ("2件（移動平均なし）", make_frame(2), 7, None, {}),
+        ("30日", make_frame(30), 30, 65.0, {}),
+        ("体脂肪率なし", make_frame(30, body_fat=False), None, 64.5, {}),
+        ("体脂肪率の欠損あり", make_frame(90, gaps=True), 90, None, {}),
+        ("移動平均計算済み", ma_frame, 60, 65.0, {}),
+        ("間引き", make_frame(20_000, gaps=True), None, 65.0, {}),
+        ("WebGL", make_frame(8_000), None, 65.0, {'max_points': None}),
+    ]
+    for label, df, period_days, target_weight, kwargs in cases:
+        expected = figure_json(legacy_create_weight_graph(df, period_days, target_weight, **kwargs))
+        actual = figure_json(create_weight_graph(df, period_days, target_weight, **kwargs))
+        assert actual == expected, f"{label}: 出力が一致しません"
+        # 検証付きで作成しても同じ図になる（定義が有効である）
+        spec = build_weight_graph_spec(df, period_days, target_weight, **kwargs)
+        assert figure_json(go.Figure(spec)) == expected, f"{label}: 検証付きの出力が一致しません"
+        print(f"   ✅ {label}")
+    return True
+
+
+def test_typed_arrays():
+    """型付き配列の埋め込みで値と日付（ミリ秒）が保たれることを確認"""
+    print("🧪 型付き配列テスト...")
+    df = make_frame(10)
+    spec = build_weight_graph_spec(df, 7, 65.0, typed_arrays=True)
+    weight = spec['data'][0]
+    x = np.frombuffer(base64.b64decode(weight['x']['bdata']), dtype='<f8')
+    y = np.frombuffer(base64.b64decode(weight['y']['bdata']), dtype='<f8')
+    assert np.array_equal(y, df['weight'].to_numpy())
+    assert np.array_equal(pd.to_datetime(x, unit='ms'), df['date'])
+    go.Figure(spec)  # plotly.py の検証も通る
+    print("   ✅ base64で埋め込み")
+    return True
+
+
+def test_build_speed():
+    """検証を省略した経路が変更前より速いことを確認"""
+    print("🧪 作成速度テスト...")
+    df = make_frame(GRAPH_PIXEL_WIDTH)
+
+    def elapsed(build) -> float:
+        build()
+        start = time.perf_counter()
+        for _ in range(10):
+            build()
+        return (time.perf_counter() - start) / 10 * 1000
+
+    legacy_ms = elapsed(lambda: legacy_create_weight_graph(df, 30, 65.0))
+    fast_ms = elapsed(lambda: create_weight_graph(df, 30, 65.0))
+    assert fast_ms < legacy_ms
+    print(f"   ✅ 変更前 {legacy_ms:.1f}ms → {fast_ms:.1f}ms")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 グラフ定義ビルダー テスト開始\n")
+    results = [
+        test_parity(),
+        test_typed_arrays(),
+        test_build_speed(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
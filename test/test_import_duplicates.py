@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+インポート時の重複検出（ステージングテーブル + UPSERT）のテストスクリプト
+"""
+
+import sys
+import tempfile
+
+import pandas as pd
+
+from database import WeightDatabase
+from csv_import import validate_import_frame
+
+
+def make_database():
+    """既存データ（2024-01-01〜01-03）入りのテスト用データベースを作成"""
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement("2024-01-01", 70.0, 20.0)
+    db.add_measurement("2024-01-02", 70.5, 20.1)
+    db.add_measurement("2024-01-03", 71.0, 20.2)
+    return db
+
+
+def make_import_frame():
+    """既存と重複する日付とファイル内重複を含むインポートデータ"""
+    valid, errors = validate_import_frame(pd.DataFrame({
+        'date': ['2024-01-02', '2024-01-04', '2024-01-04', '2024-01-03'],
+        'weight': [80.0, 72.0, 73.0, 81.0],
+        'body_fat': [25.0, None, 21.0, 26.0]
+    }))
+    assert not errors
+    return valid
+
+
+def test_find_duplicate_dates():
+    """既存データと重複する日付がデータベース側で検出されることを確認"""
+    print("🧪 重複日付検出テスト...")
+    db = make_database()
+    duplicates = db.find_duplicate_dates(make_import_frame())
+    assert duplicates == ['2024-01-02', '2024-01-03']
+    print(f"   ✅ 重複日付: {duplicates}")
+    return True
+
+
+def test_import_skip():
+    """スキップ指定では既存データとファイル内の後続重複が無視されることを確認"""
+    print("🧪 スキップ インポートテスト...")
+    db = make_database()
+    result = db.import_measurements(make_import_frame(), on_duplicate='skip')
+    assert result['success_count'] == 1
+    assert result['skipped_count'] == 3
+    assert result['error_count'] == 0
+
+    assert db.get_measurement_by_date("2024-01-02")['weight'] == 70.5
+    added = db.get_measurement_by_date("2024-01-04")
+    assert added['weight'] == 72.0 and added['body_fat'] is None
+    assert db.get_record_count() == 4
+    print(f"   ✅ 追加{result['success_count']}件 / スキップ{result['skipped_count']}件")
+    return True
+
+
+def test_import_overwrite():
+    """上書き指定では既存行のid・作成日時を保ったまま値が更新されることを確認"""
+    print("🧪 上書き インポートテスト...")
+    db = make_database()
+    before = db.get_measurement_by_date("2024-01-02")
+    result = db.import_measurements(make_import_frame(), on_duplicate='overwrite')
+    assert result['success_count'] == 4
+    assert result['skipped_count'] == 0
+
+    after = db.get_measurement_by_date("2024-01-02")
+    assert after['id'] == before['id']
+    assert after['created_at'] == before['created_at']
+    assert after['weight'] == 80.0 and after['body_fat'] == 25.0
+    # ファイル内の重複は後の行が優先される
+    assert db.get_measurement_by_date("2024-01-04")['weight'] == 73.0
+    assert db.get_record_count() == 4
+
+    # 統計・移動平均も書き込みと同じトランザクションで更新される
+    statistics = db.get_statistics(None)
+    assert statistics['weight_max'] == 81.0
+    moving_averages = db.get_latest_moving_averages()
+    assert moving_averages['date'] == "2024-01-04"
+    assert round(moving_averages['weight_ma7'], 3) == round((70.0 + 80.0 + 81.0 + 73.0) / 4, 3)
+    print(f"   ✅ 上書き{result['success_count']}件 (7日平均 {moving_averages['weight_ma7']:.2f}kg)")
+    return True
+
+
+def test_invalid_action():
+    """未知の重複処理方法はValueErrorになることを確認"""
+    print("🧪 不正な重複処理方法テスト...")
+    db = make_database()
+    try:
+        db.import_measurements(make_import_frame(), on_duplicate='merge')
+        assert False, "不正な重複処理方法が受け付けられました"
+    except ValueError:
+        pass
+    assert db.get_record_count() == 3
+    print("   ✅ ValueErrorを送出")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 重複インポート テスト開始\n")
+    results = [
+        test_find_duplicate_dates(),
+        test_import_skip(),
+        test_import_overwrite(),
+        test_invalid_action(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+get_measurements のカラム指定・省メモリ型のテストスクリプト
+"""
+
+import sys
+import tempfile
+
+import numpy as np
+
+from database import WeightDatabase
+
+
+def make_database() -> WeightDatabase:
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement("2024-01-03", 70.1, 20.5)
+    db.add_measurement("2024-01-01", 70.5, None)
+    db.add_measurement("2024-01-02", 69.9, 20.1)
+    return db
+
+
+def test_projection():
+    """指定したカラムだけが日付の昇順で返ることを確認"""
+    print("🧪 カラム指定テスト...")
+    db = make_database()
+    df = db.get_measurements(columns=['date', 'weight'])
+    assert list(df.columns) == ['date', 'weight']
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-01-01', '2024-01-02', '2024-01-03']
+
+    # 件数指定は最新N件を昇順で返す
+    df = db.get_measurements(2, columns=['weight'])
+    assert df['weight'].tolist() == [69.9, 70.1]
+
+    try:
+        db.get_measurements(columns=['date', 'height'])
+        assert False, "不明なカラムが受け付けられました"
+    except ValueError:
+        pass
+    print("   ✅ date, weight のみ取得")
+    return True
+
+
+def test_compact_dtypes():
+    """compact=Trueで省メモリの型になり、値が保たれることを確認"""
+    print("🧪 省メモリ型テスト...")
+    db = make_database()
+    full = db.get_measurements()
+    compact = db.get_measurements(compact=True)
+
+    assert str(compact['date'].dtype) == 'datetime64[s]'
+    assert str(compact['created_at'].dtype) == 'datetime64[s]'
+    assert compact['weight'].dtype == np.float32
+    assert compact['body_fat'].dtype == np.float32
+    assert str(compact['id'].dtype) == 'Int32'
+    assert compact['body_fat'].isna().tolist() == [True, False, False]
+    assert np.allclose(compact['weight'], full['weight'])
+    assert (compact['date'] == full['date']).all()
+    assert compact.memory_usage(deep=True).sum() < full.memory_usage(deep=True).sum()
+
+    # CSVに書き出した場合の表記は変わらない
+    assert compact.to_csv(index=False) == full.to_csv(index=False)
+
+    between = db.get_measurements_between('2024-01-02', None, columns=['date', 'weight_ma7'], compact=True)
+    assert between['weight_ma7'].dtype == np.float32 and len(between) == 2
+    print(f"   ✅ {full.memory_usage(deep=True).sum()}B → {compact.memory_usage(deep=True).sum()}B")
+    return True
+
+
+def test_empty_compact():
+    """データがない場合も型付きの空のDataFrameが返ることを確認"""
+    print("🧪 空データテスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    df = db.get_measurements(columns=['date', 'weight'], compact=True)
+    assert df.empty and list(df.columns) == ['date', 'weight']
+    assert str(df['date'].dtype) == 'datetime64[s]'
+    print("   ✅ 空のDataFrame")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 カラム指定・省メモリ型 テスト開始\n")
+    results = [
+        test_projection(),
+        test_compact_dtypes(),
+        test_empty_compact(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
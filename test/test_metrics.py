@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+メトリクス（Prometheusテキスト形式の出力）のテストスクリプト
+"""
+
+import os
+import re
+import sys
+import tempfile
+import urllib.request
+
+import plotly.graph_objects as go
+
+from database import WeightDatabase
+from figure_cache import FigureCache
+from metrics import AppMetrics, Histogram, start_http_server
+
+# サンプル行の形式: 名前{ラベル} 値
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_]+="([^"\\]|\\.)*",?)*\})? [-+0-9.eInf]+$')
+
+
+def parse_samples(text: str) -> dict:
+    """サンプル行を {名前とラベル: 値} に変換（形式も確認）"""
+    samples = {}
+    for line in text.strip().split('\n'):
+        if line.startswith('#'):
+            assert line.startswith(('# HELP ', '# TYPE ')), line
+            continue
+        assert SAMPLE_LINE.match(line), line
+        key, value = line.rsplit(' ', 1)
+        samples[key] = float(value)
+    return samples
+
+
+class FakeClock:
+    """手動で進める時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram():
+    """ヒストグラムが累積バケット・合計・件数で出力されることを確認"""
+    print("🧪 ヒストグラムテスト...")
+    histogram = Histogram('test_seconds', 'テスト', (0.1, 1.0), 'kind')
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+    samples = parse_samples('\n'.join(histogram.render()))
+    assert samples == {
+        'test_seconds_bucket{kind="a\\"b",le="0.1"}': 1,
+        'test_seconds_bucket{kind="a\\"b",le="1"}': 3,
+        'test_seconds_bucket{kind="a\\"b",le="+Inf"}': 4,
+        'test_seconds_sum{kind="a\\"b"}': 4.05,
+        'test_seconds_count{kind="a\\"b"}': 4,
+    }
+    print("   ✅ 累積バケット・ラベルのエスケープ")
+    return True
+
+
+def test_app_metrics():
+    """再実行・DBメソッド・キャッシュ・件数・インポートのメトリクスが出力されることを確認"""
+    print("🧪 アプリケーションメトリクステスト...")
+    db = WeightDatabase(os.path.join(tempfile.mkdtemp(), 'metrics.db'))
+    figure_cache = FigureCache()
+    metrics = AppMetrics(db, figure_cache)
+
+    db.add_measurement('2024-01-01', 70.0)
+    db.add_measurement('2024-01-02', 69.8)
+    db.get_measurements()
+    figure_cache.get_or_build('key', go.Figure)
+    figure_cache.get_or_build('key', go.Figure)
+    for _ in range(4):
+        metrics.record_cache_request('data_snapshot')
+    metrics.record_cache_miss('data_snapshot')
+    metrics.record_import(1000, 0.5)
+    metrics.observe_rerun(0.2)
+    metrics.observe_rerun(0.03, completed=False)
+
+    samples = parse_samples(metrics.render())
+    assert samples['weight_tracker_rerun_duration_seconds_count{outcome="completed"}'] == 1
+    assert samples['weight_tracker_rerun_duration_seconds_bucket{outcome="interrupted",le="0.05"}'] == 1
+    assert samples['weight_tracker_db_calls_total{method="add_measurement"}'] == 2
+    assert samples['weight_tracker_db_rows_total{method="get_measurements"}'] == 2
+    assert samples['weight_tracker_db_method_duration_seconds_count{method="add_measurement"}'] == 2
+    assert samples['weight_tracker_db_connections_opened_total'] >= 1
+    assert samples['weight_tracker_cache_hit_ratio{cache="figure"}'] == 0.5
+    assert samples['weight_tracker_cache_hit_ratio{cache="data_snapshot"}'] == 0.75
+    assert samples['weight_tracker_measurements'] == 2
+    assert samples['weight_tracker_import_rows_total'] == 1000
+    assert samples['weight_tracker_import_last_rows_per_second'] == 2000
+    print(f"   ✅ {len(samples)}サンプル")
+    return True
+
+
+def test_http_and_textfile():
+    """HTTPエンドポイントとファイルに同じ形式で出力されることを確認"""
+    print("🧪 HTTP・ファイル出力テスト...")
+    db = WeightDatabase(os.path.join(tempfile.mkdtemp(), 'metrics.db'))
+    textfile_path = os.path.join(tempfile.mkdtemp(), 'metrics', 'weight_tracker.prom')
+    clock = FakeClock()
+    metrics = AppMetrics(db, textfile_path=textfile_path, textfile_interval=5.0, clock=clock)
+
+    server = start_http_server(metrics, 0)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            samples = parse_samples(response.read().decode('utf-8'))
+        assert samples['weight_tracker_measurements'] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    metrics.observe_rerun(0.1)
+    metrics.observe_rerun(0.1)
+    with open(textfile_path, encoding='utf-8') as f:
+        assert 'weight_tracker_rerun_duration_seconds_count{outcome="completed"} 1' in f.read()
+    clock.now = 5.0
+    metrics.observe_rerun(0.1)
+    with open(textfile_path, encoding='utf-8') as f:
+        assert 'weight_tracker_rerun_duration_seconds_count{outcome="completed"} 3' in f.read()
+    print("   ✅ HTTP・ファイル（間隔を空けて書き換え）")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 メトリクス テスト開始\n")
+    results = [
+        test_histogram(),
+        test_app_metrics(),
+        test_http_and_textfile(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+インポート進捗レポーターのテストスクリプト
+"""
+
+import io
+import sys
+import tempfile
+
+import pandas as pd
+
+from csv_import import read_csv_chunks
+from database import WeightDatabase
+from progress_reporter import ProgressReporter, format_progress
+
+
+class FakeClock:
+    """テスト用の時計（nowを書き換えて時間を進める）"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_throttling():
+    """通知が時間・進捗率の閾値で間引かれることを確認"""
+    print("🧪 間引きテスト...")
+    clock = FakeClock()
+    updates = []
+    reporter = ProgressReporter(updates.append, total=10_000, min_interval=1.0, min_step=0.1, clock=clock)
+
+    # 1行ずつ報告しても、進捗率10%ごとにしか通知されない
+    for done in range(1, 10_001):
+        clock.now += 0.0001
+        reporter(done)
+    done = [update['done'] for update in updates]
+    assert len(done) == 11 and done[-1] == 10_000
+    assert all(later - earlier >= 1000 for earlier, later in zip(done[:-2], done[1:-1]))
+    print(f"   ✅ 10,000回の報告 → {reporter.updates}回の通知")
+
+    # 総数が不明な場合は時間間隔で通知
+    updates.clear()
+    reporter = ProgressReporter(updates.append, min_interval=1.0, clock=clock)
+    for _ in range(50):
+        clock.now += 0.1
+        reporter(100)
+    assert len(updates) == 5
+    print(f"   ✅ 総数不明: 50回の報告 → {reporter.updates}回の通知")
+    return True
+
+
+def test_rate_and_eta():
+    """処理速度と残り時間が算出されることを確認"""
+    print("🧪 処理速度・残り時間テスト...")
+    clock = FakeClock()
+    updates = []
+    reporter = ProgressReporter(updates.append, total=1000, clock=clock)
+    clock.now = 2.0
+    reporter.update(250)
+    assert updates[-1]['rate'] == 125.0 and updates[-1]['eta'] == 6.0
+    assert format_progress(updates[-1]) == "250 / 1,000行 (25%)・125行/秒・残り約6秒"
+
+    clock.now = 8.0
+    reporter.finish(1000)
+    assert updates[-1]['fraction'] == 1.0
+    assert format_progress(updates[-1]) == "1,000 / 1,000行 (100%)・125行/秒"
+    print(f"   ✅ {format_progress(updates[-1])}")
+    return True
+
+
+def test_import_paths():
+    """一括インポート・分割インポートの両方で進捗が通知されることを確認"""
+    print("🧪 インポート経路テスト...")
+    csv_text = "date,weight\n" + "".join(f"2024-01-{day:02d},70.{day}\n" for day in range(1, 21))
+
+    updates = []
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.bulk_import(pd.read_csv(io.StringIO(csv_text)), progress=ProgressReporter(updates.append, total=20))
+    assert updates[-1]['done'] == 20 and updates[-1]['fraction'] == 1.0
+
+    updates.clear()
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.import_chunks(read_csv_chunks(io.StringIO(csv_text), 5),
+                     progress=ProgressReporter(updates.append, total=20, min_interval=60))
+    assert [update['done'] for update in updates] == [5, 10, 15, 20]
+    print("   ✅ 両方の経路で通知")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 進捗レポーター テスト開始\n")
+    results = [
+        test_throttling(),
+        test_rate_and_eta(),
+        test_import_paths(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+クエリ計測（QueryStats）のテストスクリプト
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from csv_import import validate_import_frame
+from database import WeightDatabase
+
+
+def make_database(**kwargs) -> WeightDatabase:
+    db_path = os.path.join(tempfile.mkdtemp(), 'query_stats.db')
+    db = WeightDatabase(db_path, **kwargs)
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=60).strftime('%Y-%m-%d'),
+        'weight': [70.0 - i * 0.05 for i in range(60)],
+        'body_fat': [20.0] * 60
+    })
+    db.import_measurements(validate_import_frame(df)[0])
+    return db
+
+
+def test_method_counters():
+    """メソッドごとの呼び出し回数・行数・時間と接続の作成時間が集計されることを確認"""
+    print("🧪 メソッド集計テスト...")
+    db = make_database()
+    db.reset_query_stats()
+
+    for _ in range(3):
+        db.get_measurements_between('2024-01-01', '2024-01-10')
+    db.get_record_count()
+    stats = db.get_query_stats()
+
+    between = stats['methods']['get_measurements_between']
+    assert between['calls'] == 3
+    assert between['queries'] == 3
+    assert between['rows'] == 30
+    assert between['total_ms'] >= between['query_ms'] > 0
+    assert between['avg_ms'] == between['total_ms'] / 3
+    assert stats['methods']['get_record_count']['calls'] == 1
+    assert any('FROM measurements' in sql for sql in stats['queries'])
+    assert stats['slow_queries'] == []
+    print(f"   ✅ {between['calls']}回・{between['rows']}行・{between['total_ms']:.2f}ms")
+    return True
+
+
+def test_nested_methods():
+    """他のメソッドから呼び出されたメソッドは数えず、SQLを呼び出し元に含めることを確認"""
+    print("🧪 入れ子の呼び出しテスト...")
+    db = make_database()
+    db.reset_query_stats()
+    db.bulk_import(pd.DataFrame({'date': ['2024-03-01', '2024-03-02'], 'weight': [69.0, 68.9]}))
+    ids = db.get_measurements_page(page_size=2)['id'].tolist()
+    db.bulk_delete(ids)
+    methods = db.get_query_stats()['methods']
+    assert methods['bulk_import']['calls'] == 1 and methods['bulk_import']['queries'] > 0
+    assert methods['bulk_delete']['calls'] == 1 and methods['bulk_delete']['rows'] >= 2
+    assert 'import_measurements' not in methods and 'apply_edits' not in methods
+    assert db.query_stats.thread_totals()['calls'] >= 3
+    print(f"   ✅ {sorted(methods)}")
+    return True
+
+
+def test_connection_setup():
+    """接続の作成時間がクエリとは別に記録されることを確認"""
+    print("🧪 接続作成の計測テスト...")
+    db = make_database()
+    connections = db.get_query_stats()['connections']
+    assert connections['opened'] >= 1 and connections['setup_ms'] > 0
+    assert not any(sql.startswith('PRAGMA foreign_keys') for sql in db.get_query_stats()['queries'])
+    print(f"   ✅ {connections['opened']}接続・{connections['setup_ms']:.2f}ms")
+    return True
+
+
+def test_generator_method():
+    """ジェネレーターのメソッドは1回の呼び出しとして、取り出しの時間を合計して集計されることを確認"""
+    print("🧪 ジェネレーター集計テスト...")
+    db = make_database()
+    db.reset_query_stats()
+    chunks = list(db.iter_csv_chunks(chunk_size=20))
+    entry = db.get_query_stats()['methods']['iter_csv_chunks']
+    assert len(chunks) == 3
+    assert entry['calls'] == 1 and entry['queries'] == 1 and entry['rows'] == 60
+    print(f"   ✅ {len(chunks)}チャンク・{entry['rows']}行")
+    return True
+
+
+def test_slow_query_plan():
+    """閾値を超えたクエリがSQLと実行計画とともに記録されることを確認"""
+    print("🧪 遅いクエリの記録テスト...")
+    db = make_database(slow_query_ms=0)
+    db.reset_query_stats()
+    db.get_measurements_between('2024-01-01', '2024-01-10')
+    slow = db.get_query_stats()['slow_queries']
+    assert slow and slow[0]['method'] == 'get_measurements_between'
+    assert 'FROM measurements' in slow[0]['sql']
+    assert any('idx_measurements_day' in detail for detail in slow[0]['plan'])
+    print(f"   ✅ {slow[0]['plan']}")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 クエリ計測 テスト開始\n")
+    results = [
+        test_method_counters(),
+        test_nested_methods(),
+        test_connection_setup(),
+        test_generator_method(),
+        test_slow_query_plan(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
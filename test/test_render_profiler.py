@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+描画プロファイラーのテストスクリプト
+"""
+
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from database import WeightDatabase
+from render_profiler import RenderProfiler, is_profiling_enabled
+
+
+class FakeClock:
+    """呼び出すたびに0.01秒進む時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.01
+        return self.now
+
+
+def test_enabled_flags():
+    """環境変数・クエリパラメータで有効になることを確認"""
+    print("🧪 有効化の判定テスト...")
+    assert not is_profiling_enabled({}, {})
+    assert is_profiling_enabled({'WEIGHT_TRACKER_PROFILE': '1'}, {})
+    # クエリパラメータは許可されている場合のみ有効
+    assert not is_profiling_enabled({}, {'profile': 'true'})
+    assert is_profiling_enabled({'WEIGHT_TRACKER_PROFILE_ALLOW_QUERY': '1'}, {'profile': 'true'})
+    assert not is_profiling_enabled({'WEIGHT_TRACKER_PROFILE_ALLOW_QUERY': '1'}, {'profile': 'no'})
+    print("   ✅ 環境変数・クエリパラメータ")
+    return True
+
+
+def test_sections_and_trace():
+    """区間ごとの時間・DB呼び出し・メモリが計測され、JSONLに追記されることを確認"""
+    print("🧪 区間計測テスト...")
+    workdir = tempfile.mkdtemp()
+    db = WeightDatabase(os.path.join(workdir, 'profile.db'))
+    trace_path = os.path.join(workdir, 'trace', 'profile.jsonl')
+
+    profiler = RenderProfiler(query_stats=db.query_stats, trace_path=trace_path, clock=FakeClock())
+    profiler.checkpoint('load')
+    db.get_record_count()
+    db.get_statistics(30)
+    profiler.checkpoint('allocate')
+    buffer = [bytes(1024) for _ in range(200)]
+    record = profiler.finish()
+
+    # 中断した再実行も追記される
+    interrupted = RenderProfiler(query_stats=db.query_stats, trace_path=trace_path)
+    interrupted.checkpoint('load')
+    interrupted.finish(completed=False)
+
+    load, allocate = record['sections']
+    assert [load['name'], allocate['name']] == ['load', 'allocate']
+    assert load['ms'] == allocate['ms'] == 10.0 and record['total_ms'] == 20.0
+    assert load['db_calls'] == 2 and load['queries'] >= 2
+    assert allocate['db_calls'] == 0 and allocate['memory_kb'] >= 200 and allocate['peak_kb'] >= 200
+    assert len(buffer) == 200
+
+    with open(trace_path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [line['completed'] for line in lines] == [True, False]
+    assert lines[0]['sections'] == record['sections']
+    # 自身が開始したメモリの追跡は終了時に止まる
+    assert not tracemalloc.is_tracing()
+    print(f"   ✅ {record['sections']}")
+    return True
+
+
+def test_trace_rotation():
+    """トレースファイルが上限サイズを超えたら退避されることを確認"""
+    print("🧪 トレースファイルの退避テスト...")
+    trace_path = os.path.join(tempfile.mkdtemp(), 'profile.jsonl')
+    for _ in range(3):
+        profiler = RenderProfiler(trace_path=trace_path, max_trace_bytes=1)
+        profiler.checkpoint('load')
+        profiler.finish()
+    for path in (trace_path, trace_path + '.1'):
+        with open(path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 1
+    print("   ✅ 1行ずつ")
+    return True
+
+
+def test_disabled():
+    """無効な場合は何も計測・出力しないことを確認"""
+    print("🧪 無効時のテスト...")
+    trace_path = os.path.join(tempfile.mkdtemp(), 'profile.jsonl')
+    profiler = RenderProfiler(enabled=False, trace_path=trace_path)
+    profiler.checkpoint('load')
+    assert profiler.finish() is None
+    assert profiler.sections == [] and not os.path.exists(trace_path)
+    print("   ✅ 計測なし")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 描画プロファイラー テスト開始\n")
+    results = [
+        test_enabled_flags(),
+        test_sections_and_trace(),
+        test_trace_rotation(),
+        test_disabled(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+移動平均テーブル（measurement_rollups）のテストスクリプト
+"""
+
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from database import WeightDatabase, ROLLUP_COLUMNS
+
+
+def read_rollups(db: WeightDatabase) -> pd.DataFrame:
+    """移動平均テーブルを日付順に取得"""
+    return pd.read_sql_query(
+        "SELECT * FROM measurement_rollups ORDER BY date", db._connect()
+    ).set_index('date')
+
+
+def expected_rollups(db: WeightDatabase) -> pd.DataFrame:
+    """全測定データから期間ベースの移動平均を計算"""
+    df = db.get_measurements_between(columns=['date', 'weight', 'body_fat']).set_index('date')
+    expected = pd.DataFrame(index=df.index.strftime('%Y-%m-%d'))
+    for column in ROLLUP_COLUMNS:
+        name, window = column.split('_ma')
+        expected[column] = df[name].rolling(f'{window}D', min_periods=1).mean().values
+    expected.index.name = 'date'
+    return expected
+
+
+def test_time_based_window():
+    """記録の空白期間がある場合も暦日の窓で平均されることを確認"""
+    print("🧪 期間ベース移動平均テスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.add_measurement('2024-01-01', 70.0, 20.0)
+    db.add_measurement('2024-01-05', 72.0)
+    db.add_measurement('2024-01-20', 68.0, 18.0)
+
+    rollups = read_rollups(db)
+    print(rollups[['weight_ma7', 'weight_ma30', 'body_fat_ma7']].to_string())
+    assert rollups.loc['2024-01-05', 'weight_ma7'] == 71.0
+    assert rollups.loc['2024-01-20', 'weight_ma7'] == 68.0  # 15日前の記録は7日窓に含まれない
+    assert rollups.loc['2024-01-20', 'weight_ma30'] == 70.0
+    assert rollups.loc['2024-01-05', 'body_fat_ma7'] == 20.0
+
+    latest = db.get_latest_moving_averages()
+    assert latest['date'] == '2024-01-20'
+    assert latest['weight_ma7'] == 68.0
+    print("✅ 期間ベース移動平均テスト成功")
+    return True
+
+
+def test_incremental_matches_rebuild():
+    """追加・更新・削除による差分更新が全件再計算と一致することを確認"""
+    print("🧪 差分更新テスト...")
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-01-01', periods=400, freq='D')
+    keep = rng.random(len(dates)) > 0.3  # 空白期間を作る
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.bulk_import(pd.DataFrame({
+        'date': dates[keep].strftime('%Y-%m-%d'),
+        'weight': rng.normal(70, 2, keep.sum()).round(1),
+        'body_fat': np.where(rng.random(keep.sum()) > 0.5, rng.normal(20, 2, keep.sum()).round(1), np.nan)
+    }))
+
+    df = db.get_measurements()
+    db.add_measurement('2023-06-15', 80.0, 25.0)
+    db.update_measurement(int(df['id'].iloc[10]), 60.0, None)
+    db.update_measurement_by_date(df['date'].iloc[100].strftime('%Y-%m-%d'), 75.0, 22.0)
+    db.delete_measurement(int(df['id'].iloc[200]))
+    db.delete_measurement(int(df['id'].iloc[-1]))
+
+    actual = read_rollups(db)
+    expected = expected_rollups(db)
+    assert list(actual.index) == list(expected.index)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    assert db.rebuild_rollups()
+    pd.testing.assert_frame_equal(read_rollups(db), expected, check_dtype=False)
+    print(f"   {len(actual)}件の移動平均が全件再計算と一致")
+    print("✅ 差分更新テスト成功")
+    return True
+
+
+def test_range_query_with_moving_average():
+    """日付範囲検索で移動平均カラムを取得できることを確認"""
+    print("🧪 移動平均カラム取得テスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    for day in range(1, 11):
+        db.add_measurement(f'2024-01-{day:02d}', 70.0 + day)
+
+    df = db.get_measurements_between('2024-01-08', '2024-01-10', columns=['date', 'weight', 'weight_ma7'])
+    print(df.to_string())
+    assert df['weight_ma7'].tolist() == [75.0, 76.0, 77.0]
+    print("✅ 移動平均カラム取得テスト成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 移動平均テーブル テスト開始\n")
+    results = [
+        test_time_based_window(),
+        test_incremental_matches_rebuild(),
+        test_range_query_with_moving_average(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+統計情報（get_statistics）のテストスクリプト
+"""
+
+import sqlite3
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from database import WeightDatabase
+
+
+def create_test_db() -> WeightDatabase:
+    """記録の空白期間を含むテストデータベースを作成"""
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    db.bulk_import(pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-03-01', '2024-03-10', '2024-03-20'],
+        'weight': [75.0, 74.0, 72.0, 71.0, 70.0],
+        'body_fat': [25.0, None, 23.0, None, None]
+    }))
+    return db
+
+
+def test_calendar_window():
+    """統計が行数ではなく暦日の範囲で計算されることを確認"""
+    print("🧪 暦日範囲の統計テスト...")
+    db = create_test_db()
+
+    stats = db.get_statistics(30)
+    print(f"   30日間: {stats['count']}件 ({stats['start_date']}～{stats['end_date']})")
+    assert stats['count'] == 3
+    assert stats['weight_oldest'] == 72.0
+    assert stats['weight_latest'] == 70.0
+    assert stats['weight_change'] == -2.0
+    assert stats['trend'] == 'down'
+    assert stats['body_fat_latest'] == 23.0
+    assert stats['body_fat_count'] == 1
+
+    stats = db.get_statistics(5)
+    assert stats['count'] == 1
+    assert stats['trend'] == 'flat'
+    assert 'body_fat_avg' not in stats
+
+    assert WeightDatabase(tempfile.mktemp(suffix='.db')).get_statistics(30) == {}
+    print("✅ 暦日範囲の統計テスト成功")
+    return True
+
+
+def test_summary_matches_pandas():
+    """全期間統計がpandasでの計算結果と一致することを確認"""
+    print("🧪 全期間統計テスト...")
+    db = WeightDatabase(tempfile.mktemp(suffix='.db'))
+    rows = 1000
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+        'weight': np.random.normal(70, 2, rows).round(1),
+        'body_fat': np.where(np.arange(rows) % 3 == 0, np.nan, np.random.normal(20, 2, rows).round(1))
+    })
+    db.bulk_import(df)
+
+    stats = db.get_statistics(None)
+    assert stats['count'] == rows
+    assert abs(stats['weight_avg'] - df['weight'].mean()) < 1e-9
+    assert stats['weight_max'] == df['weight'].max()
+    assert stats['weight_min'] == df['weight'].min()
+    assert stats['weight_oldest'] == df['weight'].iloc[0]
+    assert stats['weight_latest'] == df['weight'].iloc[-1]
+    assert stats['body_fat_count'] == df['body_fat'].notna().sum()
+    assert abs(stats['body_fat_avg'] - df['body_fat'].mean()) < 1e-9
+    assert stats['body_fat_oldest'] == df['body_fat'].dropna().iloc[0]
+    print(f"   {rows}件: 平均体重 {stats['weight_avg']:.2f}kg")
+    print("✅ 全期間統計テスト成功")
+    return True
+
+
+def test_summary_cache_invalidation():
+    """measurementsの変更で全期間統計のキャッシュが破棄されることを確認"""
+    print("🧪 統計キャッシュ破棄テスト...")
+    db = create_test_db()
+
+    def cached_rows():
+        return db._connect().execute("SELECT COUNT(*) FROM measurement_summary").fetchone()[0]
+
+    assert db.get_statistics(None)['count'] == 5
+    assert cached_rows() == 1
+
+    db.add_measurement('2024-03-21', 69.0)
+    assert cached_rows() == 0
+    assert db.get_statistics(None)['weight_latest'] == 69.0
+
+    # 他の接続からの変更でも破棄される
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DELETE FROM measurements WHERE date = '2024-03-21'")
+    assert cached_rows() == 0
+    assert db.get_statistics(None)['count'] == 5
+    print("✅ 統計キャッシュ破棄テスト成功")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 統計情報 テスト開始\n")
+    results = [
+        test_calendar_window(),
+        test_summary_matches_pandas(),
+        test_summary_cache_invalidation(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+合成データ生成のテストスクリプト
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from csv_import import read_csv_chunks, validate_import_frame
+from database import WeightDatabase
+from synthetic_data import generate_history, iter_history, main as generate_main, write_csv, write_sqlite
+
+
+def test_reproducible_history():
+    """同じシードからは同じ履歴が、ユーザーごとに異なる履歴が生成されることを確認"""
+    print("🧪 再現性テスト...")
+    first = generate_history(2000, user=1, seed=42, chunk_days=500)
+    assert first.equals(generate_history(2000, user=1, seed=42, chunk_days=500))
+    assert not first.equals(generate_history(2000, user=2, seed=42, chunk_days=500))
+    assert first['date'].iloc[-1] == '2024-12-31'
+    print(f"   ✅ {len(first)}行")
+    return True
+
+
+def test_history_features():
+    """空白期間・同日の複数回測定・外れ値を含み、全行がインポート可能な値であることを確認"""
+    print("🧪 データ特性テスト...")
+    df = generate_history(20_000, seed=0, outlier_rate=0.01)
+    dates = pd.to_datetime(df['date'])
+    assert dates.is_monotonic_increasing
+
+    duplicates = df['date'].duplicated().sum()
+    gaps = (dates.drop_duplicates().diff().dt.days > 1).sum()
+    jumps = (df['weight'].diff().abs() > 4).sum()
+    assert duplicates > 0 and gaps > 0 and jumps > 0
+    assert df['body_fat'].isna().any()
+
+    valid, errors = validate_import_frame(df)
+    assert errors == [] and len(valid) == len(df)
+    print(f"   ✅ 同日測定{duplicates}件・空白期間{gaps}回・外れ値を含む変動{jumps}回")
+    return True
+
+
+def test_sqlite_matches_csv_import():
+    """SQLiteへの一括書き込みとCSV経由のインポートで同じデータになることを確認"""
+    print("🧪 SQLite・CSV出力テスト...")
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'synthetic.db')
+    csv_path = os.path.join(workdir, 'synthetic.csv')
+
+    rows = write_sqlite(iter_history(3000, chunk_days=1000), db_path)
+    written = write_csv(iter_history(3000, chunk_days=1000), csv_path)
+
+    direct = WeightDatabase(db_path)
+    imported = WeightDatabase(os.path.join(workdir, 'imported.db'))
+    imported.import_chunks(read_csv_chunks(csv_path, 700))
+    columns = ['date', 'weight', 'body_fat', 'weight_ma7']
+    expected = imported.get_measurements_between(columns=columns)
+    assert direct.get_record_count() == len(expected) == rows < written
+    pd.testing.assert_frame_equal(direct.get_measurements_between(columns=columns), expected)
+    print(f"   ✅ {written}行 → {len(expected)}日分")
+    return True
+
+
+def test_cli_multiple_users():
+    """CLIで複数ユーザー分のファイルが出力されることを確認"""
+    print("🧪 CLIテスト...")
+    output = os.path.join(tempfile.mkdtemp(), 'users')
+    generate_main(['--users', '3', '--days', '400', '--output', output])
+    files = sorted(os.listdir(output))
+    assert files == ['user_0000.db', 'user_0001.db', 'user_0002.db']
+    counts = [WeightDatabase(os.path.join(output, name)).get_record_count() for name in files]
+    assert all(0 < count <= 400 for count in counts)
+
+    # 既存のファイルは --force を指定した場合のみ上書きする
+    try:
+        generate_main(['--users', '3', '--days', '400', '--output', output])
+        assert False, "既存のファイルを上書きしてしまいました"
+    except ValueError as e:
+        assert '--force' in str(e)
+    sidecar = os.path.join(output, 'user_0000.db-wal')
+    open(sidecar, 'w').close()
+    generate_main(['--users', '3', '--days', '10', '--output', output, '--force'])
+    assert not os.path.exists(sidecar)
+    assert WeightDatabase(os.path.join(output, files[0])).get_record_count() <= 10
+    print(f"   ✅ {dict(zip(files, counts))}")
+    return True
+
+
+def main():
+    """メインテスト実行"""
+    print("🚀 合成データ生成 テスト開始\n")
+    results = [
+        test_reproducible_history(),
+        test_history_features(),
+        test_sqlite_matches_csv_import(),
+        test_cli_multiple_users(),
+    ]
+    passed = sum(results)
+    print(f"\n📊 総計: {passed}成功, {len(results) - passed}失敗")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)